@@ -0,0 +1,518 @@
+# ============================================================
+#  API Server — local JSON API over the clinic database
+#  Smart Clinic Management System
+#  Serves index.html and the same smart_clinic.db the Tk app
+#  uses, on localhost only:
+#
+#    GET  /                              the web front page
+#    GET  /api/search?q=aung&limit=20    patients + appointments
+#    GET  /api/patients/<id>             one patient
+#    GET  /api/patients?after=0&limit=N  patients by id, streamed
+#    GET  /api/patients?order=name&from=Kyaw&after=0   ... by name
+#    GET  /api/appointments?from=…&to=…  appointments by date, streamed
+#    POST /api/appointments              book (JSON body, dialog rules)
+#    GET  /api/reports?by=doctor,month   visits & billed (from, to, status)
+#
+#  Run:  python api_server.py [--db smart_clinic.db] [--port 8765]
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as Date, timedelta
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from clinic_store import ClinicStore, DB_PATH, _appointment, _patient
+from queries import (STATEMENT_CACHE, APPOINTMENTS_BY_DATE, PATIENTS_BY_ID,
+                     PATIENTS_BY_NAME, first_on)
+from records import ClinicRecords
+from reporting import ReportEngine
+from scheduling import ScheduleIndex, doctor_key
+from search_index import SearchIndex
+from validation import validate_appointment
+
+HOST = '127.0.0.1'
+PORT = 8765
+POOL_SIZE = 4              # read connections (and worker threads)
+CACHE_SIZE = 2048          # cached GET responses
+PAGE_ROWS = 500            # rows per chunk when streaming
+MAX_LIMIT = 1_000_000
+MAX_BODY = 64 * 1024
+SUGGEST_DAYS = 7           # how far ahead a 409 looks for free slots
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PATIENT_SQL = 'SELECT patient_id, name, age, phone, email, gender FROM patients'
+APPOINTMENT_SQL = ('SELECT appointment_id, patient_id, patient, doctor, date, time, '
+                   'status, amount FROM appointments')
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, **extra):
+        super().__init__(message)
+        self.status = status
+        self.body = dict(extra, error=message)
+
+
+def _json(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# ── Connection pool ──────────────────────────────────────────
+class ConnectionPool:
+    """
+    A fixed number of read connections.  run() waits for a free one and
+    uses it on a worker thread, so at most `size` queries run at once
+    and the event loop never blocks on SQLite.
+    """
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.size = size
+        self._executor = ThreadPoolExecutor(size, thread_name_prefix='api-db')
+        self._free = asyncio.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE)
+            conn.execute('PRAGMA busy_timeout = 5000')
+            conn.execute('PRAGMA query_only = 1')
+            self._free.put_nowait(conn)
+        self._all = list(self._free._queue)
+
+    async def run(self, fn, *args):
+        conn = await self._free.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, conn, *args)
+        finally:
+            self._free.put_nowait(conn)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._all:
+            conn.close()
+
+
+# ── Hot-query cache ──────────────────────────────────────────
+class QueryCache:
+    """LRU of encoded responses, emptied whenever the database changes."""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._items = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        body = self._items.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._items.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        self._items[key] = body
+        if len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
+# ── The service ──────────────────────────────────────────────
+class ClinicAPI:
+    def __init__(self, db_path=DB_PATH, pool_size=POOL_SIZE, cache_size=CACHE_SIZE):
+        self.db_path = db_path
+        self.pool = None
+        self.cache = QueryCache(cache_size)
+        self.store = None            # the one writer (group-committing)
+        self.index = None            # SearchIndex, once loaded
+        self.reports = None          # ReportEngine over the index's records
+        self._last_ids = (0, 0)
+        self._watch = None           # sees other connections' commits
+        self._version = None
+        self._refreshing = None      # the running _refresh() task
+        self._booking = None
+        self._pool_size = pool_size
+
+    async def start(self, host=HOST, port=PORT):
+        loop = asyncio.get_running_loop()
+        self.store = await loop.run_in_executor(None, ClinicStore, self.db_path)
+        self.pool = ConnectionPool(self.db_path, self._pool_size)
+        self._watch = sqlite3.connect(self.db_path)
+        self._version = self._data_version()
+        self._booking = asyncio.Lock()
+        loop.create_task(self._load_index())
+        return await asyncio.start_server(self._serve, host, port, backlog=1024)
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+        if self._watch:
+            self._watch.close()
+        if self.store:
+            self.store.close()
+
+    # ── Keeping up with the database ─────────────────────────
+    def _data_version(self):
+        return self._watch.execute('PRAGMA data_version').fetchone()[0]
+
+    def _check_changes(self):
+        # Cheap (no I/O): the counter moves when any other connection
+        # commits — the Tk app, or our own writer
+        version = self._data_version()
+        if version != self._version:
+            self.cache.clear()
+            if self.index is not None:       # else: seen again once it has loaded
+                self._version = version
+                previous = self._refreshing
+                self._refreshing = asyncio.get_running_loop().create_task(
+                    self._refresh(previous))
+
+    async def _load_index(self):
+        index = SearchIndex(ClinicRecords())
+        await asyncio.get_running_loop().run_in_executor(None, index.load, self.store)
+        # load() reads in id order, so the last row holds the highest id
+        p, a = index.records.patients.ids, index.records.appointments.ids
+        self._last_ids = (p[-1] if p else 0), (a[-1] if a else 0)
+        self.index = index
+        self.reports = ReportEngine(index.records)
+        self.cache.clear()
+
+    async def _refresh(self, previous):
+        """Pull rows added since the last look into the search index."""
+        if previous is not None:
+            try:
+                await previous               # refreshes run one after another
+            except Exception:
+                pass                         # it failed; this one reads from its ids on
+        index = self.index
+        patients, appointments, counts = await self.pool.run(_new_rows, *self._last_ids)
+        await asyncio.get_running_loop().run_in_executor(
+            None, _index_rows, index, patients, appointments)
+        self._last_ids = (patients[-1][0] if patients else self._last_ids[0],
+                          appointments[-1][0] if appointments else self._last_ids[1])
+        if counts != (len(index.records.patients), len(index.records.appointments)):
+            await self._load_index()         # rows were deleted or merged
+        self.cache.clear()
+
+    # ── HTTP ─────────────────────────────────────────────────
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError):
+                    return
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = b''
+                length = headers.get('content-length') or '0'
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, 400, {'error': 'bad Content-Length'}, False)
+                    return
+                length = int(length)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': 'body too large'}, False)
+                    return
+                if length:
+                    body = await reader.readexactly(length)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                await self._dispatch(writer, method, target, body, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass                             # includes a stream cut short by _stream
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method, target, body, keep_alive):
+        self._check_changes()
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        try:
+            if method == 'GET':
+                cached = self.cache.get(target)
+                if cached is not None:
+                    return await self._send(writer, 200, cached[0], cached[1], keep_alive)
+                if path.startswith('/api/patients/'):
+                    result = await self._get_patient(path.rsplit('/', 1)[1])
+                elif path == '/api/search':
+                    result = await self._search(parse_qs(url.query))
+                elif path == '/api/reports':
+                    result = await self._report(parse_qs(url.query))
+                elif path == '/api/patients':
+                    return await self._stream_patients(writer, parse_qs(url.query), keep_alive)
+                elif path == '/api/appointments':
+                    return await self._stream_appointments(writer, parse_qs(url.query),
+                                                           keep_alive)
+                elif path in ('/', '/index.html'):
+                    with open(os.path.join(HERE, 'index.html'), 'rb') as f:
+                        page = f.read()
+                    self.cache.put(target, ('text/html; charset=utf-8', page))
+                    return await self._send(writer, 200, 'text/html; charset=utf-8', page,
+                                            keep_alive)
+                else:
+                    raise HTTPError(404, f'no such endpoint: {unquote(path)}')
+                data = _json(result)
+                self.cache.put(target, ('application/json', data))
+                return await self._send(writer, 200, 'application/json', data, keep_alive)
+            if method == 'POST' and path == '/api/appointments':
+                result = await self._book(body)
+                return await self._respond(writer, 201, result, keep_alive)
+            raise HTTPError(405, f'{method} not allowed on {unquote(path)}')
+        except HTTPError as e:
+            await self._respond(writer, e.status, e.body, keep_alive)
+        except ConnectionError:
+            raise                                    # nothing more can be sent
+        except Exception as e:                       # keep serving
+            await self._respond(writer, 500, {'error': f'{type(e).__name__}: {e}'},
+                                keep_alive)
+
+    async def _respond(self, writer, status, obj, keep_alive):
+        await self._send(writer, status, 'application/json', _json(obj), keep_alive)
+
+    async def _send(self, writer, status, content_type, data, keep_alive):
+        writer.write(b'HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n'
+                     b'Connection: %s\r\n\r\n%s' % (
+                         status, REASONS[status].encode(), content_type.encode(), len(data),
+                         b'keep-alive' if keep_alive else b'close', data))
+        await writer.drain()
+
+    async def _stream(self, writer, keep_alive, pages):
+        """
+        Send a JSON array in chunked encoding, one page of rows at a
+        time, so a million-row answer never sits in memory.
+        """
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                     b'Transfer-Encoding: chunked\r\nConnection: %s\r\n\r\n'
+                     % (b'keep-alive' if keep_alive else b'close'))
+        first = True
+        try:
+            async for rows in pages:
+                if not rows:
+                    continue
+                data = (b'[' if first else b',') + _json(rows)[1:-1]
+                first = False
+                writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+                await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # The 200 is already out, so an error status would land in
+            # the body; cut the connection instead, before the final
+            # chunk, and the client sees an incomplete answer
+            writer.transport.abort()
+            raise ConnectionAbortedError(f'stream failed: {type(e).__name__}: {e}') from e
+        tail = b'[]' if first else b']'
+        writer.write(b'%x\r\n%s\r\n0\r\n\r\n' % (len(tail), tail))
+        await writer.drain()
+
+    # ── Endpoints ────────────────────────────────────────────
+    async def _search(self, query):
+        q = (query.get('q') or [''])[0].strip()
+        limit = _int(query, 'limit', 20, 1, 200)
+        if not q:
+            return {'patients': [], 'appointments': []}
+        if self.index is None:
+            raise HTTPError(503, 'search index is still loading')
+        if self._refreshing is not None and not self._refreshing.done():
+            await self._refreshing           # answer from the new rows, not stale ones
+        results = await asyncio.get_running_loop().run_in_executor(None, self.index.search, q)
+        out = {'patients': [], 'appointments': []}
+        for kind, record in results:
+            bucket = out[kind + 's']
+            if len(bucket) < limit:
+                bucket.append(record.to_dict())
+        return out
+
+    async def _report(self, query):
+        if self.index is None:
+            raise HTTPError(503, 'records are still loading')
+        if self._refreshing is not None and not self._refreshing.done():
+            await self._refreshing
+        by = [d for d in (query.get('by') or ['doctor'])[0].split(',') if d]
+        date_from, date_to, status = ((query.get(name) or [None])[0]
+                                      for name in ('from', 'to', 'status'))
+        try:
+            rows = await asyncio.get_running_loop().run_in_executor(
+                None, self.reports.report, by, date_from, date_to, status)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        return {'by': by, 'rows': [{'key': list(key), 'visits': visits, 'billed': billed}
+                                   for key, visits, billed in rows]}
+
+    async def _get_patient(self, raw_id):
+        if not raw_id.isdigit():
+            raise HTTPError(400, 'patient id must be a number')
+        row = await self.pool.run(_fetch_one, PATIENT_SQL + ' WHERE patient_id = ?',
+                                  (int(raw_id),))
+        if row is None:
+            raise HTTPError(404, f'no patient {raw_id}')
+        return _patient(row)
+
+    async def _stream_patients(self, writer, query, keep_alive):
+        after, limit = _int(query, 'after', 0, 0), _int(query, 'limit', 1000, 1, MAX_LIMIT)
+        order = (query.get('order') or ['id'])[0]
+        if order == 'id':
+            keyset, key = PATIENTS_BY_ID, (after,)
+        elif order == 'name':
+            # from + after: the name and id of the last patient already seen
+            keyset, key = PATIENTS_BY_NAME, ((query.get('from') or [''])[0], after)
+        else:
+            raise HTTPError(400, 'order must be id or name')
+        await self._stream(writer, keep_alive, self._pages(keyset, key, limit, _patient))
+
+    async def _stream_appointments(self, writer, query, keep_alive):
+        date_from = (query.get('from') or ['0000-00-00'])[0]
+        date_to = (query.get('to') or ['9999-99-99'])[0]
+        limit = _int(query, 'limit', 1000, 1, MAX_LIMIT)
+        # same walk as ClinicStore.appointment_rows
+        await self._stream(writer, keep_alive, self._pages(
+            APPOINTMENTS_BY_DATE, first_on(date_from), limit, _appointment, upto=date_to))
+
+    async def _pages(self, keyset, key, limit, make, upto=None):
+        """Up to `limit` records following `key`, PAGE_ROWS per query."""
+        while limit > 0:
+            rows, key = keyset.split(await self.pool.run(
+                _fetch_all, *keyset.page(key, min(PAGE_ROWS, limit), upto)))
+            if not rows:
+                return
+            yield [make(r) for r in rows]
+            limit -= len(rows)
+
+    async def _book(self, body):
+        try:
+            fields = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, 'body must be JSON') from None
+        if not isinstance(fields, dict):
+            raise HTTPError(400, 'body must be a JSON object')
+        appointment, error = validate_appointment(
+            {k: (v if k == 'patient_id' else str(v)) for k, v in fields.items()
+             if v is not None})
+        if error:
+            raise HTTPError(400, error[1], field=error[0])
+        # one booking at a time, so two requests cannot take the same slot
+        async with self._booking:
+            if 'patient_id' in appointment:
+                row = await self.pool.run(_fetch_one, 'SELECT 1 FROM patients WHERE patient_id = ?',
+                                          (appointment['patient_id'],))
+                if row is None:
+                    raise HTTPError(400, f"no patient {appointment['patient_id']}",
+                                    field='patient_id')
+            if appointment['time']:
+                clash, free = await self.pool.run(_check_slot, appointment)
+                if clash is not None:
+                    raise HTTPError(409, f"{appointment['doctor']} is booked at {clash['time']}",
+                                    conflict=clash, free=[{'date': d, 'time': t} for d, t in free])
+            loop = asyncio.get_running_loop()
+            appointment['id'] = await loop.run_in_executor(
+                None, self.store.add_appointment, appointment)
+            await loop.run_in_executor(None, self.store.flush)
+        self._check_changes()
+        return appointment
+
+
+# ── Queries (run on pool threads) ────────────────────────────
+def _fetch_one(conn, sql, args):
+    return conn.execute(sql, args).fetchone()
+
+
+def _fetch_all(conn, sql, args):
+    return conn.execute(sql, args).fetchall()
+
+
+def _new_rows(conn, last_patient, last_appointment):
+    patients = conn.execute(PATIENT_SQL + ' WHERE patient_id > ? ORDER BY patient_id',
+                            (last_patient,)).fetchall()
+    appointments = conn.execute(APPOINTMENT_SQL + ' WHERE appointment_id > ? '
+                                'ORDER BY appointment_id', (last_appointment,)).fetchall()
+    counts = conn.execute('SELECT (SELECT COUNT(*) FROM patients), '
+                          '(SELECT COUNT(*) FROM appointments)').fetchone()
+    return patients, appointments, tuple(counts)
+
+
+def _index_rows(index, patients, appointments):
+    if patients:
+        index.add_patients([_patient(r) for r in patients])
+    for r in appointments:
+        index.add_appointment(_appointment(r))
+
+
+def _check_slot(conn, appointment):
+    """(clashing appointment, next free slots) from the doctor's bookings."""
+    day = appointment['date']
+    schedule = ScheduleIndex()
+    schedule.load(_doctor_rows(conn, appointment['doctor'], ' AND date = ?', (day,)))
+    clash = schedule.conflict(appointment)
+    if clash is None:
+        return None, []
+    week = (Date.fromisoformat(day) + timedelta(days=SUGGEST_DAYS)).isoformat()
+    schedule.load(_doctor_rows(conn, appointment['doctor'], ' AND date > ? AND date < ?',
+                               (day, week)))
+    return clash, schedule.free_slots(appointment['doctor'], 3, day, appointment['time'],
+                                      max_days=SUGGEST_DAYS)
+
+
+def _doctor_rows(conn, doctor, where, args):
+    # NOCASE narrows the rows in SQL; doctor_key (which also folds
+    # inner spaces) decides, as it does in ScheduleIndex
+    key = doctor_key(doctor)
+    rows = conn.execute(APPOINTMENT_SQL + ' WHERE doctor = ? COLLATE NOCASE' + where,
+                        (' '.join(doctor.split()),) + args)
+    return (a for a in map(_appointment, rows) if doctor_key(a['doctor']) == key)
+
+
+def _int(query, name, default, lo, hi=None):
+    raw = (query.get(name) or [None])[0]
+    if raw is None:
+        return default
+    if not raw.isdigit():
+        raise HTTPError(400, f'{name} must be a whole number')
+    value = int(raw)
+    return max(lo, value if hi is None else min(value, hi))
+
+
+# ── Entry point ──────────────────────────────────────────────
+async def serve(db_path=DB_PATH, host=HOST, port=PORT):
+    api = ClinicAPI(db_path)
+    server = await api.start(host, port)
+    print(f'Smart Clinic API on http://{host}:{port}/  (database {db_path})')
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Smart Clinic local JSON API')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,389 @@
+# ============================================================
+#  Autocomplete — Patient Name and Doctor suggestions
+#  Smart Clinic Management System
+#  Names are kept in a sorted array; a typed prefix is one
+#  contiguous run found with two bisects.  Suggestions are the
+#  run's most-booked entries: short runs are ranked on the spot,
+#  long ones (single letters on a big clinic) have their top
+#  entries cached, so every keystroke costs about the same.
+# ============================================================
+
+import heapq
+import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+TOP_K = 8                  # suggestions per keystroke
+SCAN_LIMIT = 256           # runs up to this long are ranked on the spot
+_END = '\U0010ffff'        # sorts after every character
+
+COLORS = {
+    'card':    '#ffffff',
+    'text':    '#1e2d40',
+    'muted':   '#8a99b0',
+    'accent':  '#4f7ef8',
+    'border':  '#dde3ef',
+}
+
+FONTS = {
+    'normal':  ('Segoe UI', 11),
+}
+
+
+def fold(text):
+    """'  Aung  KO ' -> 'aung ko': how names are compared."""
+    return ' '.join(str(text).casefold().split()) if text else ''
+
+
+class _Keys:
+    """Read-only sequence of keys over `order`, for bisect."""
+
+    __slots__ = ('order', 'key')
+
+    def __init__(self, order, key):
+        self.order, self.key = order, key
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.key(self.order[i])
+
+
+# ── The engine ───────────────────────────────────────────────
+class PrefixCompleter:
+    """
+    Items are small ints (table rows, doctor codes); label(item) gives
+    the text they are found by.  `order` holds the items sorted by
+    folded label and `weights[item]` their booking count.
+    """
+
+    def __init__(self, label, k=TOP_K):
+        self.label = label
+        self.k = k
+        self.order = array('I')
+        self.weights = array('I')
+        self._top = {}          # prefix -> best items, for runs over SCAN_LIMIT
+        self._key = self.key
+
+    def key(self, item):
+        return fold(self.label(item))
+
+    def __len__(self):
+        return len(self.order)
+
+    def build(self, items, weights, keys=None):
+        """
+        Index `items` with `weights` (indexed by item).  `keys`, if
+        given, are the items' folded labels, indexed by item, which
+        saves reading every label twice.
+        """
+        self._key = keys.__getitem__ if keys is not None else self.key
+        self.weights = array('I', weights)
+        self.order = array('I', sorted(items, key=self._key))
+        self._top = {}
+        self._rank('', 0, len(self.order))      # fills the cache for long runs
+        self._key = self.key
+
+    def complete(self, text, k=None):
+        """The best `k` items whose label starts with `text`."""
+        prefix = fold(text)
+        if prefix and text[-1:].isspace():
+            prefix += ' '                       # 'aung ' should not match 'aungmin'
+        lo, hi = self._run(prefix)
+        return self._rank(prefix, lo, hi)[:k or self.k]
+
+    def _run(self, prefix, lo=0, hi=None):
+        keys = _Keys(self.order, self._key)
+        hi = len(self.order) if hi is None else hi
+        lo = bisect_left(keys, prefix, lo, hi)
+        return lo, bisect_left(keys, prefix + _END, lo, hi)
+
+    def _best(self, items):
+        # nlargest is stable, so equal weights stay in name order
+        return heapq.nlargest(self.k, items, key=self.weights.__getitem__)
+
+    def _rank(self, prefix, lo, hi):
+        """Best items of order[lo:hi], all of which start with `prefix`."""
+        if hi - lo <= SCAN_LIMIT:
+            return self._best(self.order[lo:hi])
+        top = self._top.get(prefix)
+        if top is not None:
+            return top
+        # Long run: merge the best of each one-letter-longer prefix
+        keys = _Keys(self.order, self._key)
+        n, i, candidates = len(prefix), lo, []
+        while i < hi:
+            key = keys[i]
+            if len(key) == n:                   # the prefix itself sorts first
+                j = bisect_right(keys, key, i, hi)
+                candidates += self._best(self.order[i:j])
+            else:
+                child = key[:n + 1]
+                j = bisect_left(keys, child + _END, i, hi)
+                candidates += self._rank(child, i, j)
+            i = j
+        top = self._top[prefix] = self._best(candidates)
+        return top
+
+    # ── Changes ──────────────────────────────────────────────
+    def add(self, item, weight=0):
+        if item >= len(self.weights):
+            self.weights.extend([0] * (item + 1 - len(self.weights)))
+        self.weights[item] = weight
+        key = self.key(item)
+        self.order.insert(bisect_right(_Keys(self.order, self.key), key), item)
+        if weight:
+            self._touch(key, item)
+
+    def add_many(self, items):
+        """Add weight-0 items in one merge pass (imports)."""
+        new = sorted(items, key=self.key)
+        if not new:
+            return
+        top = max(new)
+        if top >= len(self.weights):
+            self.weights.extend([0] * (top + 1 - len(self.weights)))
+        keys = _Keys(self.order, self.key)
+        out, lo = array('I'), 0
+        for item in new:
+            pos = bisect_right(keys, self.key(item), lo)
+            out.extend(self.order[lo:pos])
+            out.append(item)
+            lo = pos
+        out.extend(self.order[lo:])
+        self.order = out
+
+    def remove(self, item, key=None):
+        """Drop an item; `key` is its label as it was indexed, if it has changed."""
+        key = self.key(item) if key is None else key
+        lo, hi = self._run(key)
+        try:
+            pos = self.order.index(item, lo, hi) if hi > lo else self.order.index(item)
+        except ValueError:
+            pos = self.order.index(item)        # label changed since it was indexed
+        del self.order[pos]
+        for end in range(len(key) + 1):
+            self._top.pop(key[:end], None)
+        self.weights[item] = 0
+
+    def bump(self, item, n=1):
+        """Count n more bookings for an item."""
+        self.weights[item] += n
+        self._touch(self.key(item), item)
+
+    def _touch(self, key, item):
+        # Only an item whose weight went up can enter a cached list
+        weight = self.weights.__getitem__
+        for end in range(len(key) + 1):
+            top = self._top.get(key[:end])
+            if top is None:
+                continue
+            if item not in top:
+                if len(top) >= self.k and weight(item) <= weight(top[-1]):
+                    continue
+                top.append(item)
+            top.sort(key=weight, reverse=True)
+            del top[self.k:]
+
+
+# ── Patients and doctors from ClinicRecords ─────────────────
+class Autocomplete:
+    """
+    Patient-name and doctor suggestions over a ClinicRecords, ranked by
+    how many appointments each has.  build() once on a worker thread,
+    then sync() after writes to pick up the new rows.
+    """
+
+    def __init__(self, records, k=TOP_K):
+        self.records = records
+        self.lock = records.lock
+        patients, appointments = records.patients, records.appointments
+        self.patients = PrefixCompleter(lambda row: patients.name[row], k)
+        self.doctors = PrefixCompleter(lambda code: appointments.doctor.values[code], k)
+        self._patient_rows = 0          # table rows seen so far
+        self._appointment_rows = 0
+
+    def build(self, chunk=50_000):
+        p, a = self.records.patients, self.records.appointments
+        with self.lock:
+            n_patients, n_appointments = len(p.ids), len(a.ids)
+            bookings = Counter(a.patient_id[:n_appointments])
+            doctor_counts = Counter(a.doctor.codes[:n_appointments])
+            doctors = list(a.doctor.values)
+            dead = set(p.dead)
+        # Names are read a chunk at a time so the list views are not
+        # kept waiting on the lock for the whole build
+        keys = []
+        for start in range(0, n_patients, chunk):
+            with self.lock:
+                name = p.name
+                keys += [fold(name[r]) for r in range(start, min(start + chunk, n_patients))]
+        weights = array('I', bytes(4 * n_patients))
+        with self.lock:
+            for patient_id, n in bookings.items():
+                row = p.row_of(patient_id) if patient_id else None
+                if row is not None and row < n_patients:
+                    weights[row] = n
+        self.patients.build((r for r in range(n_patients) if r not in dead), weights, keys)
+        self.doctors.build(range(len(doctors)),
+                           [doctor_counts[c] for c in range(len(doctors))],
+                           [fold(d) for d in doctors])
+        with self.lock:
+            self._patient_rows, self._appointment_rows = n_patients, n_appointments
+            self.sync()
+        return self
+
+    def sync(self):
+        """Take in patients and appointments added since the last look."""
+        with self.lock:
+            p, a = self.records.patients, self.records.appointments
+            new = [r for r in range(self._patient_rows, len(p.ids)) if r not in p.dead]
+            if len(new) > 64:
+                self.patients.add_many(new)
+            else:
+                for row in new:
+                    self.patients.add(row)
+            self._patient_rows = len(p.ids)
+
+            known_doctors = len(self.doctors.weights)
+            for row in range(self._appointment_rows, len(a.ids)):
+                patient = p.row_of(a.patient_id[row]) if a.patient_id[row] else None
+                if patient is not None and patient < len(self.patients.weights):
+                    self.patients.bump(patient)
+                code = a.doctor.codes[row]
+                while known_doctors <= code:    # a doctor not seen before
+                    self.doctors.add(known_doctors)
+                    known_doctors += 1
+                self.doctors.bump(code)
+            self._appointment_rows = len(a.ids)
+
+    def merge_patients(self, merges):
+        """After SearchIndex.merge_patients: each kept one takes the bookings."""
+        with self.lock:
+            p = self.records.patients
+            for kept, dropped_id in merges:
+                dropped, row = _any_row(p, dropped_id), p.row_of(kept['id'])
+                if dropped is None or row is None or dropped >= len(self.patients.weights):
+                    continue
+                moved = self.patients.weights[dropped]
+                self.patients.remove(dropped)
+                weight = self.patients.weights[row]
+                self.patients.remove(row, key='')   # its name may have been filled in
+                self.patients.add(row, weight + moved)
+
+    # ── What the dialog asks for ─────────────────────────────
+    def patient_suggestions(self, text):
+        """[(patient_id, name, label)] best first."""
+        with self.lock:
+            p = self.records.patients
+            out = []
+            for row in self.patients.complete(text):
+                name, phone, n = p.name[row] or '', p.phone[row], self.patients.weights[row]
+                label = name + (f'   ·  {phone}' if phone else '')
+                if n:
+                    label += f'   ·  {n} visit{"s" if n != 1 else ""}'
+                out.append((p.ids[row], name, label))
+            return out
+
+    def doctor_suggestions(self, text):
+        """[(name, name, label)] best first."""
+        with self.lock:
+            values = self.records.appointments.doctor.values
+            return [(values[c], values[c], values[c]) for c in self.doctors.complete(text)]
+
+
+def _any_row(table, record_id):
+    """Row of an id, removed or not (table.row_of skips removed rows)."""
+    pos = bisect_left(table.ids, record_id)
+    if pos < len(table.ids) and table.ids[pos] == record_id:
+        return pos
+    try:
+        return table.ids.index(record_id)
+    except ValueError:
+        return None
+
+
+# ── Dropdown ─────────────────────────────────────────────────
+class SuggestionBox:
+    """
+    A list that drops down under an entry while typing.
+    complete(text) -> [(value, text, label)]; picking one (click,
+    Return or Tab) puts its text in the entry and calls
+    on_pick(value, text).
+    """
+
+    NAV_KEYS = ('Up', 'Down', 'Return', 'KP_Enter', 'Tab', 'Escape')
+
+    def __init__(self, entry, complete, on_pick=None, rows=6):
+        self.entry = entry
+        self.complete = complete
+        self.on_pick = on_pick
+        self.choices = []
+        self.anchor = entry.master           # the bordered frame around it
+        self.listbox = tk.Listbox(entry.winfo_toplevel(), font=FONTS['normal'],
+                                  height=rows, relief=tk.FLAT, highlightthickness=1,
+                                  highlightbackground=COLORS['accent'],
+                                  bg=COLORS['card'], fg=COLORS['text'],
+                                  selectbackground=COLORS['accent'],
+                                  selectforeground='white',
+                                  activestyle='none', takefocus=0)
+        self.listbox.bind('<ButtonRelease-1>', lambda e: self.pick())
+        entry.bind('<KeyRelease>', self._typed, add='+')
+        entry.bind('<Down>', lambda e: self._move(1))
+        entry.bind('<Up>', lambda e: self._move(-1))
+        entry.bind('<Return>', lambda e: self.pick())
+        entry.bind('<Tab>', lambda e: self.pick())
+        entry.bind('<Escape>', lambda e: self.hide())
+        entry.bind('<FocusOut>', lambda e: entry.after(150, self.hide), add='+')
+
+    @property
+    def shown(self):
+        return bool(self.listbox.winfo_manager())
+
+    def _typed(self, e):
+        if e.keysym in self.NAV_KEYS:
+            return
+        text = self.entry.get()
+        self.choices = self.complete(text) if text.strip() else []
+        if not self.choices:
+            return self.hide()
+        self.listbox.delete(0, tk.END)
+        for _, _, label in self.choices:
+            self.listbox.insert(tk.END, label)
+        self.listbox.config(height=min(len(self.choices), 6))
+        self.listbox.selection_set(0)
+        if not self.shown:
+            self.listbox.place(in_=self.anchor, x=0, rely=1.0, relwidth=1.0)
+            self.listbox.lift()
+
+    def _move(self, step):
+        if not self.shown:
+            return None
+        current = self.listbox.curselection()
+        i = max(0, min(len(self.choices) - 1, (current[0] if current else -1) + step))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(i)
+        self.listbox.see(i)
+        return 'break'
+
+    def pick(self):
+        if not self.shown:
+            return None                      # let Return / Tab do their usual job
+        current = self.listbox.curselection()
+        self.hide()
+        if not current:
+            return 'break'
+        value, text, _ = self.choices[current[0]]
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, text)
+        if self.on_pick:
+            self.on_pick(value, text)
+        return 'break'
+
+    def hide(self):
+        if not self.shown:
+            return None
+        self.listbox.place_forget()
+        return 'break'
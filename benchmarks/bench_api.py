@@ -0,0 +1,115 @@
+# ============================================================
+#  Benchmark — requests per second through api_server.py
+#  Smart Clinic Management System
+#  Server and keep-alive clients share one event loop (one core),
+#  so the numbers are a floor for the server on its own.
+#  Run:  python benchmarks/bench_api.py [patients] [clients]
+# ============================================================
+
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_server import ClinicAPI  # noqa: E402
+from clinic_store import ClinicStore  # noqa: E402
+from run import batches, synthetic_appointments, synthetic_patients  # noqa: E402
+
+DURATION = 3.0
+
+
+async def request(reader, writer, method, path, body=b''):
+    writer.write(b'%s %s HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s'
+                 % (method.encode(), path.encode(), len(body), body))
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head[9:12])
+    headers = head.lower()
+    if b'transfer-encoding: chunked' in headers:
+        data = b''
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            data += await reader.readexactly(size + 2)
+            if not size:
+                return status, data
+    length = int(headers.split(b'content-length: ')[1].split(b'\r\n')[0])
+    return status, await reader.readexactly(length)
+
+
+async def client(port, paths, deadline, counts):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    rnd = random.Random(id(counts))
+    while time.perf_counter() < deadline:
+        status, _ = await request(reader, writer, 'GET', rnd.choice(paths))
+        counts[status] = counts.get(status, 0) + 1
+    writer.close()
+    await writer.wait_closed()
+
+
+async def scenario(port, name, paths, clients):
+    counts = {}
+    t = time.perf_counter()
+    await asyncio.gather(*(client(port, paths, t + DURATION, counts)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - t
+    total = sum(counts.values())
+    print(f'{name:<34} {total / elapsed:9.0f} req/s   statuses {counts}')
+
+
+async def main(n, clients):
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'bench.db')
+    store = ClinicStore(path)
+    for b in batches(synthetic_patients(n)):
+        store.add_patients(b)
+    for b in batches(synthetic_appointments(n, n)):
+        store.add_appointments(b)
+    store.close()
+
+    api = ClinicAPI(path)
+    server = await api.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    while api.index is None:
+        await asyncio.sleep(0.05)
+    print(f'{n:,} patients, {clients} keep-alive clients, {DURATION:.0f} s each')
+
+    hot = [f'/api/patients/{i}' for i in range(1, 101)]
+    await scenario(port, 'GET patient (hot, cached)', hot, clients)
+    cold = [f'/api/patients/{random.randrange(1, n + 1)}' for _ in range(50_000)]
+    await scenario(port, 'GET patient (cold, pooled SQLite)', cold, clients)
+    await scenario(port, 'GET search (cached)',
+                   ['/api/search?q=aung', '/api/search?q=khin+moe', '/api/search?q=dr+tun'],
+                   clients)
+    await scenario(port, 'GET 500 patients (streamed)',
+                   [f'/api/patients?after={i * 500}&limit=500' for i in range(20)], clients)
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    t = time.perf_counter()
+    booked = 0
+    for i in range(200):
+        body = (b'{"patient_id": 1, "patient": "Bench", "doctor": "Dr Bench", '
+                b'"date": "2030-01-%02d", "time": "%02d:%02d", "status": "Scheduled"}'
+                % (i // 16 + 1, 9 + i % 16 // 2, i % 2 * 30))
+        status, _ = await request(reader, writer, 'POST', '/api/appointments', body)
+        booked += status == 201
+    print(f'{"POST appointment (one client)":<34} {200 / (time.perf_counter() - t):9.0f} req/s'
+          f'   booked {booked}/200')
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.1)        # let the server see the clients hang up
+
+    server.close()
+    await server.wait_closed()
+    api.close()
+    shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+                     int(sys.argv[2]) if len(sys.argv) > 2 else 16))
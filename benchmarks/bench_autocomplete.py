@@ -0,0 +1,56 @@
+# ============================================================
+#  Benchmark — autocomplete latency per keystroke
+#  Smart Clinic Management System
+#  Run:  python benchmarks/bench_autocomplete.py [patients]
+# ============================================================
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from autocomplete import Autocomplete  # noqa: E402
+from records import ClinicRecords  # noqa: E402
+from run import batches, synthetic_appointments, synthetic_patients  # noqa: E402
+
+# Each name typed a letter at a time, as a receptionist would
+TYPED = ('Aung Ko', 'Thandar Kyaw', 'Khin Moe', 'Zin', 'Tun Tun', 'Ei Htet', 'Xavier')
+
+
+def main(n=1_000_000):
+    records = ClinicRecords()
+    next_id = 1
+    for batch in batches(synthetic_patients(n)):
+        for p in batch:
+            p['id'], next_id = next_id, next_id + 1
+        records.patients.extend(batch, place=False)
+    for batch in batches(synthetic_appointments(n, n)):
+        records.appointments.extend(batch, place=False)
+    print(f'{n:,} patients, {n:,} appointments')
+
+    t = time.perf_counter()
+    autocomplete = Autocomplete(records).build()
+    print(f'  build: {time.perf_counter() - t:.2f} s')
+
+    times = []
+    for _ in range(20):
+        for name in TYPED:
+            for end in range(1, len(name) + 1):
+                t = time.perf_counter()
+                autocomplete.patient_suggestions(name[:end])
+                times.append(time.perf_counter() - t)
+    times.sort()
+    ms = lambda q: times[min(len(times) - 1, int(len(times) * q))] * 1000
+    print(f'  patient keystroke: p50 {ms(0.5):.3f} ms, p99 {ms(0.99):.3f} ms, '
+          f'max {times[-1] * 1000:.3f} ms over {len(times):,}')
+
+    t = time.perf_counter()
+    for end in range(1, 8):
+        autocomplete.doctor_suggestions('Dr Tun'[:end])
+    print(f'  doctor keystroke: {(time.perf_counter() - t) / 7 * 1000:.3f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,109 @@
+# ============================================================
+#  Benchmark — calendar cells for a busy month
+#  Smart Clinic Management System
+#  5,000 appointments across 50 doctors in one month.  Times the
+#  cell grouping behind calendar_view.CalendarView and counts the
+#  cells an add, a move and a cancel mark for redraw.  With a
+#  display it also times the canvas redraws themselves.
+#  Run:  python benchmarks/bench_calendar.py [appointments] [doctors]
+# ============================================================
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_view import CalendarCells, CalendarView  # noqa: E402
+from records import ClinicRecords  # noqa: E402
+
+MONTH = date(2026, 3, 1)
+
+
+def month_of_appointments(n, doctors, seed=21):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield {'id': i + 1, 'patient_id': i + 1, 'patient': f'Patient {i + 1}',
+               'doctor': f'Dr {rnd.randrange(doctors):02d}',
+               'date': (MONTH + timedelta(days=rnd.randrange(31))).isoformat(),
+               'time': f'{rnd.randrange(9, 17):02d}:{rnd.choice((0, 30)):02d}',
+               'status': rnd.choice(('Scheduled', 'Completed', 'Cancelled'))}
+
+
+def timed(label, fn, repeat=20):
+    t = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f'  {label:<30} {(time.perf_counter() - t) / repeat * 1000:8.2f} ms')
+    return result
+
+
+def changes(records):
+    """(label, change) pairs; each change edits the records like a save would."""
+    table = records.appointments
+    new_id = len(table) + 1
+
+    def add():
+        table.place(table.append({'id': new_id, 'patient_id': 1, 'patient': 'Walk In',
+                      'doctor': 'Dr 00', 'date': '2026-03-10', 'time': '10:00',
+                      'status': 'Scheduled'}))
+
+    def move():
+        row = table.row_of(new_id)
+        table.update(row, dict(table.get(row).to_dict(), date='2026-03-12', time='15:30'))
+
+    def cancel():
+        row = table.row_of(new_id)
+        table.update(row, dict(table.get(row).to_dict(), status='Cancelled'))
+
+    return (('add', add), ('move', move), ('cancel', cancel))
+
+
+def main(n=5000, doctors=50):
+    records = ClinicRecords()
+    records.appointments.extend(list(month_of_appointments(n, doctors)))
+    print(f'{n:,} appointments, {doctors} doctors, {MONTH:%B %Y}')
+
+    for mode in ('month', 'week'):
+        cells = CalendarCells(records, mode, MONTH + timedelta(days=9))
+        dirty = timed(f'{mode}: load whole range', lambda: (cells.show(mode, cells.anchor),
+                                                            cells.load())[1])
+        print(f'  {mode}: {len(dirty)} cells hold appointments')
+        for label, change in changes(records):
+            change()
+            dirty = cells.load()
+            print(f'  {mode}: {label:<7} marks {len(dirty)} cell(s) for redraw')
+        records.appointments.remove(records.appointments.row_of(n + 1))
+        cells.load()
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as exc:
+        print(f'  canvas timings skipped: {exc}')
+        return
+    root.geometry('1200x800')
+    view = CalendarView(root, records, mode='month')
+    view.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    for mode in ('month', 'week'):
+        view._select(mode)
+        view._show(mode, MONTH + timedelta(days=9))
+        root.update()
+        print(f'  {mode}: {len(view.canvas.find_all())} canvas items')
+        timed(f'{mode}: full redraw', lambda: (view._layout(), root.update()))
+        timed(f'{mode}: scroll a screen', lambda: (view.canvas.yview_scroll(1, 'pages'),
+                                                   root.update()))
+        for label, change in changes(records):
+            change()
+            timed(f'{mode}: refresh after {label}', lambda: (view.refresh(), root.update()),
+                  repeat=1)
+        records.appointments.remove(records.appointments.row_of(n + 1))
+        view.refresh()
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,80 @@
+# ============================================================
+#  Benchmark — durable saves: fsync per record vs the journal
+#  Smart Clinic Management System
+#  Every save below is on disk when add_patient() returns.
+#  "fsync per record" commits each save with synchronous=FULL;
+#  "journal" is ClinicStore(journal=True), which syncs the saves
+#  that arrive together with one fsync.  One thread (one person
+#  saving) still needs an fsync per save; 4 threads is the app's
+#  worker pool.  The gap grows with the disk's fsync time, which is
+#  printed first.
+#  Run:  python benchmarks/bench_journal.py [saves per thread] [threads]
+# ============================================================
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clinic_store import ClinicStore  # noqa: E402
+
+
+def fsync_per_record(path):
+    store = ClinicStore(path, batch_size=1)
+    store._conn.execute('PRAGMA synchronous=FULL')
+    return store
+
+
+def journaled(path):
+    return ClinicStore(path, journal=True)
+
+
+def run(make_store, saves, threads):
+    tmp = tempfile.mkdtemp()
+    store = make_store(os.path.join(tmp, 'bench.db'))
+
+    def worker(n):
+        for i in range(saves):
+            store.add_patient({'name': f'Patient {n}-{i}', 'age': 30,
+                               'phone': '09123456789', 'gender': 'Female'})
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    t = time.perf_counter()
+    for th in pool:
+        th.start()
+    for th in pool:
+        th.join()
+    elapsed = time.perf_counter() - t
+    syncs = store._journal.syncs if store._journal is not None else saves * threads
+    store.close()
+    shutil.rmtree(tmp)
+    return saves * threads / elapsed, saves * threads / max(syncs, 1)
+
+
+def fsync_time(n=200):
+    fd, path = tempfile.mkstemp()
+    t = time.perf_counter()
+    for _ in range(n):
+        os.write(fd, b'x' * 100)
+        os.fsync(fd)
+    elapsed = (time.perf_counter() - t) / n
+    os.close(fd)
+    os.remove(path)
+    return elapsed
+
+
+def main(saves=200, threads=16):
+    print(f'fsync on this disk: {fsync_time() * 1000:.2f} ms; {saves} saves per thread')
+    for count in sorted({1, 4, threads}):
+        for name, make in (('fsync per record', fsync_per_record), ('journal', journaled)):
+            rate, per_sync = run(make, saves, count)
+            print(f'  {count:>2} thread(s)  {name:<17} {rate:8.0f} saves/s'
+                  f'   {per_sync:5.1f} saves per fsync')
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:3]))
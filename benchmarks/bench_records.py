@@ -0,0 +1,76 @@
+# ============================================================
+#  Benchmark — memory of dict records vs the column tables
+#  Smart Clinic Management System
+#  Run:  python benchmarks/bench_records.py [patients]
+# ============================================================
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import ClinicRecords  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+FIRST = ('Aung', 'Thandar', 'Kyaw', 'Su', 'Mya', 'Zaw', 'Hnin', 'Min', 'Nay', 'Phyo',
+         'Ei', 'Htet', 'Khin', 'Moe', 'Soe', 'Thiri', 'Wai', 'Yamin', 'Zin', 'Tun')
+DOMAINS = ('gmail.com', 'yahoo.com', 'clinic.org', 'mail.mm')
+
+
+def make_patients(n, seed=3):
+    rnd = random.Random(seed)
+    for pid in range(1, n + 1):
+        a, b = rnd.choice(FIRST), rnd.choice(FIRST)
+        yield {'id': pid, 'name': f'{a} {b} {rnd.choice(FIRST)}', 'age': rnd.randrange(1, 95),
+               'phone': f'09{rnd.randrange(10**9):09d}',
+               'email': f'{a.lower()}.{b.lower()}{pid}@{rnd.choice(DOMAINS)}',
+               'gender': rnd.choice(('Male', 'Female'))}
+
+
+def measure(label, build, n):
+    tracemalloc.start()
+    t = time.perf_counter()
+    kept = build()
+    elapsed = time.perf_counter() - t
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'  {label:<30} {size / 2**20:8.1f} MiB  {size / n:6.0f} B/patient  {elapsed:6.1f} s')
+    return size, kept
+
+
+def main(n=200_000):
+    print(f'{n:,} patients')
+    dicts, _ = measure('dict per patient', lambda: {p['id']: p for p in make_patients(n)}, n)
+
+    def table():
+        records = ClinicRecords()
+        records.patients.extend(make_patients(n), place=False)
+        records.patients.resort()
+        return records
+    columns, records = measure('PatientTable', table, n)
+    print(f'  reduction: {dicts / columns:.1f}x')
+
+    def index():
+        index = SearchIndex()
+        index.patients.add_many(make_patients(n), place=False)
+        index.records.patients.resort()
+        return index
+    searchable, index = measure('SearchIndex (table + tokens)', index, n)
+    print(f'  index alone: {(searchable - columns) / n:.0f} B/patient;'
+          f' table + index vs dicts: {searchable / dicts:.2f}x')
+
+    t = time.perf_counter()
+    for q in ('aung', 'thandar k', '0912', 'zin@', 'gmail.com'):
+        index.search(q)
+    print(f'  5 searches: {(time.perf_counter() - t) * 1000:.1f} ms')
+    t = time.perf_counter()
+    for offset in range(0, n, n // 100):
+        records.patient_page(offset, 100)
+    print(f'  100 list pages: {(time.perf_counter() - t) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
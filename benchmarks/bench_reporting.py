@@ -0,0 +1,93 @@
+# ============================================================
+#  Benchmark — grouped visit & revenue reports
+#  Smart Clinic Management System
+#  Fills the appointment columns of records.py directly (building
+#  10M record dicts would take longer than the reports) and times
+#  reporting.ReportEngine: first run, cached run, and the
+#  plain-Python pass used when numpy is missing (on at most
+#  FALLBACK_ROWS rows; it takes about a second per million).
+#  Run:  python benchmarks/bench_reporting.py [appointments]
+# ============================================================
+
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reporting  # noqa: E402
+from records import ClinicRecords  # noqa: E402
+
+YEARS = 5
+DOCTORS = tuple(f'Dr {i:02d}' for i in range(50))
+STATUSES = ('Scheduled', 'Completed', 'Cancelled')
+FEES = (float('nan'), 15.0, 25.0, 40.0, 60.0)
+FALLBACK_ROWS = 1_000_000
+
+REPORTS = (
+    (('doctor',), None, None, None),
+    (('doctor', 'month'), None, None, None),
+    (('week', 'status'), '2025-01-01', '2026-12-31', None),
+    (('day',), None, None, 'Completed'),
+    (('year', 'doctor', 'status'), None, None, None),
+)
+
+
+def fill(records, n, seed=31):
+    """n appointments over YEARS years, written straight into the columns."""
+    table = records.appointments
+    days = [(date(2022, 1, 1) + timedelta(days=i)).isoformat() for i in range(365 * YEARS)]
+    for column, values in ((table.doctor, DOCTORS), (table.status, STATUSES),
+                           (table.date, days)):
+        for value in values:
+            column.code(value)
+    rnd = random.Random(seed)
+    if reporting.np is not None:
+        gen = reporting.np.random.default_rng(seed)
+        pick = lambda k, typecode: array(typecode, gen.integers(0, k, n).astype(typecode).tobytes())
+        table.amount = array('d', gen.choice(FEES, n).tobytes())
+    else:
+        pick = lambda k, typecode: array(typecode, (rnd.randrange(k) for _ in range(n)))
+        table.amount = array('d', (rnd.choice(FEES) for _ in range(n)))
+    table.doctor.codes = pick(len(DOCTORS), 'H')
+    table.status.codes = pick(len(STATUSES), 'B')
+    table.date.codes = pick(len(days), 'H')
+    table.ids = array('I', range(1, n + 1))
+
+
+def run(engine, label):
+    print(label)
+    for by, date_from, date_to, status in REPORTS:
+        t = time.perf_counter()
+        rows = engine.report(by, date_from, date_to, status)
+        first = time.perf_counter() - t
+        t = time.perf_counter()
+        engine.report(by, date_from, date_to, status)
+        cached = time.perf_counter() - t
+        where = ' '.join(f'{k}={v}' for k, v in (('from', date_from), ('to', date_to),
+                                                 ('status', status)) if v)
+        print(f'  by {"+".join(by):<20} {where:<34} {len(rows):6,} groups  '
+              f'{first * 1000:8.1f} ms   cached {cached * 1e6:6.1f} µs')
+
+
+def main(n=10_000_000):
+    records = ClinicRecords()
+    t = time.perf_counter()
+    fill(records, n)
+    print(f'{n:,} appointments over {YEARS} years, {len(DOCTORS)} doctors '
+          f'(filled in {time.perf_counter() - t:.1f} s)')
+    if reporting.np is not None:
+        run(reporting.ReportEngine(records), 'numpy')
+    if n > FALLBACK_ROWS:
+        records = ClinicRecords()
+        fill(records, FALLBACK_ROWS)
+    np, reporting.np = reporting.np, None
+    run(reporting.ReportEngine(records), f'plain Python (no numpy), {min(n, FALLBACK_ROWS):,} rows')
+    reporting.np = np
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,80 @@
+# ============================================================
+#  Benchmark — trend queries: rollup cube vs GROUP BY scans
+#  Smart Clinic Management System
+#  Loads synthetic appointments into a ClinicStore, rebuilds
+#  rollup.RollupCube from one iter_appointments() pass, then
+#  times the dashboard's trend queries (30 days, 26 weeks,
+#  12 months, per status) against the same counts done with
+#  SQL GROUP BY over the appointments table, and one save.
+#  Run:  python benchmarks/bench_rollup.py [appointments]
+# ============================================================
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clinic_store import ClinicStore  # noqa: E402
+from dashboard import TREND_SPANS, trend_range  # noqa: E402
+from rollup import RollupCube, bucket  # noqa: E402
+from run import batches, synthetic_appointments  # noqa: E402
+from validation import STATUSES  # noqa: E402
+
+TODAY = date(2025, 12, 31)     # inside synthetic_appointments' two years
+
+
+def timed(label, fn, repeat=20):
+    t = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    print(f'  {label:<34} {(time.perf_counter() - t) / repeat * 1000:9.3f} ms')
+    return result
+
+
+def cube_trend(cube, level):
+    first, last = trend_range(level, TODAY)
+    return {s: cube.series(level, first, last, status=s) for s in STATUSES}
+
+
+def sql_trend(store, level):
+    # What the chart would run without the cube: group the range's rows by date
+    first, last = trend_range(level, TODAY)
+    with store._lock:
+        rows = store._conn.execute(
+            'SELECT date, status, COUNT(*) FROM appointments WHERE date BETWEEN ? AND ? '
+            'GROUP BY date, status', (first, last)).fetchall()
+    counts = Counter()
+    for day, status, n in rows:
+        counts[bucket(level, day), status] += n
+    return counts
+
+
+def main(n=1_000_000):
+    tmp = tempfile.mkdtemp()
+    store = ClinicStore(os.path.join(tmp, 'bench.db'))
+    for batch in batches(synthetic_appointments(n, n)):
+        store.add_appointments(batch)
+    store.flush()
+    print(f'{n:,} appointments')
+
+    cube = timed('rebuild (one streaming pass)',
+                 lambda: RollupCube().rebuild(store.iter_appointments()), repeat=1)
+    for level in TREND_SPANS:
+        mine = timed(f'{level}: cube, {TREND_SPANS[level]} buckets × status',
+                     lambda: cube_trend(cube, level), repeat=200)
+        theirs = timed(f'{level}: SQL GROUP BY', lambda: sql_trend(store, level), repeat=5)
+        assert all(theirs[b, s] == k for s, series in mine.items() for b, k in series)
+
+    appointment = {'date': TODAY.isoformat(), 'doctor': 'Dr Walk In', 'status': 'Scheduled'}
+    timed('save: add one appointment', lambda: cube.add(appointment), repeat=10000)
+    store.close()
+    shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
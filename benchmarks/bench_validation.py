@@ -0,0 +1,55 @@
+# ============================================================
+#  Benchmark — fixed-format date/time parser vs strptime
+#  Smart Clinic Management System
+#  Run:  python benchmarks/bench_validation.py [rows]
+# ============================================================
+
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validation import parse_date, parse_time  # noqa: E402
+
+
+def make_rows(n, seed=7):
+    """Appointment-like dates/times: a few years of days, 30-minute slots."""
+    rnd = random.Random(seed)
+    start = date(2022, 1, 1)
+    dates = [(start + timedelta(days=rnd.randrange(1460))).isoformat() for _ in range(n)]
+    times = [f'{rnd.randrange(8, 18):02d}:{rnd.choice((0, 30)):02d}' for _ in range(n)]
+    return dates, times
+
+
+def per_row(label, fn, rows):
+    t = time.perf_counter()
+    for v in rows:
+        fn(v)
+    elapsed = time.perf_counter() - t
+    print(f'  {label:<34} {elapsed * 1e9 / len(rows):8.0f} ns/row')
+    return elapsed
+
+
+def main(n=200_000):
+    dates, times = make_rows(n)
+    print(f'{n:,} rows')
+
+    print('date (YYYY-MM-DD)')
+    slow = per_row('datetime.strptime', lambda v: datetime.strptime(v, '%Y-%m-%d'), dates)
+    parse_date.cache_clear()
+    cold = per_row('parse_date (first pass)', parse_date, dates)
+    warm = per_row('parse_date (second pass)', parse_date, dates)
+    print(f'  speed-up: {slow / cold:.1f}x first pass, {slow / warm:.1f}x second')
+
+    print('time (HH:MM)')
+    slow = per_row('datetime.strptime', lambda v: datetime.strptime(v, '%H:%M'), times)
+    parse_time.cache_clear()
+    fast = per_row('parse_time', parse_time, times)
+    print(f'  speed-up: {slow / fast:.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,359 @@
+# ============================================================
+#  Benchmark suite — startup, navigation, search, dialogs, storage
+#  Smart Clinic Management System
+#
+#  Run headless on Linux with a virtual X display:
+#      xvfb-run -a python benchmarks/run.py --out results.json
+#  (or pass --xvfb to start Xvfb ourselves).  Compare with an
+#  earlier run and fail on slow-downs above 20%:
+#      python benchmarks/run.py --baseline old.json --threshold 0.2
+# ============================================================
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_store import ClinicStore  # noqa: E402
+from dashboard import DashboardStats  # noqa: E402
+from queries import APPOINTMENTS_BY_DATE, PATIENTS_BY_NAME  # noqa: E402
+from records import ClinicRecords  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+SIZES = (10_000, 100_000, 1_000_000)
+GUI_SIZES = (10_000, 100_000)
+QUERIES = ('aung', 'thandar k', '0912', 'gmail', 'dr kyaw')
+COLD_QUERIES = QUERIES + ('zin tun mya', 'k s')     # ... plus rare combinations of common words
+NAV_KEYS = ('patients', 'appointments', 'dashboard', 'settings')
+
+FIRST = ('Aung', 'Thandar', 'Kyaw', 'Su', 'Mya', 'Zaw', 'Hnin', 'Min', 'Nay', 'Phyo',
+         'Ei', 'Htet', 'Khin', 'Moe', 'Soe', 'Thiri', 'Wai', 'Yamin', 'Zin', 'Tun')
+DOCTORS = tuple(f'Dr {a} {b}' for a in FIRST[:6] for b in FIRST[6:10])
+DOMAINS = ('gmail.com', 'yahoo.com', 'clinic.org', 'mail.mm')
+
+
+# ── Synthetic data ───────────────────────────────────────────
+def synthetic_patients(n, seed=11):
+    rnd = random.Random(seed)
+    for i in range(n):
+        a, b = rnd.choice(FIRST), rnd.choice(FIRST)
+        yield {'name': f'{a} {b} {rnd.choice(FIRST)}', 'age': rnd.randrange(1, 95),
+               'phone': f'09{rnd.randrange(10**9):09d}',
+               'email': f'{a.lower()}.{b.lower()}{i}@{rnd.choice(DOMAINS)}',
+               'gender': rnd.choice(('Male', 'Female'))}
+
+
+def synthetic_appointments(n, patients, seed=12):
+    rnd = random.Random(seed)
+    start = date(2024, 1, 1)
+    for _ in range(n):
+        pid = rnd.randrange(1, patients + 1)
+        yield {'patient_id': pid, 'patient': f'Patient {pid}',
+               'doctor': rnd.choice(DOCTORS),
+               'date': (start + timedelta(days=rnd.randrange(730))).isoformat(),
+               'time': f'{rnd.randrange(9, 17):02d}:{rnd.choice((0, 30)):02d}',
+               'status': rnd.choice(('Scheduled', 'Completed', 'Cancelled'))}
+
+
+def batches(rows, size=20000):
+    batch = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ── Timing ───────────────────────────────────────────────────
+class Results:
+    def __init__(self):
+        self.timings = {}
+
+    def record(self, name, seconds):
+        self.timings.setdefault(name, []).append(seconds)
+
+    def time(self, name, fn, repeat=1):
+        """Run fn() `repeat` times, recording each run; returns the last result."""
+        result = None
+        for _ in range(repeat):
+            t = time.perf_counter()
+            result = fn()
+            self.record(name, time.perf_counter() - t)
+        return result
+
+    def summary(self):
+        return {name: {'median': statistics.median(runs), 'min': min(runs),
+                       'max': max(runs), 'runs': len(runs)}
+                for name, runs in sorted(self.timings.items())}
+
+
+# ── Storage ──────────────────────────────────────────────────
+def build_store(path, n, results):
+    """Fill a fresh database with n patients and n appointments."""
+    store = ClinicStore(path)
+    results.time(f'storage.bulk_insert_patients[{n}]', lambda: [
+        store.add_patients(b) for b in batches(synthetic_patients(n))])
+    results.time(f'storage.bulk_insert_appointments[{n}]', lambda: [
+        store.add_appointments(b) for b in batches(synthetic_appointments(n, n))])
+    store.flush()
+    return store
+
+
+def bench_storage(store, n, results, repeat):
+    rnd = random.Random(5)
+    tag = f'[{n}]'
+    one = next(synthetic_patients(1, seed=99))
+    results.time('storage.add_patient' + tag, lambda: store.add_patient(dict(one)), 200)
+    results.time('storage.flush' + tag, store.flush, 1)
+    results.time('storage.get_patient' + tag,
+                 lambda: store.get_patient(rnd.randrange(1, n + 1)), 200)
+    results.time('storage.find_patients_by_name' + tag,
+                 lambda: store.find_patients(name='Thandar'), repeat)
+    # A keyset page 90% of the way down costs what the first one does;
+    # OFFSET steps over every row before it
+    query = store._query
+    for name, keyset in (('patients_by_name', PATIENTS_BY_NAME),
+                         ('appointments_by_date', APPOINTMENTS_BY_DATE)):
+        order = ', '.join(keyset.key)
+        deep = tuple(query(f'SELECT {order} FROM {keyset.table} ORDER BY {order} '
+                           f'LIMIT 1 OFFSET ?', (n * 9 // 10,))[0])
+        results.time(f'storage.{name}_first_page' + tag,
+                     lambda: keyset.after(query, None, 100), repeat)
+        results.time(f'storage.{name}_deep_page' + tag,
+                     lambda: keyset.after(query, deep, 100), repeat)
+        results.time(f'storage.{name}_deep_offset' + tag,
+                     lambda: query(keyset.sql_first.replace('LIMIT ?', 'LIMIT 100 OFFSET ?'),
+                                   (n * 9 // 10,)), repeat)
+    results.time('storage.find_appointments_by_doctor' + tag,
+                 lambda: store.find_appointments(doctor=DOCTORS[0], date='2024-06-03'), repeat)
+    results.time('storage.group_count_status' + tag,
+                 lambda: store.group_count('appointments', 'status'), repeat)
+    results.time('storage.scan_patients' + tag,
+                 lambda: sum(len(c) for c in store.patient_rows(10000)), 1)
+
+    index = SearchIndex(ClinicRecords())
+    results.time('memory.search_index_load' + tag, lambda: index.load(store), 1)
+    for q in QUERIES:
+        results.time(f'memory.search[{q}]{tag}', lambda: index.search(q), repeat)
+    # Repeating one query only filters the last result after the first run;
+    # dropping it first times the lookup a fresh query pays
+    for q in COLD_QUERIES:
+        results.time(f'memory.search_cold[{q}]{tag}',
+                     lambda: (setattr(index, '_last', None), index.search(q)), repeat)
+    records = index.records
+    results.time('memory.list_page_deep' + tag,
+                 lambda: records.patient_page(len(records.patients) * 9 // 10, 100), repeat)
+    results.time('memory.dashboard_from_records' + tag,
+                 lambda: DashboardStats.from_records(records), repeat)
+
+
+# ── GUI (needs a display) ────────────────────────────────────
+def pump_until(app, done, timeout=60.0):
+    """Run the Tk event loop until done() is true."""
+    end = time.perf_counter() + timeout
+    while not done():
+        app.update()
+        if time.perf_counter() > end:
+            raise TimeoutError('benchmark step did not finish')
+        time.sleep(0.0005)
+
+
+def bench_gui(db_path, n, results, repeat):
+    import smartclinic
+    from day3_dialogs import messagebox
+    messagebox.showinfo = lambda *args, **kwargs: 'ok'     # no modal popups
+    tag = f'[{n}]'
+
+    class TimedApp(smartclinic.App):
+        def _build(self):
+            t = time.perf_counter()
+            super()._build()
+            results.record('gui.app_build' + tag, time.perf_counter() - t)
+
+    def start():
+        t = time.perf_counter()
+        app = TimedApp(db_path, profiler=smartclinic.StartupProfiler(start=t))
+        pump_until(app, lambda: 'first frame' in app.profiler.marks)
+        pump_until(app, lambda: app.ready, timeout=600)
+        marks = app.profiler.marks
+        results.record('gui.first_frame' + tag, marks['first frame'] / 1000)
+        results.record('gui.ready' + tag, marks['ready'] / 1000)
+        return app
+
+    for _ in range(repeat):
+        start().on_close()
+
+    app = start()
+    try:
+        for first in (True, False):
+            for key in NAV_KEYS:
+                label = 'first' if first else 'again'
+                results.time(f'gui.nav_{label}[{key}]{tag}',
+                             lambda: (app.on_nav(key), app.update_idletasks()))
+
+        shown = []
+        show = app._show_results
+        app._show_results = lambda q, r: (shown.append(q), show(q, r))
+        entry = app.topbar.search_entry
+        for q in QUERIES:
+            def round_trip():
+                del shown[:]
+                entry.delete(0, 'end')
+                entry.insert(0, q)
+                app.on_search()
+                pump_until(app, lambda: shown)
+                app.update_idletasks()
+            results.time(f'gui.search_round_trip[{q}]{tag}', round_trip, repeat)
+
+        # Open latency alone: the dialogs are built once and shown again
+        for key, open_dialog in (('patient', app.on_add_patient),
+                                 ('appointment', app.on_add_appointment)):
+            for _ in range(repeat * 5):
+                t = time.perf_counter()
+                dialog = open_dialog()
+                app.update_idletasks()
+                results.record(f'gui.{key}_dialog_open{tag}', time.perf_counter() - t)
+                dialog.close()
+                app.update_idletasks()
+
+        def patient_dialog():
+            dialog = app.on_add_patient()
+            app.update_idletasks()
+            dialog.fields['name'].insert(0, 'Bench Patient')
+            dialog.fields['age'].insert(0, '42')
+            dialog.variables['gender'].set('Female')
+            dialog.save()
+            app.update_idletasks()
+        results.time('gui.patient_dialog_open_save' + tag, patient_dialog, repeat)
+
+        slot = iter(range(10**6))
+
+        def appointment_dialog():
+            dialog = app.on_add_appointment()
+            app.update_idletasks()
+            dialog.fields['patient'].insert(0, 'Bench Patient')
+            dialog.fields['doctor'].insert(0, 'Dr Bench')
+            dialog.fields['date'].delete(0, 'end')
+            dialog.fields['date'].insert(0, (date(2030, 1, 1) + timedelta(days=next(slot))).isoformat())
+            dialog.save()
+            app.update_idletasks()
+        results.time('gui.appointment_dialog_open_save' + tag, appointment_dialog, repeat)
+    finally:
+        app.on_close()
+
+
+def start_xvfb():
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+    display = ':97'
+    proc = subprocess.Popen(['Xvfb', display, '-screen', '0', '1280x800x24', '-nolisten', 'tcp'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    time.sleep(1.0)
+    return proc
+
+
+# ── Comparison ───────────────────────────────────────────────
+def compare(current, baseline, threshold, floor):
+    """
+    List (name, old, new, ratio) for every benchmark that got slower by
+    more than `threshold` (0.2 = 20%) and by at least `floor` seconds.
+    """
+    slower = []
+    for name, now in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        a, b = old['median'], now['median']
+        if b > a * (1 + threshold) and b - a >= floor:
+            slower.append((name, a, b, b / a if a else float('inf')))
+    return slower
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version, 'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Smart Clinic benchmark suite')
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help='dataset sizes for the storage benchmarks')
+    parser.add_argument('--gui-sizes', default=','.join(map(str, GUI_SIZES)),
+                        help='dataset sizes for the GUI benchmarks ("" to skip)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='earlier results JSON to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slow-down, as a fraction (default 0.2)')
+    parser.add_argument('--floor', type=float, default=0.0005,
+                        help='ignore slow-downs smaller than this many seconds')
+    parser.add_argument('--xvfb', action='store_true', help='start Xvfb if there is no DISPLAY')
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(s) for s in args.sizes.split(',') if s)
+    gui_sizes = {int(s) for s in args.gui_sizes.split(',') if s}
+    xvfb = start_xvfb() if args.xvfb else None
+    results = Results()
+    skipped = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='clinic-bench-') as tmp:
+            for n in sorted(set(sizes) | gui_sizes):
+                path = os.path.join(tmp, f'clinic_{n}.db')
+                print(f'dataset {n:,} …', flush=True)
+                store = build_store(path, n, results)
+                if n in sizes:
+                    bench_storage(store, n, results, args.repeat)
+                store.close()
+                if n in gui_sizes:
+                    if not os.environ.get('DISPLAY'):
+                        skipped.append(f'gui[{n}]: no DISPLAY (use xvfb-run or --xvfb)')
+                        continue
+                    bench_gui(path, n, results, args.repeat)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    summary = results.summary()
+    with open(args.out, 'w') as f:
+        json.dump({'meta': metadata(), 'skipped': skipped, 'results': summary}, f, indent=2)
+    for name, r in summary.items():
+        print(f'  {name:<52} {r["median"] * 1000:10.3f} ms')
+    for note in skipped:
+        print('  skipped', note)
+    print(f'wrote {args.out}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        slower = compare(summary, baseline, args.threshold, args.floor)
+        for name, a, b, ratio in slower:
+            print(f'  REGRESSION {name}: {a * 1000:.3f} ms -> {b * 1000:.3f} ms ({ratio:.2f}x)')
+        if slower:
+            return 1
+        print(f'no regressions above {args.threshold:.0%} against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
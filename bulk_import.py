@@ -0,0 +1,141 @@
+# ============================================================
+#  Bulk Import — stream patients from CSV / JSON into the store
+#  Smart Clinic Management System
+#  Rows are read and checked (validation.validate_many, with
+#  the Add Patient dialog's rules) a batch at a time and the
+#  good ones inserted together, so memory stays bounded
+#  whatever the file size.
+# ============================================================
+
+import csv
+import json
+import os
+
+from validation import validate_many, validate_patient
+
+BATCH_SIZE = 20000
+REJECT_FIELDS = ('row', 'error', 'name', 'age', 'phone', 'email', 'gender')
+
+# Column names we accept besides the dialog's own keys
+ALIASES = {
+    'full name': 'name', 'full_name': 'name', 'patient': 'name',
+    'sex': 'gender', 'mobile': 'phone', 'phone number': 'phone',
+    'e-mail': 'email', 'mail': 'email',
+}
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.rejects_path = None
+
+    def __repr__(self):
+        return f'ImportResult(imported={self.imported}, rejected={self.rejected})'
+
+
+# ── Readers (generators, one row dict at a time) ─────────────
+def _normalize(row):
+    out = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        k = key.strip().lower()
+        out[ALIASES.get(k, k)] = value
+    return out
+
+
+def read_csv(f):
+    for row in csv.DictReader(f):
+        yield _normalize(row)
+
+
+def read_json(f, chunk_size=1 << 16):
+    """
+    JSON Lines (one object per line) or a top-level JSON array.
+    The array is decoded object by object from a sliding buffer, so it
+    is never loaded whole.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    while True:
+        # skip whitespace, the opening bracket and separators
+        while pos < len(buf) and buf[pos] in ' \t\r\n,[':
+            pos += 1
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                if buf[pos:].strip():
+                    raise
+                return
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        pos = end
+        if isinstance(obj, dict):
+            yield _normalize(obj)
+
+
+def read_rows(path, f):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.json', '.jsonl', '.ndjson'):
+        return read_json(f)
+    return read_csv(f)
+
+
+# ── Import ───────────────────────────────────────────────────
+def import_patients(store, path, rejects_path=None, batch_size=BATCH_SIZE,
+                    on_batch=None, progress=None, should_stop=None):
+    """
+    Validate and insert every patient in `path`.
+
+    on_batch(patients)          called after each batch is stored (ids set)
+    progress(done, total)       bytes read so far / file size
+    should_stop()               return True to stop early (cancel)
+    Rejected rows go to `rejects_path` (default: <file>.rejects.csv).
+    """
+    result = ImportResult()
+    total = os.path.getsize(path)
+    rejects_path = rejects_path or os.path.splitext(path)[0] + '.rejects.csv'
+    rejects_file = rejects = None
+
+    def flush(rows, first):
+        # `first` is the file row number of rows[0]
+        nonlocal rejects_file, rejects
+        patients, errors = validate_many(rows, validate_patient)
+        if errors and rejects is None:
+            rejects_file = open(rejects_path, 'w', encoding='utf-8', newline='')
+            rejects = csv.DictWriter(rejects_file, REJECT_FIELDS, extrasaction='ignore')
+            rejects.writeheader()
+        for i, _, message in errors:
+            rejects.writerow(dict(rows[i], row=first + i, error=message))
+        result.rejected += len(errors)
+        if patients:
+            store.add_patients(patients)
+            result.imported += len(patients)
+            if on_batch:
+                on_batch(patients)
+        if progress:
+            progress(f.buffer.tell(), total)
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows, first = [], 1
+        for number, row in enumerate(read_rows(path, f), 1):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                flush(rows, first)
+                rows, first = [], number + 1
+                if should_stop and should_stop():
+                    break
+        if rows:
+            flush(rows, first)
+
+    store.flush()
+    if rejects_file:
+        rejects_file.close()
+        result.rejects_path = rejects_path
+    return result
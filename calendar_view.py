@@ -0,0 +1,369 @@
+# ============================================================
+#  Calendar View — week & month views of the appointments
+#  Smart Clinic Management System
+#  Everything is drawn on one Canvas.  A cell (a day in the
+#  month view, a day × time slot in the week view) owns the
+#  items tagged with its name; when appointments change, only
+#  the cells whose contents differ are deleted and drawn again.
+# ============================================================
+
+import tkinter as tk
+from datetime import date as Date, timedelta
+from zlib import crc32
+
+from rounded_button import RoundedButton
+from scheduling import DAY_END, DAY_START, FREE_STATUSES, SLOT_MINUTES, from_minutes, to_minutes
+from validation import parse_time
+
+COLORS = {
+    'bg':        '#f0f4f8',
+    'card':      '#ffffff',
+    'other':     '#f7f9fc',      # days outside the shown month
+    'text':      '#1e2d40',
+    'muted':     '#8a99b0',
+    'border':    '#dde3ef',
+    'accent':    '#4f7ef8',
+    'off':       '#b8c4d6',      # mode button not selected
+    'cancelled': '#c5cedb',
+}
+
+# One color per doctor, picked by a hash of the name
+DOCTOR_COLORS = ('#4f7ef8', '#2ec87a', '#f5a623', '#9b59b6',
+                 '#e05c7a', '#17a2b8', '#6c7a89', '#d35400')
+
+FONTS = {
+    'title': ('Segoe UI', 13, 'bold'),
+    'head':  ('Segoe UI', 9, 'bold'),
+    'time':  ('Segoe UI', 8),
+    'chip':  ('Segoe UI', 8),
+    'more':  ('Segoe UI', 8, 'bold'),
+}
+
+GUTTER = 56            # time labels left of the week view
+HEADER = 30            # weekday names
+SLOT_HEIGHT = 60       # one week-view row
+MIN_DAY_HEIGHT = 96    # one month-view cell
+DAY_LABEL = 20         # day number at the top of a month cell
+CHIP_HEIGHT = 16
+CHIP_GAP = 2
+CHAR_WIDTH = 6         # rough width of one FONTS['chip'] character
+RESIZE_DELAY = 60      # ms; a drag-resize redraws once it settles
+
+_FIRST_SLOT = to_minutes(DAY_START)
+_SLOTS = (to_minutes(DAY_END) - _FIRST_SLOT) // SLOT_MINUTES
+_FIELDS = ('date', 'time', 'doctor', 'patient', 'status', 'id')
+
+
+def slot_row(hhmm):
+    """Week-view row of a time: 1.. for clinic hours, 0 for untimed/out of hours."""
+    minutes = parse_time(hhmm) if hhmm else None
+    if minutes is None:
+        return 0
+    slot = (minutes - _FIRST_SLOT) // SLOT_MINUTES
+    return slot + 1 if 0 <= slot < _SLOTS else 0
+
+
+def doctor_color(name):
+    return DOCTOR_COLORS[crc32((name or '').encode()) % len(DOCTOR_COLORS)]
+
+
+def month_start(day, months=0):
+    """First day of the month `months` after the one holding `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return Date(index // 12, index % 12 + 1, 1)
+
+
+# ── What goes where (no Tk, so it can be timed headless) ─────
+class CalendarCells:
+    """
+    Appointments of the shown range grouped by cell.
+
+    A cell key is (ISO date, row): row is slot_row() in the week
+    view and always 0 in the month view.  load() re-reads the range
+    from ClinicRecords and returns just the keys whose contents
+    changed — an add marks one cell, a move or cancel at most two.
+    """
+
+    def __init__(self, records, mode='week', anchor=None):
+        self.records = records
+        self.cells = {}            # key -> tuple of (time, doctor, patient, status, id)
+        self.show(mode, anchor or Date.today())
+
+    def show(self, mode, anchor):
+        """Switch range; the caller redraws everything."""
+        self.mode, self.anchor = mode, anchor
+        if mode == 'week':
+            start = anchor - timedelta(days=anchor.weekday())
+            count = 7
+        else:
+            first = month_start(anchor)
+            start = first - timedelta(days=first.weekday())
+            count = 42                 # six weeks cover any month
+        self.days = [start + timedelta(days=i) for i in range(count)]
+        self.rows = _SLOTS + 1 if mode == 'week' else 1
+        self.cells = {}
+
+    def load(self):
+        """Re-read the shown range; returns the keys of the changed cells."""
+        week = self.mode == 'week'
+        cells = {}
+        appointments = self.records.appointments_between(
+            self.days[0].isoformat(), self.days[-1].isoformat(), _FIELDS)
+        for day, time, doctor, patient, status, row_id in appointments:   # by date, time, id
+            key = (day, slot_row(time) if week else 0)
+            entry = (time or '', doctor or '', patient or '', status or '', row_id)
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [entry]
+            else:
+                cell.append(entry)
+        cells = {key: tuple(entries) for key, entries in cells.items()}
+        old, self.cells = self.cells, cells
+        return {key for key in old.keys() | cells.keys() if old.get(key) != cells.get(key)}
+
+    def title(self):
+        if self.mode == 'month':
+            return month_start(self.anchor).strftime('%B %Y')
+        first, last = self.days[0], self.days[-1]
+        if first.month == last.month:
+            return f'{first.day} – {last.day} {last:%b %Y}'
+        return f'{first.day} {first:%b} – {last.day} {last:%b %Y}'
+
+
+# ── The view ─────────────────────────────────────────────────
+class CalendarView(tk.Frame):
+    """
+    The Appointments page: Week and Month calendars on a Canvas, and
+    the plain list (built by `make_list(parent)`) one click away.
+
+    refresh() redraws only the changed cells; switching range or
+    resizing redraws the whole canvas once.
+    """
+
+    def __init__(self, parent, records, make_list=None, mode='week'):
+        super().__init__(parent, bg=COLORS['card'])
+        self.cells = CalendarCells(records, 'week' if mode == 'list' else mode)
+        self.make_list = make_list
+        self.list = None               # built on first use
+        self.mode = mode
+        self._boxes = {}               # cell key -> (x0, y0, x1, y1)
+        self._tags = {}                # cell key -> canvas tag
+        self._dirty = set()
+        self._flush_job = None
+        self._resize_job = None
+        self._build()
+        self._select(mode)
+
+    def _build(self):
+        bar = tk.Frame(self, bg=COLORS['card'])
+        bar.pack(fill=tk.X, padx=16, pady=(12, 8))
+        self.nav = tk.Frame(bar, bg=COLORS['card'])
+        self.nav.pack(side=tk.LEFT)
+        for text, command, width in (('◀', lambda: self._step(-1), 36),
+                                     ('Today', self._today, 70),
+                                     ('▶', lambda: self._step(1), 36)):
+            RoundedButton(self.nav, text, COLORS['accent'], command, width=width,
+                          height=30, bg=COLORS['card']).pack(side=tk.LEFT, padx=(0, 6))
+        self.title = tk.Label(self.nav, font=FONTS['title'], fg=COLORS['text'],
+                              bg=COLORS['card'])
+        self.title.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.mode_buttons = {}
+        for mode in ('list', 'month', 'week'):
+            button = RoundedButton(bar, mode.title(), COLORS['off'],
+                                   lambda m=mode: self._select(m), width=70,
+                                   height=30, bg=COLORS['card'])
+            button.pack(side=tk.RIGHT, padx=(6, 0))
+            self.mode_buttons[mode] = button
+
+        self.body = tk.Frame(self, bg=COLORS['card'])
+        self.body.pack(fill=tk.BOTH, expand=True)
+        self.calendar = tk.Frame(self.body, bg=COLORS['card'])
+        self.scrollbar = tk.Scrollbar(self.calendar, orient=tk.VERTICAL)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self.calendar, bg=COLORS['card'], highlightthickness=0,
+                                yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        self.canvas.bind('<Configure>', self._on_resize)
+        self.canvas.bind('<Double-Button-1>', self._on_double_click)
+        self.canvas.bind('<MouseWheel>',
+                         lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+
+    # ── Modes & navigation ───────────────────────────────────
+    def _select(self, mode):
+        if mode == 'list' and self.make_list is None:
+            mode = 'week'
+        for key, button in self.mode_buttons.items():
+            button.set_color(COLORS['accent'] if key == mode else COLORS['off'])
+        self.mode = mode
+        if mode == 'list':
+            self.calendar.pack_forget()
+            self.nav.pack_forget()
+            if self.list is None:
+                self.list = self.make_list(self.body)
+            else:
+                self.list.refresh()
+            self.list.pack(fill=tk.BOTH, expand=True)
+            return
+        if self.list is not None:
+            self.list.pack_forget()
+        self.nav.pack(side=tk.LEFT)
+        self.calendar.pack(fill=tk.BOTH, expand=True)
+        self._show(mode, self.cells.anchor)
+
+    def _step(self, direction):
+        anchor = self.cells.anchor
+        if self.mode == 'week':
+            anchor += timedelta(days=7 * direction)
+        else:
+            anchor = month_start(anchor, direction)
+        self._show(self.mode, anchor)
+
+    def _today(self):
+        self._show(self.mode, Date.today())
+
+    def _show(self, mode, anchor):
+        self.cells.show(mode, anchor)
+        self.cells.load()
+        self.title.config(text=self.cells.title())
+        self._layout()
+        self.canvas.yview_moveto(0)
+
+    def refresh(self):
+        """Pick up saved changes; only cells whose contents differ are redrawn."""
+        if self.mode == 'list':
+            self.list.refresh()
+            return
+        self._mark(self.cells.load())
+
+    def destroy(self):
+        for job in (self._flush_job, self._resize_job):
+            if job is not None:
+                self.after_cancel(job)
+        super().destroy()
+
+    def _on_double_click(self, e):
+        # A day in the month view opens its week
+        if self.mode != 'month':
+            return
+        x, y = self.canvas.canvasx(e.x), self.canvas.canvasy(e.y)
+        for (day, _), (x0, y0, x1, y1) in self._boxes.items():
+            if x0 <= x < x1 and y0 <= y < y1:
+                self.cells.anchor = Date.fromisoformat(day)
+                self._select('week')
+                return
+
+    # ── Drawing ──────────────────────────────────────────────
+    def _on_resize(self, e):
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DELAY, self._resized)
+
+    def _resized(self):
+        self._resize_job = None
+        self._layout()
+
+    def _layout(self):
+        """Grid, headings and every cell, from scratch."""
+        c = self.canvas
+        c.delete('all')
+        self._boxes.clear()
+        self._tags.clear()
+        self._dirty.clear()
+        width = max(c.winfo_width(), 7 * 40)
+        week = self.cells.mode == 'week'
+        left = GUTTER if week else 0
+        col_w = (width - left) / 7
+        if week:
+            row_h = SLOT_HEIGHT
+        else:
+            row_h = max(MIN_DAY_HEIGHT, (c.winfo_height() - HEADER) / 6)
+        rows = len(self.cells.days) // 7 * self.cells.rows
+        height = HEADER + rows * row_h
+        month = month_start(self.cells.anchor).month
+        today = Date.today()
+
+        for i, day in enumerate(self.cells.days[:7]):
+            text = f'{day:%a} {day.day}' if week else f'{day:%a}'
+            color = COLORS['accent'] if week and day == today else COLORS['muted']
+            c.create_text(left + (i + 0.5) * col_w, HEADER / 2, text=text.upper(),
+                          font=FONTS['head'], fill=color)
+        if week:
+            for row in range(self.cells.rows):
+                label = from_minutes(_FIRST_SLOT + (row - 1) * SLOT_MINUTES) if row else 'Other'
+                c.create_text(GUTTER - 8, HEADER + row * row_h + 4, text=label,
+                              anchor='ne', font=FONTS['time'], fill=COLORS['muted'])
+
+        n = 0
+        for i, day in enumerate(self.cells.days):
+            col = i % 7
+            x0, x1 = left + col * col_w, left + (col + 1) * col_w
+            for row in range(self.cells.rows):
+                line = i // 7 * self.cells.rows + row
+                y0 = HEADER + line * row_h
+                key = (day.isoformat(), row)
+                self._boxes[key] = (x0, y0, x1, y0 + row_h)
+                self._tags[key] = f'cell{n}'
+                n += 1
+                if not week and day.month != month:
+                    c.create_rectangle(x0, y0, x1, y0 + row_h, fill=COLORS['other'], outline='')
+            if not week:
+                color = COLORS['accent'] if day == today else (
+                    COLORS['text'] if day.month == month else COLORS['muted'])
+                c.create_text(x0 + 6, HEADER + i // 7 * row_h + 4, text=str(day.day),
+                              anchor='nw', font=FONTS['head'], fill=color)
+
+        for col in range(8):
+            x = left + col * col_w
+            c.create_line(x, HEADER, x, height, fill=COLORS['border'])
+        for line in range(rows + 1):
+            y = HEADER + line * row_h
+            c.create_line(0 if week else left, y, width, y, fill=COLORS['border'])
+        c.configure(scrollregion=(0, 0, width, height))
+
+        for key in self._boxes:
+            self._draw_cell(key)
+
+    def _mark(self, keys):
+        self._dirty.update(key for key in keys if key in self._boxes)
+        if self._dirty and self._flush_job is None:
+            self._flush_job = self.after_idle(self._flush)
+
+    def _flush(self):
+        self._flush_job = None
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            self._draw_cell(key)
+
+    def _draw_cell(self, key):
+        c = self.canvas
+        tag = self._tags[key]
+        c.delete(tag)
+        entries = self.cells.cells.get(key)
+        if not entries:
+            return
+        x0, y0, x1, y1 = self._boxes[key]
+        week = self.cells.mode == 'week'
+        y = y0 + (CHIP_GAP if week else DAY_LABEL)
+        fits = max(0, int((y1 - y) // (CHIP_HEIGHT + CHIP_GAP)))
+        shown = entries if len(entries) <= fits else entries[:max(0, fits - 1)]
+        chars = max(1, int((x1 - x0 - 12) // CHAR_WIDTH))
+        for time, doctor, patient, status, _ in shown:
+            cancelled = status in FREE_STATUSES
+            fill = COLORS['cancelled'] if cancelled else doctor_color(doctor)
+            label = f'{patient} · {doctor}' if week else f'{time} {patient}'
+            if len(label) > chars:
+                label = label[:chars - 1] + '…'
+            c.create_rectangle(x0 + 3, y, x1 - 3, y + CHIP_HEIGHT, fill=fill,
+                               outline='', tags=tag)
+            c.create_text(x0 + 7, y + CHIP_HEIGHT / 2, text=label, anchor='w',
+                          font=FONTS['chip'], tags=tag,
+                          fill=COLORS['text'] if cancelled else COLORS['card'])
+            y += CHIP_HEIGHT + CHIP_GAP
+        hidden = len(entries) - len(shown)
+        if hidden:
+            c.create_text(x0 + 7, y + CHIP_HEIGHT / 2, text=f'+{hidden} more', anchor='w',
+                          font=FONTS['more'], fill=COLORS['muted'], tags=tag)
@@ -0,0 +1,536 @@
+# ============================================================
+#  Clinic Store — SQLite storage for patients & appointments
+#  Smart Clinic Management System
+#  Tables follow the students_db lessons (id PRIMARY KEY + columns)
+# ============================================================
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from journal import BATCH, WINDOW, Journal
+from queries import (STATEMENT_CACHE, APPOINTMENTS_BY_DATE, APPOINTMENTS_BY_ID,
+                     PATIENTS_BY_ID, first_on)
+
+DB_PATH = 'smart_clinic.db'
+CHECKPOINT_INTERVAL = 30.0           # seconds between journal checkpoints
+CHECKPOINT_BYTES = 8 * 1024 * 1024   # ... or sooner once it is this big
+
+# ── Schema ───────────────────────────────────────────────────
+# Same shape as the students_db tables: an integer primary key
+# followed by plain columns.  Secondary indexes cover every column
+# the UI searches or sorts on.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    age        INTEGER,
+    phone      TEXT,
+    email      TEXT,
+    gender     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS appointments (
+    appointment_id INTEGER PRIMARY KEY,
+    patient_id     INTEGER REFERENCES patients(patient_id),
+    patient        TEXT NOT NULL,
+    doctor         TEXT NOT NULL,
+    date           TEXT NOT NULL,
+    time           TEXT,
+    status         TEXT,
+    amount         REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_patients_name  ON patients(name);
+CREATE INDEX IF NOT EXISTS idx_patients_phone ON patients(phone);
+CREATE INDEX IF NOT EXISTS idx_appointments_doctor
+    ON appointments(doctor, date, time);
+CREATE INDEX IF NOT EXISTS idx_appointments_date    ON appointments(date);
+CREATE INDEX IF NOT EXISTS idx_appointments_when
+    ON appointments(date, ifnull(time, ''));
+CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments(patient_id);
+'''
+
+PATIENT_FIELDS = ('name', 'age', 'phone', 'email', 'gender')
+APPOINTMENT_FIELDS = ('patient_id', 'patient', 'doctor', 'date', 'time', 'status', 'amount')
+# SELECT lists in the order _patient() / _appointment() read
+_COLUMNS = {
+    'patients': 'patient_id, name, age, phone, email, gender',
+    'appointments': 'appointment_id, patient_id, patient, doctor, date, time, status, amount',
+}
+_KEYS = {'patients': 'patient_id', 'appointments': 'appointment_id'}
+# Is the journaled row (id, fields…) the one stored under its id, as
+# later journaled writes may have left it?  A merge fills a patient's
+# empty fields and moves appointments to another patient.  SQLite does
+# the comparing so column affinity applies ('35' matches age 35).
+_SAME_ROW = {
+    'patients': 'SELECT 1 FROM patients WHERE patient_id = ? AND ' + ' AND '.join(
+        f"({f} IS ? OR ifnull(?, '') IN ('', 'Select'))" for f in PATIENT_FIELDS),
+    'appointments': 'SELECT 1 FROM appointments WHERE appointment_id = ? AND ' + ' AND '.join(
+        f'{f} IS ?' for f in APPOINTMENT_FIELDS[1:]),
+}
+
+
+# ── Store ────────────────────────────────────────────────────
+class ClinicStore:
+    """
+    Repository for patients and appointments.
+
+    Writes go into an open transaction and are committed in groups:
+    every `batch_size` writes, or `commit_interval` seconds after the
+    first uncommitted write, whichever comes first.  Saving one record
+    therefore costs a single B-tree insert, not a disk sync.
+
+    With journal=True every write is also logged to `path`.journal
+    (see journal.Journal, which groups the syncs of saves arriving
+    within `journal_window` seconds, up to `journal_batch` of them)
+    and the write methods return only once the log line is on disk,
+    so a save survives a crash or power cut even before SQLite has
+    synced it.  Opening the store replays the log; checkpoint() —
+    every CHECKPOINT_INTERVAL seconds, or once the log reaches
+    CHECKPOINT_BYTES — syncs SQLite and empties it.
+    """
+
+    def __init__(self, path=DB_PATH, batch_size=500, commit_interval=0.05,
+                 journal=False, journal_window=WINDOW, journal_batch=BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None,
+                                     cached_statements=STATEMENT_CACHE)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+        self._pending = 0
+        self._first_pending = 0.0
+        self._closed = False
+
+        # Bumped on every write so views and caches can tell what changed
+        self.versions = {'patients': 0, 'appointments': 0}
+        # [(first id, last id)] this store inserted, so rows_from_others()
+        # can tell them from rows other connections (the API server) add
+        self._own = {'patients': [], 'appointments': []}
+
+        # Background committer for the time-based half of group commit
+        # (and, with a journal, for checkpoints)
+        self._wake = threading.Event()
+        self._journal = (Journal(path + '.journal', journal_window, journal_batch)
+                         if journal else None)
+        self._checkpointed = time.monotonic()
+        self._committer = threading.Thread(target=self._commit_loop,
+                                           name='clinic-store-commit',
+                                           daemon=True)
+        self._committer.start()
+        if self._journal is not None:
+            self._replay(self._journal.records())
+
+    def _migrate(self):
+        # Databases made before fees were recorded lack appointments.amount
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(appointments)')}
+        if 'amount' not in columns:
+            self._conn.execute('ALTER TABLE appointments ADD COLUMN amount REAL')
+
+    # ── Writes ───────────────────────────────────────────────
+    def add_patient(self, patient):
+        """Insert a patient dict (as built by the dialog) and return its id."""
+        row = tuple(patient.get(f) for f in PATIENT_FIELDS)
+        with self._lock:
+            with self._atomic(savepoint=False):
+                cur = self._conn.execute(
+                    'INSERT INTO patients (name, age, phone, email, gender) '
+                    'VALUES (?, ?, ?, ?, ?)', row)
+            self._written(1)
+            self.versions['patients'] += 1
+            self._own['patients'].append((cur.lastrowid, cur.lastrowid))
+            seq = self._log('patients', [(cur.lastrowid,) + row])
+        self._durable(seq)
+        return cur.lastrowid
+
+    def add_appointment(self, appointment):
+        """Insert an appointment dict and return its id."""
+        row = tuple(appointment.get(f) for f in APPOINTMENT_FIELDS)
+        with self._lock:
+            with self._atomic(savepoint=False):
+                cur = self._conn.execute(
+                    'INSERT INTO appointments '
+                    '(patient_id, patient, doctor, date, time, status, amount) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', row)
+            self._written(1)
+            self.versions['appointments'] += 1
+            self._own['appointments'].append((cur.lastrowid, cur.lastrowid))
+            seq = self._log('appointments', [(cur.lastrowid,) + row])
+        self._durable(seq)
+        return cur.lastrowid
+
+    def add_patients(self, patients):
+        """Insert a list of patient dicts in one batch; sets each one's 'id'."""
+        with self._lock:
+            with self._atomic():
+                first = self._next_id('patients', 'patient_id')
+                rows = []
+                for pid, p in enumerate(patients, first):
+                    p['id'] = pid
+                    rows.append((pid,) + tuple(p.get(f) for f in PATIENT_FIELDS))
+                self._conn.executemany(
+                    'INSERT INTO patients (patient_id, name, age, phone, email, gender) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self._written(len(rows))
+            self.versions['patients'] += 1
+            if rows:
+                self._own['patients'].append((first, first + len(rows) - 1))
+            seq = self._log('patients', rows)
+        self._durable(seq)
+        return len(rows)
+
+    def add_appointments(self, appointments):
+        """Insert a list of appointment dicts in one batch; sets each 'id'."""
+        with self._lock:
+            with self._atomic():
+                first = self._next_id('appointments', 'appointment_id')
+                rows = []
+                for aid, a in enumerate(appointments, first):
+                    a['id'] = aid
+                    rows.append((aid,) + tuple(a.get(f) for f in APPOINTMENT_FIELDS))
+                self._conn.executemany(
+                    'INSERT INTO appointments '
+                    '(appointment_id, patient_id, patient, doctor, date, time, status, amount) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._written(len(rows))
+            self.versions['appointments'] += 1
+            if rows:
+                self._own['appointments'].append((first, first + len(rows) - 1))
+            seq = self._log('appointments', rows)
+        self._durable(seq)
+        return len(rows)
+
+    def merge_patients(self, pairs):
+        """
+        Fold each patient `drop_id` into `keep_id`, for (keep_id,
+        drop_id) in `pairs`: empty fields of the kept record are filled
+        from the dropped one, its appointments move over, and it is
+        deleted.  Returns [(kept before, kept after, dropped)] patient
+        dicts for the pairs merged; pairs with an id already gone are
+        skipped.  The journal is waited on once, for the last merge.
+        """
+        merged, seq = [], None
+        with self._lock:
+            for keep_id, drop_id in pairs:
+                done = self._merge(keep_id, drop_id)
+                if done is not None:
+                    merged.append(done)
+                    seq = self._log('merge', [keep_id, drop_id])
+        self._durable(seq)
+        return merged
+
+    def _merge(self, keep_id, drop_id):
+        keep, drop = self.get_patient(keep_id), self.get_patient(drop_id)
+        if keep is None or drop is None or keep_id == drop_id:
+            return None
+        filled = [keep[f] if keep[f] not in (None, '', 'Select') else drop[f]
+                  for f in PATIENT_FIELDS]
+        with self._atomic():
+            self._conn.execute(
+                'UPDATE patients SET name = ?, age = ?, phone = ?, email = ?, gender = ? '
+                'WHERE patient_id = ?', filled + [keep_id])
+            moved = self._conn.execute(
+                'UPDATE appointments SET patient_id = ? WHERE patient_id = ?',
+                (keep_id, drop_id)).rowcount
+            self._conn.execute('DELETE FROM patients WHERE patient_id = ?', (drop_id,))
+        self._written(2 + moved)
+        self.versions['patients'] += 1
+        if moved:
+            self.versions['appointments'] += 1
+        return keep, _patient([keep_id] + filled), drop
+
+    def _next_id(self, table, key):
+        # Runs inside _begin's BEGIN IMMEDIATE: no other connection can
+        # insert until this transaction commits, so the ids cannot collide
+        return self._conn.execute(
+            f'SELECT COALESCE(MAX({key}), 0) + 1 FROM {table}').fetchone()[0]
+
+    # ── Reads ────────────────────────────────────────────────
+    def get_patient(self, patient_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT patient_id, name, age, phone, email, gender '
+                'FROM patients WHERE patient_id = ?', (patient_id,)).fetchone()
+        return _patient(row) if row else None
+
+    def get_appointment(self, appointment_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT appointment_id, patient_id, patient, doctor, date, time, status, amount '
+                'FROM appointments WHERE appointment_id = ?',
+                (appointment_id,)).fetchone()
+        return _appointment(row) if row else None
+
+    def find_patients(self, name=None, phone=None, limit=50):
+        """Prefix match on name and/or exact phone, using the indexes."""
+        where, args = [], []
+        if name:
+            where.append('name >= ? AND name < ?')
+            args += [name, name + '\uffff']
+        if phone:
+            where.append('phone = ?')
+            args.append(phone)
+        sql = ('SELECT patient_id, name, age, phone, email, gender FROM patients'
+               + (' WHERE ' + ' AND '.join(where) if where else '')
+               + ' ORDER BY name LIMIT ?')
+        with self._lock:
+            rows = self._conn.execute(sql, args + [limit]).fetchall()
+        return [_patient(r) for r in rows]
+
+    def find_appointments(self, doctor=None, date=None, limit=50):
+        """Appointments for a doctor and/or a date, in time order."""
+        where, args = [], []
+        if doctor:
+            where.append('doctor = ?')
+            args.append(doctor)
+        if date:
+            where.append('date = ?')
+            args.append(date)
+        sql = ('SELECT appointment_id, patient_id, patient, doctor, date, time, status, amount '
+               'FROM appointments'
+               + (' WHERE ' + ' AND '.join(where) if where else '')
+               + ' ORDER BY date, time LIMIT ?')
+        with self._lock:
+            rows = self._conn.execute(sql, args + [limit]).fetchall()
+        return [_appointment(r) for r in rows]
+
+    def count_patients(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM patients').fetchone()[0]
+
+    def count_appointments(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM appointments').fetchone()[0]
+
+    def group_count(self, table, expr):
+        """{value: count} for SELECT expr, COUNT(*) ... GROUP BY expr.
+        `table` and `expr` are SQL written by the caller, never user input."""
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT {expr} AS k, COUNT(*) FROM {table} GROUP BY k').fetchall()
+        return dict(rows)
+
+    def patient_rows(self, chunk=5000):
+        """Yield lists of raw patient tuples in id order (for exports)."""
+        return PATIENTS_BY_ID.walk(self._query, chunk=chunk)
+
+    def appointment_rows(self, date_from, date_to, chunk=5000):
+        """Yield lists of raw appointment tuples with date_from <= date <= date_to,
+        in date and time order, seeking on the index chunk by chunk."""
+        return APPOINTMENTS_BY_DATE.walk(self._query, first_on(date_from), chunk, upto=date_to)
+
+    def count_appointments_between(self, date_from, date_to):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM appointments WHERE date BETWEEN ? AND ?',
+                (date_from, date_to)).fetchone()[0]
+
+    def iter_patients(self, chunk=5000):
+        """Yield every patient in id order, `chunk` rows per query."""
+        for rows in PATIENTS_BY_ID.walk(self._query, chunk=chunk):
+            yield from map(_patient, rows)
+
+    def iter_appointments(self, chunk=5000):
+        """Yield every appointment in id order, `chunk` rows per query."""
+        for rows in APPOINTMENTS_BY_ID.walk(self._query, chunk=chunk):
+            yield from map(_appointment, rows)
+
+    def _query(self, sql, args):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def rows_from_others(self, after_patient, after_appointment):
+        """
+        Rows with ids above the given ones that another connection (the
+        API server) inserted; rows this store wrote are left out.
+        Returns (patients, appointments, (last patient id, last
+        appointment id)), where the last ids count every row read.
+        """
+        out, last = [], []
+        with self._lock:
+            for table, key, after, make in (('patients', 'patient_id', after_patient, _patient),
+                                            ('appointments', 'appointment_id',
+                                             after_appointment, _appointment)):
+                rows = self._conn.execute(
+                    f'SELECT {_COLUMNS[table]} FROM {table} WHERE {key} > ? ORDER BY {key}',
+                    (after,)).fetchall()
+                own = self._own[table]
+                out.append([make(r) for r in rows
+                            if not any(lo <= r[0] <= hi for lo, hi in own)])
+                last.append(rows[-1][0] if rows else after)
+                # ranges at or below the last row read will not be seen again
+                self._own[table] = [(lo, hi) for lo, hi in own if hi > last[-1]]
+        return out[0], out[1], tuple(last)
+
+    # ── Group commit ─────────────────────────────────────────
+    def flush(self):
+        """Commit everything written so far."""
+        with self._lock:
+            if self._pending:
+                self._conn.execute('COMMIT')
+                self._pending = 0
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._committer.join()
+        with self._lock:
+            self.checkpoint()
+            self._conn.close()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _begin(self):
+        # IMMEDIATE takes SQLite's write lock up front.  A deferred BEGIN
+        # reads first (MAX(id) in _next_id) and then cannot upgrade its
+        # read lock once another connection — the API server's store —
+        # has committed, failing with "database is locked" instead of
+        # waiting its turn.
+        if not self._conn.in_transaction:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._first_pending = time.monotonic()
+            self._wake.set()
+
+    @contextmanager
+    def _atomic(self, savepoint=True):
+        """
+        One write, inside the group transaction: if any statement of it
+        fails, all of it is undone and the writes already pending stay.
+        With nothing else pending the transaction is ended too, so it
+        does not hold SQLite's write lock with nothing to commit.
+        A single INSERT undoes itself when it fails, so it can skip the
+        savepoint (which costs about as much as the INSERT).
+        """
+        self._begin()
+        if savepoint:
+            self._conn.execute('SAVEPOINT write')
+        try:
+            yield
+        except BaseException:
+            if savepoint:
+                self._conn.execute('ROLLBACK TO write')
+                self._conn.execute('RELEASE write')
+            if not self._pending:
+                self._conn.execute('ROLLBACK')
+            raise
+        if savepoint:
+            self._conn.execute('RELEASE write')
+
+    def _written(self, n):
+        self._pending += n
+        if self._pending >= self.batch_size:
+            self._conn.execute('COMMIT')
+            self._pending = 0
+
+    def _commit_loop(self):
+        idle = CHECKPOINT_INTERVAL if self._journal is not None else None
+        while not self._closed:
+            self._wake.wait(idle)
+            self._wake.clear()
+            if self._journal is not None and self._journal.size and (
+                    self._journal.size >= CHECKPOINT_BYTES or
+                    time.monotonic() - self._checkpointed >= CHECKPOINT_INTERVAL):
+                self.checkpoint()
+            while not self._closed:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    due = self._first_pending + self.commit_interval
+                    if time.monotonic() >= due:
+                        self.flush()
+                        break
+                time.sleep(max(0.0, due - time.monotonic()))
+
+    # ── Journal ──────────────────────────────────────────────
+    def checkpoint(self):
+        """Commit, sync the SQLite files, then empty the journal."""
+        with self._lock:
+            self.flush()
+            if self._journal is None:
+                return
+            # synchronous=NORMAL leaves WAL commits unsynced; sync them here
+            for name in (self.path + '-wal', self.path):
+                try:
+                    fd = os.open(name, os.O_RDWR)
+                except FileNotFoundError:
+                    continue
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._journal.clear()
+            self._checkpointed = time.monotonic()
+
+    def _log(self, op, data):
+        # Called under _lock, so the journal holds writes in applied order
+        return None if self._journal is None else self._journal.append(op, data)
+
+    def _durable(self, seq):
+        if seq is not None:
+            self._journal.wait(seq)
+
+    def _replay(self, records):
+        """
+        Re-apply journaled writes SQLite may have lost.  A row already
+        stored under its id is skipped.  If another connection (the API
+        server) has since used the id of a lost row, that row is added
+        under a new id instead, so neither save is overwritten, and the
+        move is reported on stderr.
+        """
+        if not records:
+            return
+        moved = {'patients': {}, 'appointments': {}}    # journaled id -> new id
+        with self._lock:
+            for op, data in records:
+                patient_ids = moved['patients']
+                if op == 'merge':
+                    self._merge(*(patient_ids.get(pid, pid) for pid in data))
+                    continue
+                if op == 'appointments' and patient_ids:
+                    data = [[r[0], patient_ids.get(r[1], r[1])] + r[2:] for r in data]
+                with self._atomic():
+                    for row in data:
+                        self._restore(op, row, moved[op])
+                self._written(len(data))
+                self.versions[op] += 1
+            self.checkpoint()
+
+    def _restore(self, table, row, moved):
+        columns = _COLUMNS[table]
+        insert = f'INSERT OR IGNORE INTO {table} ({columns}) VALUES ({", ".join("?" * len(row))})'
+        if self._conn.execute(insert, row).rowcount:
+            return
+        fields = [v for v in row[1:] for _ in range(2)] if table == 'patients' else row[2:]
+        if self._conn.execute(_SAME_ROW[table], [row[0]] + fields).fetchone():
+            return
+        new_id = self._next_id(table, _KEYS[table])
+        self._conn.execute(insert, [new_id] + list(row[1:]))
+        moved[row[0]] = new_id
+        print(f'journal replay: {table} id {row[0]} was taken by another writer; '
+              f'the journaled row is now id {new_id}', file=sys.stderr)
+
+
+# ── Row helpers ──────────────────────────────────────────────
+def _patient(row):
+    return {'id': row[0], 'name': row[1], 'age': row[2],
+            'phone': row[3], 'email': row[4], 'gender': row[5]}
+
+
+def _appointment(row):
+    return {'id': row[0], 'patient_id': row[1], 'patient': row[2],
+            'doctor': row[3], 'date': row[4], 'time': row[5], 'status': row[6],
+            'amount': row[7]}
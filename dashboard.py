@@ -0,0 +1,308 @@
+# ============================================================
+#  Dashboard — live counters and the Dashboard view
+#  Smart Clinic Management System
+#  Same numbers as the COUNT / GROUP BY lessons (count.sql,
+#  group1.sql), but kept up to date on every save instead of
+#  recounted with a full scan.  The trend chart reads its bars
+#  from rollup.RollupCube, one bucket at a time.
+# ============================================================
+
+import tkinter as tk
+from collections import Counter
+from datetime import date as Date, timedelta
+
+from validation import STATUSES
+
+COLORS = {
+    'card':   '#ffffff',
+    'tile':   '#f7f9fc',
+    'text':   '#1e2d40',
+    'muted':  '#8a99b0',
+    'accent': '#4f7ef8',
+    'green':  '#2ec87a',
+    'border': '#dde3ef',
+    'grey':   '#c5cedb',
+}
+
+FONTS = {
+    'title': ('Segoe UI', 16, 'bold'),
+    'big':   ('Segoe UI', 22, 'bold'),
+    'label': ('Segoe UI', 9, 'bold'),
+    'row':   ('Segoe UI', 10),
+}
+
+# Bars per trend level, ending with the one holding today
+TREND_SPANS = {'day': 30, 'week': 26, 'month': 12}
+STATUS_COLORS = {'Scheduled': COLORS['accent'], 'Completed': COLORS['green'],
+                 'Cancelled': COLORS['grey']}
+
+AGE_BANDS = ((0, 17, '0–17'), (18, 39, '18–39'), (40, 64, '40–64'), (65, 200, '65+'))
+
+# SQL that computes the same bands, for the verification recount
+_AGE_BAND_SQL = ("CASE WHEN age IS NULL THEN 'Unknown' "
+                 + ' '.join(f"WHEN age <= {hi} THEN '{name}'" for _, hi, name in AGE_BANDS)
+                 + " ELSE 'Unknown' END")
+
+
+def age_band(age):
+    if age is None:
+        return 'Unknown'
+    for lo, hi, name in AGE_BANDS:
+        if age <= hi:
+            return name
+    return 'Unknown'
+
+
+# ── Counters ─────────────────────────────────────────────────
+class DashboardStats:
+    """
+    Counters behind the dashboard.  Every save adds to them, so reading
+    any number is a dict lookup.  recompute() rebuilds them with GROUP BY
+    queries; it runs once at startup and can be used to verify().
+    """
+
+    def __init__(self):
+        self.patients = 0
+        self.appointments = 0
+        self.by_gender = Counter()
+        self.by_age_band = Counter()
+        self.by_status = Counter()
+        self.by_doctor = Counter()
+        self.by_day = Counter()
+
+    def add_patient(self, patient):
+        self.patients += 1
+        self.by_gender[patient.get('gender') or 'Select'] += 1
+        self.by_age_band[age_band(patient.get('age'))] += 1
+
+    def remove_patient(self, patient):
+        self.patients -= 1
+        self.by_gender[patient.get('gender') or 'Select'] -= 1
+        self.by_age_band[age_band(patient.get('age'))] -= 1
+
+    def add_appointment(self, appointment):
+        self.appointments += 1
+        self.by_status[appointment.get('status')] += 1
+        self.by_doctor[appointment.get('doctor')] += 1
+        self.by_day[appointment.get('date')] += 1
+
+    def snapshot(self):
+        return {
+            'patients': self.patients,
+            'appointments': self.appointments,
+            'by_gender': dict(self.by_gender),
+            'by_age_band': dict(self.by_age_band),
+            'by_status': dict(self.by_status),
+            'by_doctor': dict(self.by_doctor),
+            'by_day': dict(self.by_day),
+        }
+
+    @classmethod
+    def recompute(cls, store):
+        stats = cls()
+        stats.by_gender = Counter(store.group_count('patients', "COALESCE(NULLIF(gender, ''), 'Select')"))
+        stats.by_age_band = Counter(store.group_count('patients', _AGE_BAND_SQL))
+        stats.by_status = Counter(store.group_count('appointments', 'status'))
+        stats.by_doctor = Counter(store.group_count('appointments', 'doctor'))
+        stats.by_day = Counter(store.group_count('appointments', 'date'))
+        stats.patients = sum(stats.by_gender.values())
+        stats.appointments = sum(stats.by_status.values())
+        return stats
+
+    @classmethod
+    def from_records(cls, records):
+        """Same counters, read from the in-memory columns (records.py)."""
+        stats = cls()
+        with records.lock:
+            p, a = records.patients, records.appointments
+            stats.by_gender = Counter()
+            for gender, n in p.gender.counts(p.dead).items():
+                stats.by_gender[gender or 'Select'] += n
+            for age, n in p.age_counts().items():
+                stats.by_age_band[age_band(age)] += n
+            stats.by_status = a.status.counts(a.dead)
+            stats.by_doctor = a.doctor.counts(a.dead)
+            stats.by_day = a.date.counts(a.dead)
+            stats.patients, stats.appointments = len(p), len(a)
+        return stats
+
+    def verify(self, store):
+        """True if the live counters match a full recount."""
+        fresh = DashboardStats.recompute(store).snapshot()
+        mine = self.snapshot()
+        for key in ('by_gender', 'by_age_band', 'by_status', 'by_doctor', 'by_day'):
+            mine[key] = {k: v for k, v in mine[key].items() if v}
+        return mine == fresh
+
+
+# ── View ─────────────────────────────────────────────────────
+class DashboardView(tk.Frame):
+    """Tiles and breakdowns read straight from DashboardStats."""
+
+    def __init__(self, parent, stats, rollup=None):
+        super().__init__(parent, bg=COLORS['card'])
+        self.stats = stats
+        self.rollup = rollup
+        self._build()
+        self.refresh()
+
+    def _build(self):
+        tk.Label(self, text='Dashboard', font=FONTS['title'], fg=COLORS['text'],
+                 bg=COLORS['card']).pack(anchor='w', padx=24, pady=(20, 12))
+
+        tiles = tk.Frame(self, bg=COLORS['card'])
+        tiles.pack(fill=tk.X, padx=18)
+        self.tiles = {}
+        for key, title, color in (('patients', 'PATIENTS', COLORS['accent']),
+                                  ('appointments', 'APPOINTMENTS', COLORS['green']),
+                                  ('today', 'TODAY', COLORS['accent']),
+                                  ('scheduled', 'SCHEDULED', COLORS['green'])):
+            tile = tk.Frame(tiles, bg=COLORS['tile'], highlightthickness=1,
+                            highlightbackground=COLORS['border'])
+            tile.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+            tk.Label(tile, text=title, font=FONTS['label'], fg=COLORS['muted'],
+                     bg=COLORS['tile']).pack(anchor='w', padx=14, pady=(12, 0))
+            value = tk.Label(tile, font=FONTS['big'], fg=color, bg=COLORS['tile'])
+            value.pack(anchor='w', padx=14, pady=(0, 12))
+            self.tiles[key] = value
+
+        self.trend = None
+        if self.rollup is not None:
+            self.trend = TrendChart(self, self.rollup)
+            self.trend.pack(fill=tk.X, padx=24, pady=(16, 0))
+
+        lists = tk.Frame(self, bg=COLORS['card'])
+        lists.pack(fill=tk.BOTH, expand=True, padx=18, pady=16)
+        self.lists = {}
+        for key, title in (('by_status', 'BY STATUS'), ('by_doctor', 'TOP DOCTORS'),
+                           ('by_gender', 'BY GENDER'), ('by_age_band', 'BY AGE')):
+            col = tk.Frame(lists, bg=COLORS['card'])
+            col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=6)
+            tk.Label(col, text=title, font=FONTS['label'], fg=COLORS['muted'],
+                     bg=COLORS['card']).pack(anchor='w')
+            body = tk.Label(col, font=FONTS['row'], fg=COLORS['text'],
+                            bg=COLORS['card'], justify=tk.LEFT, anchor='nw')
+            body.pack(anchor='w', pady=(4, 0))
+            self.lists[key] = body
+
+    def refresh(self):
+        s = self.stats
+        self.tiles['patients'].config(text=f'{s.patients:,}')
+        self.tiles['appointments'].config(text=f'{s.appointments:,}')
+        self.tiles['today'].config(text=f'{s.by_day[Date.today().isoformat()]:,}')
+        self.tiles['scheduled'].config(text=f"{s.by_status['Scheduled']:,}")
+        for key, body in self.lists.items():
+            counter = getattr(s, key)
+            rows = [(k, v) for k, v in counter.most_common(6) if v]
+            body.config(text='\n'.join(f'{k}:  {v:,}' for k, v in rows) or '—')
+        if self.trend is not None:
+            self.trend.refresh()
+
+
+def trend_range(level, today=None):
+    """(first, last) ISO dates covering TREND_SPANS[level] whole buckets
+    up to today's."""
+    today = today or Date.today()
+    span = TREND_SPANS[level]
+    if level == 'day':
+        first = today - timedelta(days=span - 1)
+    elif level == 'week':
+        first = today - timedelta(weeks=span - 1, days=today.weekday())
+    else:
+        index = today.year * 12 + today.month - span
+        first = Date(index // 12, index % 12 + 1, 1)
+    return first.isoformat(), today.isoformat()
+
+
+class TrendChart(tk.Frame):
+    """Appointments per day / week / month, stacked by status."""
+
+    HEIGHT = 150
+
+    def __init__(self, parent, rollup, level='week'):
+        super().__init__(parent, bg=COLORS['card'])
+        self.rollup = rollup
+        self.level = level
+        self._job = None
+
+        header = tk.Frame(self, bg=COLORS['card'])
+        header.pack(fill=tk.X)
+        tk.Label(header, text='TREND', font=FONTS['label'], fg=COLORS['muted'],
+                 bg=COLORS['card']).pack(side=tk.LEFT)
+        self.toggles = {}
+        for key in reversed(tuple(TREND_SPANS)):
+            toggle = tk.Label(header, text=key.title(), font=FONTS['label'],
+                              bg=COLORS['card'], cursor='hand2', padx=6)
+            toggle.pack(side=tk.RIGHT)
+            toggle.bind('<Button-1>', lambda e, k=key: self.show(k))
+            self.toggles[key] = toggle
+        for status in reversed(STATUSES):
+            tk.Label(header, text=f'■ {status}', font=FONTS['label'],
+                     fg=STATUS_COLORS[status], bg=COLORS['card'],
+                     padx=6).pack(side=tk.RIGHT)
+
+        self.canvas = tk.Canvas(self, height=self.HEIGHT, bg=COLORS['card'],
+                                highlightthickness=0)
+        self.canvas.pack(fill=tk.X, pady=(6, 0))
+        self.canvas.bind('<Configure>', lambda e: self._schedule())
+        self._select()
+
+    def show(self, level):
+        self.level = level
+        self._select()
+        self.refresh()
+
+    def _select(self):
+        for key, toggle in self.toggles.items():
+            toggle.config(fg=COLORS['accent'] if key == self.level else COLORS['muted'])
+
+    def _schedule(self):
+        # A resize fires many <Configure>s; draw once they settle
+        if self._job is None:
+            self._job = self.after_idle(self.refresh)
+
+    def destroy(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        super().destroy()
+
+    def refresh(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        c = self.canvas
+        c.delete('all')
+        width = c.winfo_width()
+        if width <= 1:
+            return                      # not laid out yet; <Configure> redraws
+        first, last = trend_range(self.level)
+        series = {s: self.rollup.series(self.level, first, last, status=s)
+                  for s in STATUSES}
+        labels = [b for b, _ in series[STATUSES[0]]]
+        totals = [sum(series[s][i][1] for s in STATUSES) for i in range(len(labels))]
+        peak = max(totals) or 1
+
+        left, bottom, top = 40, self.HEIGHT - 18, 12
+        slot = (width - left) / len(labels)
+        bar = max(slot * 0.7, 1)
+        c.create_line(left, bottom, width, bottom, fill=COLORS['border'])
+        c.create_text(left - 6, top, text=f'{peak:,}', anchor='e',
+                      font=FONTS['label'], fill=COLORS['muted'])
+        c.create_text(left - 6, bottom, text='0', anchor='e',
+                      font=FONTS['label'], fill=COLORS['muted'])
+        every = max(1, len(labels) // 6)
+        for i, label in enumerate(labels):
+            x = left + i * slot + (slot - bar) / 2
+            y = bottom
+            for status in STATUSES:
+                n = series[status][i][1]
+                if n:
+                    h = n / peak * (bottom - top)
+                    c.create_rectangle(x, y - h, x + bar, y, width=0,
+                                       fill=STATUS_COLORS[status])
+                    y -= h
+            if i % every == 0:
+                c.create_text(x + bar / 2, bottom + 4, anchor='n', font=FONTS['label'],
+                              fill=COLORS['muted'], text=label[5:] if self.level != 'month'
+                              else Date(int(label[:4]), int(label[5:7]), 1).strftime('%b'))
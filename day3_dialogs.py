@@ -10,6 +10,9 @@ import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
 
+from rounded_button import RoundedButton
+from validation import validate_patient, validate_appointment, GENDERS, STATUSES
+
 COLORS = {
     'bg':      '#f0f4f8',
     'sidebar': '#1a2340',
@@ -35,32 +38,9 @@ FONTS = {
 # ── Reusable helpers ─────────────────────────────────────────
 
 def make_button(parent, text, color, command, width=160):
-    """Rounded canvas button (same as Day 2)"""
-    W, H, R = width, 36, 8
-    canvas = tk.Canvas(parent, width=W, height=H,
-                        bg=COLORS['card'], highlightthickness=0, cursor='hand2')
-
-    def draw(c):
-        canvas.delete('all')
-        canvas.create_arc(0,     0,     R*2,   R*2,   start=90,  extent=90, fill=c, outline=c)
-        canvas.create_arc(W-R*2, 0,     W,     R*2,   start=0,   extent=90, fill=c, outline=c)
-        canvas.create_arc(0,     H-R*2, R*2,   H,     start=180, extent=90, fill=c, outline=c)
-        canvas.create_arc(W-R*2, H-R*2, W,     H,     start=270, extent=90, fill=c, outline=c)
-        canvas.create_rectangle(R, 0, W-R, H, fill=c, outline=c)
-        canvas.create_rectangle(0, R, W, H-R, fill=c, outline=c)
-        canvas.create_text(W//2, H//2, text=text, fill='white', font=FONTS['btn'])
-
-    def darken(h, a=25):
-        return '#{:02x}{:02x}{:02x}'.format(
-            max(0, int(h[1:3],16)-a),
-            max(0, int(h[3:5],16)-a),
-            max(0, int(h[5:7],16)-a))
-
-    draw(color)
-    canvas.bind('<Enter>',    lambda e: draw(darken(color)))
-    canvas.bind('<Leave>',    lambda e: draw(color))
-    canvas.bind('<Button-1>', lambda e: command())
-    return canvas
+    """Rounded canvas button (same as Day 2, now shared in rounded_button.py)"""
+    return RoundedButton(parent, text, color, command, width=width, height=36,
+                         radius=8, bg=COLORS['card'], hover_amount=25)
 
 def labeled_entry(parent, label_text, row, required=False):
     """
@@ -86,16 +66,50 @@ def labeled_entry(parent, label_text, row, required=False):
 
     return entry
 
+def keep_or_destroy(dialog, keep):
+    """
+    The dialog's close(): destroy it, or with keep=True just hide it
+    so it can be shown again (see views.DialogManager).
+    """
+    def close():
+        if keep:
+            dialog.grab_release()
+            dialog.withdraw()
+        else:
+            dialog.destroy()
+    dialog.protocol('WM_DELETE_WINDOW', close)
+    return close
+
+def show_again(dialog, first_field):
+    """Bring a kept dialog back, modal again, with the cursor in place."""
+    dialog.deiconify()
+    dialog.lift()
+    grab(dialog)
+    first_field.focus_set()
+
+def grab(dialog):
+    # A just-deiconified window may not be viewable yet; try again shortly
+    try:
+        dialog.grab_set()
+    except tk.TclError:
+        if dialog.winfo_exists() and dialog.state() != 'withdrawn':
+            dialog.after(10, lambda: grab(dialog))
+
 
 # ─────────────────────────────────────────────────────────────
 #  DIALOG 1: Add Patient
 # ─────────────────────────────────────────────────────────────
 
-def open_patient_dialog(parent, on_save=None):
+def open_patient_dialog(parent, on_save=None, keep=False):
     """
     Opens a Toplevel window (a popup) with a patient form.
     tk.Toplevel = a secondary window that belongs to the parent.
+    on_save(patient, saved) stores the patient and calls saved() once
+    it is stored, or saved(error), which tells the user either way.
+    With keep=True closing only hides it; dialog.reopen(on_save)
+    shows it again with the form cleared.
     """
+    state = {'on_save': on_save}
 
     # ── Create the popup window ──────────────────────────────
     dialog = tk.Toplevel(parent)
@@ -107,6 +121,7 @@ def open_patient_dialog(parent, on_save=None):
     # Keep dialog on top of the main window
     dialog.transient(parent)
     dialog.grab_set()            # block clicks on main window while open
+    close = keep_or_destroy(dialog, keep)
 
     # ── Header ───────────────────────────────────────────────
     header = tk.Frame(dialog, bg=COLORS['accent'], height=54)
@@ -132,51 +147,51 @@ def open_patient_dialog(parent, on_save=None):
                  row=4, column=0, sticky='w', padx=(24, 12), pady=(10, 0))
 
     gender_var = tk.StringVar(value='Select')     # StringVar holds the selected value
-    gender_menu = tk.OptionMenu(form, gender_var, 'Male', 'Female', 'Other')
+    gender_menu = tk.OptionMenu(form, gender_var, *GENDERS)
     gender_menu.config(font=FONTS['normal'], bg=COLORS['card'],
                        relief=tk.FLAT, highlightthickness=1,
                        highlightbackground=COLORS['border'])
     gender_menu.grid(row=4, column=1, sticky='w', padx=(0, 24), pady=(10, 0))
 
+    fields = {'name': name_entry, 'age': age_entry, 'phone': phone_entry,
+              'email': email_entry, 'gender': gender_menu}
+
     # ── Validation & Save ────────────────────────────────────
     error_label = tk.Label(form, text='', font=FONTS['small'],
                             fg=COLORS['error'], bg=COLORS['card'])
     error_label.grid(row=5, column=0, columnspan=2, pady=(8, 0))
 
     def save():
-        # Read values from each Entry
-        name  = name_entry.get().strip()
-        age   = age_entry.get().strip()
-        phone = phone_entry.get().strip()
-        email = email_entry.get().strip()
-        gender = gender_var.get()
-
-        # Simple validation
-        if not name:
-            error_label.config(text='⚠  Full Name is required.')
-            name_entry.focus()
-            return
-        if not age.isdigit():
-            error_label.config(text='⚠  Age must be a number.')
-            age_entry.focus()
+        # Read values from each Entry and check them with the shared rules
+        patient, error = validate_patient({
+            'name':   name_entry.get(),
+            'age':    age_entry.get(),
+            'phone':  phone_entry.get(),
+            'email':  email_entry.get(),
+            'gender': gender_var.get(),
+        })
+        if error:
+            field, message = error
+            error_label.config(text='⚠  ' + message)
+            fields[field].focus()
             return
+        name = patient['name']
 
-        # Build a dictionary with patient data
-        patient = {
-            'name':   name,
-            'age':    int(age),
-            'phone':  phone,
-            'email':  email,
-            'gender': gender,
-        }
+        def saved(error=None):
+            # The dialog is closed by now, so the message goes on the parent
+            if error is None:
+                messagebox.showinfo("Patient Saved",
+                    f"Patient '{name}' added successfully!", parent=parent)
+            else:
+                messagebox.showerror("Patient Not Saved",
+                    f"Patient '{name}' could not be saved:\n{error}", parent=parent)
 
-        messagebox.showinfo("Patient Saved",
-            f"Patient '{name}' added successfully!", parent=dialog)
+        if state['on_save']:
+            state['on_save'](patient, saved)   # pass data back to main window
+        else:
+            saved()
 
-        if on_save:
-            on_save(patient)   # pass data back to main window
-
-        dialog.destroy()       # close the dialog
+        close()                         # close (or hide) the dialog
 
     # ── Buttons ──────────────────────────────────────────────
     btn_row = tk.Frame(dialog, bg=COLORS['card'])
@@ -185,30 +200,53 @@ def open_patient_dialog(parent, on_save=None):
     cancel_btn = tk.Button(btn_row, text="Cancel", font=FONTS['btn'],
                             bg=COLORS['border'], fg=COLORS['text'],
                             relief=tk.FLAT, padx=16, pady=8, cursor='hand2',
-                            command=dialog.destroy)
+                            command=close)
     cancel_btn.pack(side=tk.LEFT)
 
     save_canvas = make_button(btn_row, '💾  Save Patient', COLORS['accent'], save, width=148)
     save_canvas.config(bg=COLORS['card'])
     save_canvas.pack(side=tk.RIGHT)
 
+    def reopen(on_save=None):
+        state['on_save'] = on_save
+        for entry in (name_entry, age_entry, phone_entry, email_entry):
+            entry.delete(0, tk.END)
+        gender_var.set('Select')
+        error_label.config(text='')
+        show_again(dialog, name_entry)
+
+    # Handles for callers that drive the form (benchmarks/run.py)
+    dialog.fields, dialog.save = fields, save
+    dialog.close, dialog.reopen = close, reopen
+    dialog.variables = {'gender': gender_var}
+    return dialog
+
 
 # ─────────────────────────────────────────────────────────────
 #  DIALOG 2: Add Appointment
 # ─────────────────────────────────────────────────────────────
 
-def open_appointment_dialog(parent, on_save=None):
+def open_appointment_dialog(parent, on_save=None, scheduler=None, autocomplete=None,
+                            keep=False):
     """
     Opens a Toplevel window with an appointment booking form.
+    If a scheduler (scheduling.ScheduleIndex) is given, double bookings
+    are refused and the next free slots are suggested.  With an
+    autocomplete (autocomplete.Autocomplete), Patient Name and Doctor
+    suggest as you type, and a picked patient is saved by ID.
+    keep=True works as in open_patient_dialog; reopen() takes the
+    same keyword arguments as this function.
     """
+    state = {'on_save': on_save, 'scheduler': scheduler, 'autocomplete': None}
 
     dialog = tk.Toplevel(parent)
     dialog.title("New Appointment")
-    dialog.geometry("480x420")
+    dialog.geometry("480x470")
     dialog.config(bg=COLORS['card'])
     dialog.resizable(False, False)
     dialog.transient(parent)
     dialog.grab_set()
+    close = keep_or_destroy(dialog, keep)
 
     # ── Header ───────────────────────────────────────────────
     header = tk.Frame(dialog, bg=COLORS['green'], height=54)
@@ -232,62 +270,93 @@ def open_appointment_dialog(parent, on_save=None):
     time_entry = labeled_entry(form, "Time (HH:MM)", row=3)
     time_entry.insert(0, '09:00')
 
+    # Suggestions; picking a patient remembers their ID
+    picked = {'patient_id': None, 'name': None}
+    boxes = []
+
+    def attach(autocomplete):
+        # Once per dialog; a kept dialog may get its autocomplete later
+        if autocomplete is None or state['autocomplete'] is not None:
+            return
+        from autocomplete import SuggestionBox
+        state['autocomplete'] = autocomplete
+        boxes.append(SuggestionBox(patient_entry, autocomplete.patient_suggestions,
+                                   lambda pid, name: picked.update(patient_id=pid, name=name)))
+        boxes.append(SuggestionBox(doctor_entry, autocomplete.doctor_suggestions))
+    attach(autocomplete)
+
     # Status dropdown
     tk.Label(form, text="Status", font=FONTS['label'],
              bg=COLORS['card'], fg=COLORS['text']).grid(
                  row=4, column=0, sticky='w', padx=(24,12), pady=(10,0))
 
     status_var = tk.StringVar(value='Scheduled')
-    status_menu = tk.OptionMenu(form, status_var, 'Scheduled', 'Completed', 'Cancelled')
+    status_menu = tk.OptionMenu(form, status_var, *STATUSES)
     status_menu.config(font=FONTS['normal'], bg=COLORS['card'],
                        relief=tk.FLAT, highlightthickness=1,
                        highlightbackground=COLORS['border'])
     status_menu.grid(row=4, column=1, sticky='w', padx=(0,24), pady=(10,0))
 
+    # Optional fee, summed by the revenue reports
+    fee_entry = labeled_entry(form, "Fee", row=5)
+
     # ── Validation & Save ────────────────────────────────────
     error_label = tk.Label(form, text='', font=FONTS['small'],
                             fg=COLORS['error'], bg=COLORS['card'])
-    error_label.grid(row=5, column=0, columnspan=2, pady=(8,0))
-
-    def save():
-        patient = patient_entry.get().strip()
-        doctor  = doctor_entry.get().strip()
-        date    = date_entry.get().strip()
-        time    = time_entry.get().strip()
-        status  = status_var.get()
-
-        if not patient:
-            error_label.config(text='⚠  Patient Name is required.')
-            patient_entry.focus()
-            return
-        if not doctor:
-            error_label.config(text='⚠  Doctor is required.')
-            doctor_entry.focus()
-            return
+    error_label.grid(row=6, column=0, columnspan=2, pady=(8,0))
 
-        # Validate date format
-        try:
-            datetime.strptime(date, '%Y-%m-%d')
-        except ValueError:
-            error_label.config(text='⚠  Date must be in YYYY-MM-DD format.')
-            date_entry.focus()
-            return
+    fields = {'patient': patient_entry, 'doctor': doctor_entry,
+              'date': date_entry, 'time': time_entry, 'status': status_menu,
+              'amount': fee_entry}
 
-        appointment = {
-            'patient': patient,
-            'doctor':  doctor,
-            'date':    date,
-            'time':    time,
-            'status':  status,
-        }
+    def show_error(field, message):
+        error_label.config(text='⚠  ' + message)
+        fields.get(field, patient_entry).focus()     # patient_id: the name it came with
 
-        messagebox.showinfo("Appointment Saved",
-            f"Appointment for '{patient}' on {date} saved!", parent=dialog)
-
-        if on_save:
-            on_save(appointment)
-
-        dialog.destroy()
+    def save():
+        # The ID only counts if the name was not edited after picking
+        patient_id = (picked['patient_id']
+                      if patient_entry.get().strip() == picked['name'] else None)
+        appointment, error = validate_appointment({
+            'patient':    patient_entry.get(),
+            'patient_id': patient_id,
+            'doctor':     doctor_entry.get(),
+            'date':       date_entry.get(),
+            'time':       time_entry.get(),
+            'status':     status_var.get(),
+            'amount':     fee_entry.get(),
+        })
+        if error:
+            show_error(*error)
+            return
+        patient, doctor = appointment['patient'], appointment['doctor']
+        date, time = appointment['date'], appointment['time']
+
+        # Is the doctor already booked at that time?
+        scheduler = state['scheduler']
+        if scheduler is not None and time:
+            clash = scheduler.conflict(appointment)
+            if clash is not None:
+                free = scheduler.free_slots(doctor, 3, date, time)
+                show_error('time', f"{doctor} is booked at {clash['time']}. Free: "
+                           + ', '.join(t if d == date else f'{d[5:]} {t}' for d, t in free))
+                return
+
+        def saved(error=None):
+            if error is None:
+                messagebox.showinfo("Appointment Saved",
+                    f"Appointment for '{patient}' on {date} saved!", parent=parent)
+            else:
+                messagebox.showerror("Appointment Not Saved",
+                    f"Appointment for '{patient}' on {date} could not be saved:\n{error}",
+                    parent=parent)
+
+        if state['on_save']:
+            state['on_save'](appointment, saved)
+        else:
+            saved()
+
+        close()
 
     # ── Buttons ──────────────────────────────────────────────
     btn_row = tk.Frame(dialog, bg=COLORS['card'])
@@ -296,107 +365,114 @@ def open_appointment_dialog(parent, on_save=None):
     tk.Button(btn_row, text="Cancel", font=FONTS['btn'],
               bg=COLORS['border'], fg=COLORS['text'],
               relief=tk.FLAT, padx=16, pady=8, cursor='hand2',
-              command=dialog.destroy).pack(side=tk.LEFT)
+              command=close).pack(side=tk.LEFT)
 
     save_canvas = make_button(btn_row, '💾  Save Appointment', COLORS['green'], save, width=175)
     save_canvas.config(bg=COLORS['card'])
     save_canvas.pack(side=tk.RIGHT)
 
+    def reopen(on_save=None, scheduler=None, autocomplete=None):
+        state.update(on_save=on_save, scheduler=scheduler)
+        attach(autocomplete)
+        for entry in (patient_entry, doctor_entry, date_entry, time_entry, fee_entry):
+            entry.delete(0, tk.END)
+        date_entry.insert(0, datetime.today().strftime('%Y-%m-%d'))
+        time_entry.insert(0, '09:00')
+        status_var.set('Scheduled')
+        picked.update(patient_id=None, name=None)
+        for box in boxes:
+            box.hide()
+        error_label.config(text='')
+        show_again(dialog, patient_entry)
+
+    dialog.fields, dialog.save = fields, save
+    dialog.close, dialog.reopen = close, reopen
+    dialog.variables = {'status': status_var}
+    return dialog
+
 
 # ─────────────────────────────────────────────────────────────
 #  MAIN WINDOW (to test both dialogs)
 # ─────────────────────────────────────────────────────────────
 
-root = tk.Tk()
-root.title("Smart Clinic – Day 3")
-root.geometry("1100x640")
-root.config(bg=COLORS['bg'])
-
-main_frame = tk.Frame(root, bg=COLORS['bg'])
-main_frame.pack(fill=tk.BOTH, expand=True)
-
-# Sidebar (same as Day 1 & 2)
-sidebar = tk.Frame(main_frame, bg=COLORS['sidebar'], width=210)
-sidebar.pack(side=tk.LEFT, fill=tk.Y)
-sidebar.pack_propagate(False)
-tk.Label(sidebar, text="Smart Clinic", font=FONTS['title'],
-         fg='white', bg=COLORS['sidebar']).pack(anchor='w', padx=20, pady=(24,4))
-tk.Label(sidebar, text="Management System", font=FONTS['small'],
-         fg=COLORS['muted'], bg=COLORS['sidebar']).pack(anchor='w', padx=20)
-tk.Frame(sidebar, bg='#2a3355', height=1).pack(fill=tk.X, pady=(16,0))
-for item in ['Dashboard','Patients','Appointments','Staff','Settings']:
-    tk.Label(sidebar, text=f"   {item}", font=FONTS['normal'],
-             fg='#a8b8d0', bg=COLORS['sidebar'],
-             anchor='w', cursor='hand2').pack(fill=tk.X, pady=2)
-
-# Right side
-right = tk.Frame(main_frame, bg=COLORS['bg'])
-right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-# Top bar with buttons
-topbar = tk.Frame(right, bg=COLORS['bg'])
-topbar.pack(fill=tk.X, pady=(0, 14))
-
-# Search (from Day 2)
-search_frame = tk.Frame(topbar, bg='white',
-                         highlightbackground=COLORS['border'], highlightthickness=1)
-search_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=5)
-tk.Label(search_frame, text='🔍', bg='white', fg=COLORS['muted']).pack(side=tk.LEFT, padx=(10,2))
-tk.Entry(search_frame, font=FONTS['normal'], bg='white',
-         fg=COLORS['muted'], relief=tk.FLAT).pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-# Buttons — now they open real dialogs!
-btn_frame = tk.Frame(topbar, bg=COLORS['bg'])
-btn_frame.pack(side=tk.RIGHT, padx=(12, 0))
-
-def on_save_patient(data):
-    log.config(text=f"✅ Patient saved: {data['name']}, Age {data['age']}")
-
-def on_save_appointment(data):
-    log.config(text=f"✅ Appointment saved: {data['patient']} on {data['date']}")
-
-# Override make_button bg for topbar context
-def topbar_btn(parent, text, color, command, width=165):
-    W, H, R = width, 36, 8
-    canvas = tk.Canvas(parent, width=W, height=H,
-                        bg=COLORS['bg'], highlightthickness=0, cursor='hand2')
-    def draw(c):
-        canvas.delete('all')
-        canvas.create_arc(0,     0,     R*2,   R*2,   start=90,  extent=90, fill=c, outline=c)
-        canvas.create_arc(W-R*2, 0,     W,     R*2,   start=0,   extent=90, fill=c, outline=c)
-        canvas.create_arc(0,     H-R*2, R*2,   H,     start=180, extent=90, fill=c, outline=c)
-        canvas.create_arc(W-R*2, H-R*2, W,     H,     start=270, extent=90, fill=c, outline=c)
-        canvas.create_rectangle(R, 0, W-R, H, fill=c, outline=c)
-        canvas.create_rectangle(0, R, W, H-R, fill=c, outline=c)
-        canvas.create_text(W//2, H//2, text=text, fill='white', font=FONTS['btn'])
-    def dk(h, a=25):
-        return '#{:02x}{:02x}{:02x}'.format(max(0,int(h[1:3],16)-a),max(0,int(h[3:5],16)-a),max(0,int(h[5:7],16)-a))
-    draw(color)
-    canvas.bind('<Enter>',    lambda e: draw(dk(color)))
-    canvas.bind('<Leave>',    lambda e: draw(color))
-    canvas.bind('<Button-1>', lambda e: command())
-    return canvas
-
-topbar_btn(btn_frame, '＋  Add Patient',
-           COLORS['accent'],
-           lambda: open_patient_dialog(root, on_save_patient),
-           width=148).pack(side=tk.LEFT, padx=(0,8))
-
-topbar_btn(btn_frame, '＋  New Appointment',
-           COLORS['green'],
-           lambda: open_appointment_dialog(root, on_save_appointment),
-           width=178).pack(side=tk.LEFT)
-
-# Content area
-card = tk.Frame(right, bg='white',
-                highlightbackground=COLORS['border'], highlightthickness=1)
-card.pack(fill=tk.BOTH, expand=True)
-
-tk.Label(card, text="Click the buttons above to open dialogs",
-         font=FONTS['title'], fg=COLORS['muted'], bg='white').pack(expand=True)
-
-log = tk.Label(card, text='', font=FONTS['normal'],
-               fg=COLORS['accent'], bg='white')
-log.pack(pady=(0, 40))
-
-root.mainloop()
+# Runs only when this file is started directly, so smartclinic.py
+# can import the two dialogs above without opening this window.
+if __name__ == '__main__':
+    root = tk.Tk()
+    root.title("Smart Clinic – Day 3")
+    root.geometry("1100x640")
+    root.config(bg=COLORS['bg'])
+
+    main_frame = tk.Frame(root, bg=COLORS['bg'])
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    # Sidebar (same as Day 1 & 2)
+    sidebar = tk.Frame(main_frame, bg=COLORS['sidebar'], width=210)
+    sidebar.pack(side=tk.LEFT, fill=tk.Y)
+    sidebar.pack_propagate(False)
+    tk.Label(sidebar, text="Smart Clinic", font=FONTS['title'],
+             fg='white', bg=COLORS['sidebar']).pack(anchor='w', padx=20, pady=(24,4))
+    tk.Label(sidebar, text="Management System", font=FONTS['small'],
+             fg=COLORS['muted'], bg=COLORS['sidebar']).pack(anchor='w', padx=20)
+    tk.Frame(sidebar, bg='#2a3355', height=1).pack(fill=tk.X, pady=(16,0))
+    for item in ['Dashboard','Patients','Appointments','Staff','Settings']:
+        tk.Label(sidebar, text=f"   {item}", font=FONTS['normal'],
+                 fg='#a8b8d0', bg=COLORS['sidebar'],
+                 anchor='w', cursor='hand2').pack(fill=tk.X, pady=2)
+
+    # Right side
+    right = tk.Frame(main_frame, bg=COLORS['bg'])
+    right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+    # Top bar with buttons
+    topbar = tk.Frame(right, bg=COLORS['bg'])
+    topbar.pack(fill=tk.X, pady=(0, 14))
+
+    # Search (from Day 2)
+    search_frame = tk.Frame(topbar, bg='white',
+                             highlightbackground=COLORS['border'], highlightthickness=1)
+    search_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=5)
+    tk.Label(search_frame, text='🔍', bg='white', fg=COLORS['muted']).pack(side=tk.LEFT, padx=(10,2))
+    tk.Entry(search_frame, font=FONTS['normal'], bg='white',
+             fg=COLORS['muted'], relief=tk.FLAT).pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+    # Buttons — now they open real dialogs!
+    btn_frame = tk.Frame(topbar, bg=COLORS['bg'])
+    btn_frame.pack(side=tk.RIGHT, padx=(12, 0))
+
+    def on_save_patient(data, saved):
+        log.config(text=f"✅ Patient saved: {data['name']}, Age {data['age']}")
+        saved()
+
+    def on_save_appointment(data, saved):
+        log.config(text=f"✅ Appointment saved: {data['patient']} on {data['date']}")
+        saved()
+
+    # Override make_button bg for topbar context
+    def topbar_btn(parent, text, color, command, width=165):
+        return RoundedButton(parent, text, color, command, width=width, height=36,
+                             radius=8, bg=COLORS['bg'], hover_amount=25)
+
+    topbar_btn(btn_frame, '＋  Add Patient',
+               COLORS['accent'],
+               lambda: open_patient_dialog(root, on_save_patient),
+               width=148).pack(side=tk.LEFT, padx=(0,8))
+
+    topbar_btn(btn_frame, '＋  New Appointment',
+               COLORS['green'],
+               lambda: open_appointment_dialog(root, on_save_appointment),
+               width=178).pack(side=tk.LEFT)
+
+    # Content area
+    card = tk.Frame(right, bg='white',
+                    highlightbackground=COLORS['border'], highlightthickness=1)
+    card.pack(fill=tk.BOTH, expand=True)
+
+    tk.Label(card, text="Click the buttons above to open dialogs",
+             font=FONTS['title'], fg=COLORS['muted'], bg='white').pack(expand=True)
+
+    log = tk.Label(card, text='', font=FONTS['normal'],
+                   fg=COLORS['accent'], bg='white')
+    log.pack(pady=(0, 40))
+
+    root.mainloop()
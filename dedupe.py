@@ -0,0 +1,323 @@
+# ============================================================
+#  Dedupe — find and merge duplicate patients
+#  Smart Clinic Management System
+#  unique4.sql removes duplicates with a self-join, which
+#  compares every row with every other row.  Here one pass
+#  hashes a normalized key per patient (exact duplicates), and
+#  near-duplicates are only compared inside small blocks of
+#  patients that share a phone number.
+# ============================================================
+
+import hashlib
+import random
+import re
+import tkinter as tk
+import unicodedata
+from collections import defaultdict
+from itertools import combinations
+
+COLORS = {
+    'card':   '#ffffff',
+    'tile':   '#f7f9fc',
+    'text':   '#1e2d40',
+    'muted':  '#8a99b0',
+    'accent': '#4f7ef8',
+    'green':  '#2ec87a',
+    'border': '#dde3ef',
+}
+
+FONTS = {
+    'heading': ('Segoe UI', 12, 'bold'),
+    'label':   ('Segoe UI', 9, 'bold'),
+    'normal':  ('Segoe UI', 10),
+}
+
+SIMILARITY = 0.6          # name trigram Jaccard needed for a near-duplicate
+SMALL_BLOCK = 8           # blocks up to this size are compared pair by pair
+NUM_PERM = 32             # MinHash signature length
+BANDS = 8                 # LSH bands (NUM_PERM / BANDS rows each)
+MAX_BUCKET = 50           # ignore LSH buckets bigger than this
+
+_PUNCT = re.compile(r"[^\w\s]")
+_NON_DIGIT = re.compile(r'\D')
+
+
+# ── Normalized keys ──────────────────────────────────────────
+def name_key(name):
+    """'  Thándar  HLAING. ' -> 'thandar hlaing'"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_PUNCT.sub(' ', text.casefold()).split())
+
+
+def phone_key(phone):
+    """Last 9 digits, so '+95 9 1234 5678' and '09-12345678' agree."""
+    digits = _NON_DIGIT.sub('', phone or '')
+    return digits[-9:] if len(digits) >= 6 else ''
+
+
+def email_key(email):
+    return (email or '').strip().lower()
+
+
+def _digest(*parts):
+    # 64-bit hash of the key; the pass keeps only this, not the strings
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).digest()
+
+
+# ── Similarity ───────────────────────────────────────────────
+def shingles(key):
+    padded = f' {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHasher:
+    """Signatures whose per-position agreement estimates Jaccard similarity."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rnd = random.Random(seed)
+        self.params = [(rnd.randrange(1, 1 << 61) | 1, rnd.randrange(1 << 61))
+                       for _ in range(num_perm)]
+
+    def signature(self, grams):
+        hashes = [int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(),
+                                 'little') for g in grams]
+        mask = (1 << 61) - 1
+        return tuple(min(((a * h + b) & mask) for h in hashes) for a, b in self.params)
+
+
+def _lsh_pairs(members, hasher, bands=BANDS):
+    """Candidate pairs from one large block: members sharing any band."""
+    rows = len(hasher.params) // bands
+    buckets = defaultdict(list)
+    for rid, key in members:
+        sig = hasher.signature(shingles(key))
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append((rid, key))
+    seen = set()
+    for bucket in buckets.values():
+        if len(bucket) > MAX_BUCKET:
+            continue
+        for pair in combinations(bucket, 2):
+            ids = (pair[0][0], pair[1][0])
+            if ids not in seen:
+                seen.add(ids)
+                yield pair
+
+
+# ── The scan ─────────────────────────────────────────────────
+class DedupeReport:
+    def __init__(self):
+        self.exact = []      # (keep_id, duplicate_id), same name + phone; keep_id is the oldest
+        self.same_email = [] # (keep_id, duplicate_id), matched on email alone
+        self.near = []       # (score, id_a, id_b), best first
+        self.scanned = 0
+
+    def pairs(self):
+        """
+        Everything to review: exact duplicates first, then same-email
+        ones (a shared family address is not the same patient, so those
+        are never merged without a look), then near ones.
+        """
+        return ([(1.0, keep, dup, 'exact') for keep, dup in self.exact] +
+                [(1.0, keep, dup, 'same email') for keep, dup in self.same_email] +
+                [(score, a, b, 'similar') for score, a, b in self.near])
+
+
+def find_duplicates(patients, threshold=SIMILARITY, progress=None, should_stop=None):
+    """
+    One pass over `patients` (dicts with id/name/phone/email, in id order).
+    should_stop() returning True ends the scan early (cancel).
+
+    Exact: same normalized name + phone, or same email (reported apart,
+    in same_email, unless name + phone match too).  Each key is hashed
+    once and looked up in a dict, so this is O(n).
+    Near: patients are blocked by phone; inside a block names are
+    compared directly, or through MinHash/LSH when the block is large.
+    """
+    report = DedupeReport()
+    first = {}                       # key digest -> first patient id
+    named = {}                       # name + phone digest -> first id, never redirected
+    blocks = defaultdict(list)       # phone key -> [(id, name key)]
+
+    for p in patients:
+        report.scanned += 1
+        rid, nk, pk, ek = p['id'], name_key(p['name']), phone_key(p['phone']), email_key(p['email'])
+        keys = []
+        if ek:
+            keys.append(_digest('e', ek))
+        np_key = _digest('np', nk, pk) if nk and pk else None
+        if np_key is not None:
+            keys.append(np_key)
+        # Each key on its own: any one matching an earlier patient is
+        # enough, and the oldest such patient is the one kept
+        keep = min([first.setdefault(k, rid) for k in keys], default=rid)
+        same_person = np_key is not None and named.setdefault(np_key, rid) == keep
+        if keep != rid:
+            for k in keys:
+                if first[k] == rid:
+                    first[k] = keep      # later matches on this key point at the oldest too
+            (report.exact if same_person else report.same_email).append((keep, rid))
+            continue
+        if pk and nk:
+            blocks[pk].append((rid, nk))
+        if report.scanned % 5000 == 0:
+            if should_stop and should_stop():
+                return report
+            if progress and report.scanned % 50000 == 0:
+                progress(report.scanned)
+
+    hasher = None
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if should_stop and should_stop():
+            return report
+        if len(members) <= SMALL_BLOCK:
+            candidates = combinations(members, 2)
+        else:
+            hasher = hasher or MinHasher()
+            candidates = _lsh_pairs(members, hasher)
+        for (a, ka), (b, kb) in candidates:
+            if ka == kb:
+                continue
+            score = jaccard(shingles(ka), shingles(kb))
+            if score >= threshold:
+                report.near.append((round(score, 3), min(a, b), max(a, b)))
+
+    report.near.sort(reverse=True)
+    return report
+
+
+# ── Merge review screen ──────────────────────────────────────
+class MergeReviewDialog(tk.Toplevel):
+    """
+    Shows one candidate pair at a time, side by side.
+    Merge keeps the left (older) record, fills its empty fields from the
+    right one and moves the right one's appointments over.
+
+    Merges run on a worker: merge(pairs, progress) is called through
+    `tasks` and returns how many pairs it merged, calling
+    progress(done, total) as it goes (from the worker thread).
+    """
+
+    FIELDS = ('id', 'name', 'age', 'gender', 'phone', 'email')
+
+    def __init__(self, parent, report, store, tasks, merge):
+        super().__init__(parent)
+        self.title('Review Duplicates')
+        self.geometry('620x380')
+        self.config(bg=COLORS['card'])
+        self.transient(parent)
+        self.store = store
+        self.tasks = tasks
+        self.merge = merge
+        self.pairs = report.pairs()
+        self.index = 0
+        self.merged = 0
+        self._build()
+        self._show()
+
+    def _build(self):
+        header = tk.Frame(self, bg=COLORS['accent'], height=54)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+        self.heading = tk.Label(header, font=FONTS['heading'], fg='white',
+                                bg=COLORS['accent'])
+        self.heading.pack(side=tk.LEFT, padx=20, pady=14)
+
+        body = tk.Frame(self, bg=COLORS['card'])
+        body.pack(fill=tk.BOTH, expand=True, padx=20, pady=16)
+        self.cells = {}
+        for col, side in enumerate(('KEEP', 'MERGE INTO IT')):
+            tk.Label(body, text=side, font=FONTS['label'], fg=COLORS['muted'],
+                     bg=COLORS['card']).grid(row=0, column=col + 1, sticky='w', padx=8)
+        for row, field in enumerate(self.FIELDS, 1):
+            tk.Label(body, text=field.title(), font=FONTS['label'], fg=COLORS['muted'],
+                     bg=COLORS['card']).grid(row=row, column=0, sticky='w', pady=3)
+            for col in (1, 2):
+                cell = tk.Label(body, font=FONTS['normal'], fg=COLORS['text'],
+                                bg=COLORS['tile'], anchor='w', width=26)
+                cell.grid(row=row, column=col, sticky='ew', padx=8, pady=3)
+                self.cells[field, col] = cell
+
+        buttons = tk.Frame(self, bg=COLORS['card'])
+        buttons.pack(fill=tk.X, padx=20, pady=(0, 16))
+        self.buttons = []
+        for text, command in (('Skip', self._skip), ('Merge all exact', self._merge_exact)):
+            b = tk.Button(buttons, text=text, font=FONTS['normal'], relief=tk.FLAT,
+                          bg=COLORS['border'], fg=COLORS['text'], padx=14, pady=6,
+                          command=command)
+            b.pack(side=tk.LEFT, padx=(0, 8))
+            self.buttons.append(b)
+        b = tk.Button(buttons, text='Merge', font=FONTS['normal'], relief=tk.FLAT,
+                      bg=COLORS['green'], fg='white', padx=18, pady=6,
+                      command=self._merge)
+        b.pack(side=tk.RIGHT)
+        self.buttons.append(b)
+
+    def _show(self):
+        while self.index < len(self.pairs):
+            score, keep, dup, kind = self.pairs[self.index]
+            a, b = self.store.get_patient(keep), self.store.get_patient(dup)
+            if a and b:
+                break
+            self.index += 1          # one side was merged away already
+        else:
+            self.heading.config(text=f'Done — {self.merged} merged')
+            for cell in self.cells.values():
+                cell.config(text='')
+            return
+        self.heading.config(text=f'{kind.title()} ({score:.0%})   ·   '
+                                 f'{self.index + 1} of {len(self.pairs)}')
+        for field in self.FIELDS:
+            self.cells[field, 1].config(text=a[field] if a[field] not in (None, '') else '—')
+            self.cells[field, 2].config(text=b[field] if b[field] not in (None, '') else '—')
+
+    def _merge(self):
+        if self.index < len(self.pairs):
+            _, keep, dup, _ = self.pairs[self.index]
+            self._run([(keep, dup)], self.index + 1)
+        else:
+            self._skip()
+
+    def _skip(self):
+        self.index += 1
+        self._show()
+
+    def _merge_exact(self):
+        # Only name + phone matches; same-email pairs are reviewed one by one
+        pairs = [(keep, dup) for _, keep, dup, kind in self.pairs[self.index:]
+                 if kind == 'exact']
+        resume = next((i for i, p in enumerate(self.pairs) if p[3] != 'exact'),
+                      len(self.pairs))
+        self._run(pairs, max(resume, self.index))
+
+    def _run(self, pairs, resume):
+        # Buttons stay off until the worker is done, so no pair goes twice
+        for b in self.buttons:
+            b.config(state=tk.DISABLED)
+        self.tasks.submit(
+            self.merge, pairs,
+            lambda done, total: self.tasks.post(self._progress, done, total),
+            key='merge', on_done=lambda n: self._merged(n, resume),
+            on_error=lambda exc: self._merged(0, self.index, exc))
+
+    def _progress(self, done, total):
+        if self.winfo_exists():
+            self.heading.config(text=f'Merging…  {done:,} of {total:,}')
+
+    def _merged(self, n, resume, error=None):
+        if not self.winfo_exists():
+            return
+        self.merged += n
+        self.index = resume
+        for b in self.buttons:
+            b.config(state=tk.NORMAL)
+        self._show()
+        if error is not None:
+            self.heading.config(text=f'Merge failed: {error}')
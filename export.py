@@ -0,0 +1,180 @@
+# ============================================================
+#  Export — stream patients / appointments out of the store
+#  Smart Clinic Management System
+#  Rows travel as fixed-size chunks from a generator to a
+#  writer, so memory stays flat whatever the date range.
+# ============================================================
+
+import csv
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+CHUNK_ROWS = 10000
+
+APPOINTMENT_COLUMNS = ('appointment_id', 'patient_id', 'patient', 'doctor',
+                       'date', 'time', 'status', 'amount')
+PATIENT_COLUMNS = ('patient_id', 'name', 'age', 'phone', 'email', 'gender')
+
+# ── Columnar file layout (.ccol) ─────────────────────────────
+#   MAGIC
+#   one JSON line: {"columns": [...], "chunk_rows": N}
+#   chunks: <uint32 row count> then, per column,
+#           <uint32 byte length> <zlib(column block)>
+#   a row count of 0 ends the file
+#   column block: <uint32 length in characters> per row (all ones
+#           for NULL), then the UTF-8 text of the values run together
+# Lengths rather than separators, so a value may hold any character.
+# Each column is compressed on its own, so repeated doctors,
+# dates and statuses shrink to almost nothing.
+# Integers are little-endian.
+MAGIC = b'SCCOL2\n'
+_NULL = 0xFFFFFFFF
+_U32 = struct.Struct('<I')
+
+
+def _pack_column(values):
+    sizes, texts = array('I'), []
+    for v in values:
+        if v is None:
+            sizes.append(_NULL)
+        else:
+            v = str(v)
+            sizes.append(len(v))
+            texts.append(v)
+    if sys.byteorder == 'big':
+        sizes.byteswap()
+    return sizes.tobytes() + ''.join(texts).encode('utf-8')
+
+
+def _unpack_column(block, count):
+    sizes = array('I', block[:4 * count])
+    if sys.byteorder == 'big':
+        sizes.byteswap()
+    text = block[4 * count:].decode('utf-8')
+    values, pos = [], 0
+    for n in sizes:
+        if n == _NULL:
+            values.append(None)
+        else:
+            values.append(text[pos:pos + n])
+            pos += n
+    return values
+
+
+# ── Writers ──────────────────────────────────────────────────
+def write_csv(path, columns, chunks, on_chunk=None):
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+            if on_chunk and on_chunk(rows):
+                break
+    return rows
+
+
+def write_columnar(path, columns, chunks, on_chunk=None):
+    rows = 0
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(json.dumps({'columns': list(columns), 'chunk_rows': CHUNK_ROWS}).encode() + b'\n')
+        for chunk in chunks:
+            f.write(_U32.pack(len(chunk)))
+            for values in zip(*chunk):
+                data = zlib.compress(_pack_column(values), 6)
+                f.write(_U32.pack(len(data)))
+                f.write(data)
+            rows += len(chunk)
+            if on_chunk and on_chunk(rows):
+                break
+        f.write(_U32.pack(0))
+    return rows
+
+
+def read_columnar(path):
+    """Yield each chunk of a .ccol file as {column: [str | None, ...]}."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a Smart Clinic columnar file')
+        columns = json.loads(f.readline())['columns']
+        while True:
+            (count,) = _U32.unpack(f.read(4))
+            if count == 0:
+                return
+            chunk = {}
+            for name in columns:
+                (size,) = _U32.unpack(f.read(4))
+                chunk[name] = _unpack_column(zlib.decompress(f.read(size)), count)
+            yield chunk
+
+
+def _writer_for(path):
+    return write_columnar if os.path.splitext(path)[1].lower() == '.ccol' else write_csv
+
+
+def _write_whole(path, columns, chunks, on_chunk):
+    """
+    Write to `path`.part beside it, then move that over `path` once
+    every row is in.  A cancelled or failed export removes it, leaving
+    no truncated file (and an earlier export at `path` as it was).
+    Returns the row count, or None if on_chunk() stopped it.
+    """
+    part, stopped = path + '.part', []
+
+    def until_stopped(rows):
+        if on_chunk(rows):
+            stopped.append(rows)
+        return bool(stopped)
+    try:
+        rows = _writer_for(path)(part, columns, chunks, until_stopped)
+        if not stopped:
+            os.replace(part, path)
+            return rows
+    except BaseException:
+        _discard(part)
+        raise
+    _discard(part)
+    return None
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ── Exports ──────────────────────────────────────────────────
+def export_appointments(store, path, date_from, date_to,
+                        progress=None, should_stop=None):
+    """
+    Write appointments dated date_from..date_to (inclusive, YYYY-MM-DD)
+    to `path` — CSV, or columnar when the name ends in .ccol.
+    progress(done, total) is called after every chunk.  Returns the
+    row count, or None if should_stop() cancelled it (see _write_whole).
+    """
+    total = store.count_appointments_between(date_from, date_to)
+    chunks = store.appointment_rows(date_from, date_to, CHUNK_ROWS)
+    return _write_whole(path, APPOINTMENT_COLUMNS, chunks,
+                        _on_chunk(total, progress, should_stop))
+
+
+def export_patients(store, path, progress=None, should_stop=None):
+    total = store.count_patients()
+    chunks = store.patient_rows(CHUNK_ROWS)
+    return _write_whole(path, PATIENT_COLUMNS, chunks,
+                        _on_chunk(total, progress, should_stop))
+
+
+def _on_chunk(total, progress, should_stop):
+    def on_chunk(done):
+        if progress:
+            progress(done, total)
+        return bool(should_stop and should_stop())
+    return on_chunk
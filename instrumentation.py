@@ -0,0 +1,208 @@
+# ============================================================
+#  Instrumentation — which handler is making the UI slow?
+#  Smart Clinic Management System
+#  Every bind callback, widget command and after() callback
+#  goes through tk.Misc._register.  When instrumentation is on,
+#  that method is wrapped so each handler is timed; when it is
+#  off nothing is patched, so it costs nothing.
+#
+#  SMARTCLINIC_INSTRUMENT=1          turn it on for smartclinic.py
+#  SMARTCLINIC_TRACE=trace.json      also write a Chrome trace on exit
+#                                    (open in chrome://tracing or Perfetto)
+# ============================================================
+
+import json
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+HEARTBEAT_MS = 50          # how often the event loop is pinged
+STALL_MS = 100             # a handler or heartbeat gap longer than this is a stall
+TRACE_EVENTS = 200_000     # newest trace events kept
+
+_original_register = None
+_active = None             # the installed Instrumentation, if any
+
+
+# ── Histograms ───────────────────────────────────────────────
+class Histogram:
+    """Durations in power-of-two microsecond buckets (1, 2, 4 … µs)."""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * 32
+
+    def add(self, us):
+        self.count += 1
+        self.total += us
+        if us > self.max:
+            self.max = us
+        self.buckets[min(int(us).bit_length(), 31)] += 1
+
+    def percentile(self, p):
+        """Upper bound (µs) of the bucket holding the p-th percentile."""
+        wanted, seen = self.count * p / 100, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= wanted:
+                return min(1 << i, self.max)
+        return 0
+
+    def as_dict(self):
+        return {'count': self.count, 'mean_us': self.total / self.count if self.count else 0,
+                'p50_us': self.percentile(50), 'p99_us': self.percentile(99),
+                'max_us': self.max}
+
+
+def handler_name(func):
+    """'TopBar._search_focus_in', or 'after:_poll' for after() callbacks."""
+    qualname = getattr(func, '__qualname__', None) or repr(func)
+    if qualname.endswith('after.<locals>.callit'):
+        return 'after:' + getattr(func, '__name__', '?')
+    return qualname
+
+
+# ── The instrumentation ──────────────────────────────────────
+class Instrumentation:
+    def __init__(self, stall_ms=STALL_MS, trace=False, on_stall=None):
+        self.stall_us = stall_ms * 1000
+        self.histograms = {}
+        self.latency = Histogram()          # heartbeat lateness
+        self.stalls = deque(maxlen=1000)    # (ts_us, kind, name, dur_us)
+        self.events = deque(maxlen=TRACE_EVENTS) if trace else None
+        self.on_stall = on_stall
+        self.t0 = time.perf_counter_ns()
+        self._main = threading.main_thread().ident
+        self._beat = None
+
+    def wrap(self, func):
+        name = handler_name(func)
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                end = clock()
+                self._record(name, hist, start, end)
+        timed.__name__ = getattr(func, '__name__', 'handler')
+        return timed
+
+    def _record(self, name, hist, start, end):
+        us = (end - start) // 1000
+        hist.add(us)
+        if self.events is not None:
+            self.events.append((name, (start - self.t0) // 1000, us))
+        if us >= self.stall_us:
+            self._stall('handler', name, start, us)
+
+    def _stall(self, kind, name, start, us):
+        self.stalls.append(((start - self.t0) // 1000, kind, name, us))
+        if self.on_stall:
+            self.on_stall(kind, name, us / 1000)
+
+    # ── Heartbeat ────────────────────────────────────────────
+    def start_heartbeat(self, root, interval_ms=HEARTBEAT_MS):
+        """Ping the event loop; lateness of each ping is mainloop latency."""
+        clock = time.perf_counter_ns
+        interval_ns = interval_ms * 1_000_000
+
+        def _heartbeat(expected):          # never timed itself, see install()
+            late = max(0, clock() - expected) // 1000
+            self.latency.add(late)
+            if late >= self.stall_us:
+                self._stall('loop', 'event loop blocked', expected, late)
+            self._beat = root.after(interval_ms, _heartbeat, clock() + interval_ns)
+        self._beat = root.after(interval_ms, _heartbeat, clock() + interval_ns)
+
+    # ── Reports ──────────────────────────────────────────────
+    def summary(self):
+        handlers = {name: h.as_dict() for name, h in self.histograms.items() if h.count}
+        return {'handlers': dict(sorted(handlers.items(), key=lambda kv: -kv[1]['max_us'])),
+                'mainloop_latency': self.latency.as_dict(),
+                'stalls': [{'at_us': at, 'kind': k, 'name': n, 'ms': us / 1000}
+                           for at, k, n, us in self.stalls]}
+
+    def report(self, top=15):
+        lines = [f'{"handler":<48} {"calls":>7} {"mean ms":>8} {"p99 ms":>8} {"max ms":>8}']
+        for name, h in list(self.summary()['handlers'].items())[:top]:
+            lines.append(f'{name[:48]:<48} {h["count"]:7} {h["mean_us"] / 1000:8.2f} '
+                         f'{h["p99_us"] / 1000:8.2f} {h["max_us"] / 1000:8.2f}')
+        lat = self.latency.as_dict()
+        lines.append(f'event loop latency: p50 {lat["p50_us"] / 1000:.1f} ms, '
+                     f'p99 {lat["p99_us"] / 1000:.1f} ms, max {lat["max_us"] / 1000:.1f} ms, '
+                     f'{len(self.stalls)} stalls')
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path):
+        """Write the recorded handler runs and stalls as Chrome trace JSON."""
+        events = [{'name': name, 'cat': 'handler', 'ph': 'X', 'ts': ts, 'dur': dur,
+                   'pid': 1, 'tid': self._main}
+                  for name, ts, dur in (self.events or ())]
+        events += [{'name': f'stall: {name}', 'cat': kind, 'ph': 'i', 's': 'g',
+                    'ts': at, 'pid': 1, 'tid': self._main}
+                   for at, kind, name, _ in self.stalls]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+# ── Install / uninstall ──────────────────────────────────────
+def install(root=None, stall_ms=STALL_MS, trace=False, on_stall=None):
+    """
+    Start timing every Tk callback registered from now on.  With a
+    root, also start the heartbeat.  Returns the Instrumentation.
+    """
+    global _original_register, _active
+    if _active is not None:
+        return _active
+    inst = Instrumentation(stall_ms, trace, on_stall)
+    _original_register = tk.Misc._register
+
+    def _register(self, func, subst=None, needcleanup=1):
+        if getattr(func, '__name__', None) != '_heartbeat':
+            func = inst.wrap(func)
+        return _original_register(self, func, subst, needcleanup)
+
+    tk.Misc._register = _register
+    _active = inst
+    if root is not None:
+        inst.start_heartbeat(root)
+    return inst
+
+
+def uninstall():
+    """Stop wrapping new callbacks (already wrapped ones keep timing)."""
+    global _original_register, _active
+    if _original_register is not None:
+        tk.Misc._register = _original_register
+    _original_register = _active = None
+
+
+def install_from_env(root):
+    """install() if SMARTCLINIC_INSTRUMENT is set; otherwise None and no cost."""
+    if not os.environ.get('SMARTCLINIC_INSTRUMENT'):
+        return None
+    return install(root, trace=bool(os.environ.get('SMARTCLINIC_TRACE')),
+                   on_stall=lambda kind, name, ms: print(
+                       f'[stall] {name}: {ms:.0f} ms', file=sys.stderr))
+
+
+def finish_from_env(inst):
+    """Print the report and write the trace, if instrumentation was on."""
+    if inst is None:
+        return
+    print(inst.report(), file=sys.stderr)
+    path = os.environ.get('SMARTCLINIC_TRACE')
+    if path:
+        inst.export_chrome_trace(path)
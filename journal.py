@@ -0,0 +1,193 @@
+# ============================================================
+#  Journal — append-only write log with group commit
+#  Smart Clinic Management System
+#  Each save appends one line to a log and waits for it to reach
+#  the disk.  The first save to wait does the fsync itself, for
+#  every line queued by then; saves arriving meanwhile queue up and
+#  share the next one.  A lone writer pays one fsync per save, with
+#  no thread handoff and no wait — group commit only helps when
+#  saves overlap.  A sync waits for more saves only if the last one
+#  carried several, and no longer than an fsync has been taking.
+# ============================================================
+
+import json
+import os
+import threading
+import time
+from zlib import crc32
+
+WINDOW = 0.002             # most a sync waits for more saves to join it
+BATCH = 64                 # ... or until this many are waiting (the app has 4 workers)
+
+
+class JournalError(Exception):
+    """The journal could not be written; the save is not durable."""
+
+
+def _encode(op, data):
+    payload = json.dumps([op, data], separators=(',', ':')).encode()
+    return b'%08x %s\n' % (crc32(payload), payload)
+
+
+def _decode(line):
+    if not line.endswith(b'\n') or line[8:9] != b' ':
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != crc32(payload):
+            return None
+        op, data = json.loads(payload)
+    except ValueError:
+        return None
+    return op, data
+
+
+class Journal:
+    """
+    One line per mutation: "<crc32> <json [op, data]>".
+
+    append() returns a sequence number; wait(seq) blocks until that
+    line is on disk.  records() reads back what survived a crash —
+    a torn last line fails its checksum and is cut off.  clear() is
+    for checkpoints: once the store has synced its own files the
+    journal starts over, empty.
+    """
+
+    def __init__(self, path, window=WINDOW, batch=BATCH):
+        self.path = path
+        self.window = window
+        self.batch = batch
+        self.syncs = 0                 # fsyncs done (benchmarks read it)
+        self.sync_time = window        # recent fsync duration, smoothed
+        self._last_batch = 0           # lines in the previous sync
+
+        self._file = open(path, 'ab')
+        self.size = self._file.tell()
+        self._cond = threading.Condition()
+        self._io = threading.Lock()    # held while lines go to disk
+        self._lines = []               # encoded, not yet written
+        self._first = 0.0              # when the oldest of them arrived
+        self._expect = batch           # lines the leader is waiting for
+        self._syncing = False          # a leader is gathering or syncing
+        self._appended = 0             # seq of the last append
+        self._durable = 0              # seq of the last line on disk
+        self._generation = 0           # bumped by clear()
+        self._error = None
+        self._closed = False
+
+    # ── Reading back ─────────────────────────────────────────
+    def records(self):
+        """[(op, data)] of every intact line; a torn tail is truncated."""
+        out, good = [], 0
+        with self._io, open(self.path, 'rb') as f:
+            for line in f:
+                record = _decode(line)
+                if record is None:
+                    break
+                out.append(record)
+                good += len(line)
+            if good < self.size:
+                self._file.truncate(good)
+                self.size = good
+        return out
+
+    # ── Writing ──────────────────────────────────────────────
+    def append(self, op, data):
+        """Queue one mutation; returns its sequence number for wait()."""
+        line = _encode(op, data)
+        with self._cond:
+            if self._closed:
+                raise JournalError('journal is closed')
+            if not self._lines:
+                self._first = time.monotonic()
+            self._lines.append(line)
+            self._appended += 1
+            if len(self._lines) >= self._expect:
+                self._cond.notify_all()
+            return self._appended
+
+    def wait(self, seq):
+        """
+        Block until line `seq` is on disk (or the journal failed).
+        A waiter that finds no sync under way leads one for every line
+        queued by then; the others wait for it, queueing up the next.
+        """
+        with self._cond:
+            while self._durable < seq:
+                if self._error is not None:
+                    raise JournalError(f'journal write failed: {self._error}')
+                if self._syncing:
+                    self._cond.wait()
+                else:
+                    self._lead()
+
+    def clear(self):
+        """Empty the journal; the caller has made every logged change durable."""
+        with self._io, self._cond:
+            self._lines = []
+            self._generation += 1
+            self._durable = self._appended
+            self._file.truncate(0)
+            os.fsync(self._file.fileno())
+            self.size = 0
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            last = self._appended
+        try:
+            self.wait(last)
+        except JournalError:
+            pass                       # the saves it lost have raised it
+        finally:
+            with self._io:
+                self._file.close()
+
+    def _lead(self):
+        # Called holding _cond; lets go of it while the lines go to disk
+        self._syncing = True
+        try:
+            # Let more saves join this sync, up to `window` after the first
+            due = self._first + min(self.window, self.sync_time)
+            self._expect = min(self._last_batch, self.batch)
+            while len(self._lines) < self._expect and not self._closed:
+                left = due - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            self._expect = self.batch
+            lines, self._lines = self._lines, []
+            self._last_batch = len(lines)
+            last, generation = self._appended, self._generation
+            self._cond.release()
+            try:
+                error = self._write(lines, generation)
+            finally:
+                self._cond.acquire()
+            if error is not None:
+                self._error = error
+            else:
+                self._durable = max(self._durable, last)
+        finally:
+            self._syncing = False
+            self._cond.notify_all()
+
+    def _write(self, lines, generation):
+        """Write and fsync `lines`; returns the OSError if that failed."""
+        with self._io:
+            if generation != self._generation:     # cleared meanwhile
+                return None
+            data = b''.join(lines)
+            started = time.monotonic()
+            try:
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as exc:
+                return exc
+            took = time.monotonic() - started
+            self.sync_time += (took - self.sync_time) / 4
+            self.syncs += 1
+            self.size += len(data)
+        return None
@@ -0,0 +1,171 @@
+# ============================================================
+#  List View — virtualized table for patients & appointments
+#  Smart Clinic Management System
+#  Only the rows that fit on screen exist as widgets; scrolling
+#  just changes which records those rows display.
+# ============================================================
+
+import tkinter as tk
+from collections import OrderedDict
+
+COLORS = {
+    'card':    '#ffffff',
+    'stripe':  '#f7f9fc',
+    'header':  '#f0f4f8',
+    'text':    '#1e2d40',
+    'muted':   '#8a99b0',
+    'border':  '#dde3ef',
+}
+
+FONTS = {
+    'header': ('Segoe UI', 9, 'bold'),
+    'row':    ('Segoe UI', 10),
+}
+
+ROW_HEIGHT = 30
+BLOCK_SIZE = 100          # rows fetched from the store per request
+MAX_BLOCKS = 20           # blocks kept in the page cache
+
+# (field, heading, width in characters)
+PATIENT_COLUMNS = [
+    ('id',     'ID',     7),
+    ('name',   'Name',   26),
+    ('age',    'Age',    5),
+    ('gender', 'Gender', 8),
+    ('phone',  'Phone',  16),
+    ('email',  'Email',  28),
+]
+
+APPOINTMENT_COLUMNS = [
+    ('date',    'Date',    11),
+    ('time',    'Time',    7),
+    ('patient', 'Patient', 24),
+    ('doctor',  'Doctor',  20),
+    ('status',  'Status',  11),
+]
+
+
+class VirtualTable(tk.Frame):
+    """
+    A table that can show millions of rows with a fixed number of widgets.
+
+    row_count()            -> total number of rows
+    fetch(offset, limit)   -> list of row dicts starting at `offset`
+    """
+
+    def __init__(self, parent, columns, row_count, fetch):
+        super().__init__(parent, bg=COLORS['card'])
+        self.columns = columns
+        self.row_count = row_count
+        self.fetch = fetch
+
+        self.total = 0
+        self.top = 0                 # index of the first visible row
+        self.rows = []               # recycled row widgets
+        self._blocks = OrderedDict() # block number -> list of row dicts
+        self._build()
+        self.refresh()
+
+    def _build(self):
+        # Header
+        header = tk.Frame(self, bg=COLORS['header'])
+        header.pack(fill=tk.X)
+        for _, heading, width in self.columns:
+            tk.Label(header, text=heading.upper(), width=width, anchor='w',
+                     font=FONTS['header'], fg=COLORS['muted'],
+                     bg=COLORS['header']).pack(side=tk.LEFT, padx=(12, 0), pady=6)
+        tk.Frame(self, bg=COLORS['border'], height=1).pack(fill=tk.X)
+
+        # Scrollbar drives `top`, not a scrolled canvas
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                      command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.body = tk.Frame(self, bg=COLORS['card'])
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.body.pack_propagate(False)
+        self.body.bind('<Configure>', self._on_resize)
+        self._bind_wheel(self.body)
+
+    # ── Row pool ─────────────────────────────────────────────
+    def _make_row(self, i):
+        bg = COLORS['stripe'] if i % 2 else COLORS['card']
+        frame = tk.Frame(self.body, bg=bg, height=ROW_HEIGHT)
+        frame.pack_propagate(False)
+        frame.place(x=0, y=i * ROW_HEIGHT, relwidth=1, height=ROW_HEIGHT)
+        cells = []
+        for _, _, width in self.columns:
+            lbl = tk.Label(frame, width=width, anchor='w', font=FONTS['row'],
+                           fg=COLORS['text'], bg=bg)
+            lbl.pack(side=tk.LEFT, padx=(12, 0))
+            self._bind_wheel(lbl)
+            cells.append(lbl)
+        self._bind_wheel(frame)
+        return cells
+
+    def _on_resize(self, e):
+        needed = e.height // ROW_HEIGHT + 1
+        while len(self.rows) < needed:
+            self.rows.append(self._make_row(len(self.rows)))
+        self._render()
+
+    # ── Scrolling ────────────────────────────────────────────
+    def _bind_wheel(self, w):
+        w.bind('<MouseWheel>', lambda e: self.scroll_by(-1 if e.delta > 0 else 1, 'units'))
+        w.bind('<Button-4>',   lambda e: self.scroll_by(-1, 'units'))
+        w.bind('<Button-5>',   lambda e: self.scroll_by(1, 'units'))
+
+    def _visible(self):
+        return max(1, self.body.winfo_height() // ROW_HEIGHT)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self.total))
+        else:
+            self.scroll_by(int(amount), unit)
+
+    def scroll_by(self, amount, unit='units'):
+        step = 3 if unit == 'units' else self._visible()
+        self.scroll_to(self.top + amount * step)
+
+    def scroll_to(self, index):
+        index = max(0, min(index, self.total - self._visible()))
+        if index != self.top:
+            self.top = index
+            self._render()
+
+    # ── Data ─────────────────────────────────────────────────
+    def refresh(self):
+        """Re-read the row count and drop cached pages."""
+        self.total = self.row_count()
+        self._blocks.clear()
+        self.top = max(0, min(self.top, self.total - 1))
+        self._render()
+
+    def _row(self, index):
+        block_no = index // BLOCK_SIZE
+        block = self._blocks.get(block_no)
+        if block is None:
+            block = self.fetch(block_no * BLOCK_SIZE, BLOCK_SIZE)
+            self._blocks[block_no] = block
+            if len(self._blocks) > MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_no)
+        offset = index - block_no * BLOCK_SIZE
+        return block[offset] if offset < len(block) else None
+
+    def _render(self):
+        for i, cells in enumerate(self.rows):
+            index = self.top + i
+            record = self._row(index) if index < self.total else None
+            for (field, _, _), lbl in zip(self.columns, cells):
+                value = '' if record is None else record.get(field)
+                lbl.config(text='' if value is None else value)
+
+        if self.total:
+            first = self.top / self.total
+            last = min(1.0, (self.top + self._visible()) / self.total)
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0, 1)
@@ -0,0 +1,78 @@
+# ============================================================
+#  Profiling — where startup time goes
+#  Smart Clinic Management System
+#  Set SMARTCLINIC_PROFILE_STARTUP=1 to print the report once
+#  the app has finished loading.
+# ============================================================
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+FIRST_FRAME_BUDGET_MS = 200
+
+# Taken when this module is first imported; smartclinic imports it
+# early, so the first phase covers the rest of its imports.
+IMPORTED_AT = time.perf_counter()
+
+
+class StartupProfiler:
+    """
+    Collects named phases (from any thread) and milestones such as
+    'first frame' and 'ready', all measured from `start`.
+    """
+
+    def __init__(self, start=IMPORTED_AT, budget_ms=FIRST_FRAME_BUDGET_MS):
+        self.start = start
+        self.budget_ms = budget_ms
+        self.phases = []        # (name, thread, started ms, duration ms)
+        self.marks = {}         # milestone -> ms since start
+        self._lock = threading.Lock()
+
+    def _ms(self, t=None):
+        return ((time.perf_counter() if t is None else t) - self.start) * 1000
+
+    def add(self, name, started, ended):
+        with self._lock:
+            self.phases.append((name, threading.current_thread().name,
+                                self._ms(started), (ended - started) * 1000))
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, t, time.perf_counter())
+
+    def mark(self, name):
+        with self._lock:
+            self.marks.setdefault(name, self._ms())
+
+    def over_budget(self):
+        first = self.marks.get('first frame')
+        return first is not None and first > self.budget_ms
+
+    def as_dict(self):
+        return {'phases': [{'name': n, 'thread': t, 'at_ms': round(at, 2), 'ms': round(ms, 2)}
+                           for n, t, at, ms in self.phases],
+                'marks': {k: round(v, 2) for k, v in self.marks.items()},
+                'budget_ms': self.budget_ms}
+
+    def report(self):
+        lines = ['Startup profile (ms since start)']
+        for name, thread, at, ms in sorted(self.phases, key=lambda p: p[2]):
+            lines.append(f'  {at:9.1f}  {ms:9.1f}  {name:<28} [{thread}]')
+        for name, at in sorted(self.marks.items(), key=lambda m: m[1]):
+            lines.append(f'  {at:9.1f}  {"":9}  ▸ {name}')
+        if 'first frame' in self.marks:
+            verdict = 'OVER' if self.over_budget() else 'within'
+            lines.append(f'  first frame {verdict} the {self.budget_ms} ms budget')
+        return '\n'.join(lines)
+
+
+def report_if_enabled(profiler, stream=None):
+    if os.environ.get('SMARTCLINIC_PROFILE_STARTUP'):
+        print(profiler.report(), file=stream or sys.stderr)
@@ -0,0 +1,84 @@
+# ============================================================
+#  Queries — keyset pagination over the clinic tables
+#  Smart Clinic Management System
+#  "LIMIT 100 OFFSET 900000" makes SQLite step over 900,000 rows
+#  to throw them away.  Here a page starts from the sort key of
+#  the row before it ("WHERE (name, patient_id) > (?, ?)"), which
+#  the index finds directly, so every page costs the same.
+# ============================================================
+
+# Compiled statements sqlite3 keeps per connection.  Every query
+# below has fixed SQL text (values go in as parameters), so after
+# the first call each one is found in that cache instead of being
+# parsed and planned again.
+STATEMENT_CACHE = 256
+
+
+class Keyset:
+    """
+    One table read in one fixed order.  `key` lists the SQL
+    expressions of the sort key; it must end in a unique column and
+    be covered by an index, so a seek is one index lookup.
+
+    page() gives the (sql, args) of a page, for callers that run
+    queries their own way (the API's connection pool); after() and
+    walk() run them through a `query(sql, args) -> rows` function.
+    """
+
+    def __init__(self, table, columns, key):
+        self.table = table
+        self.columns = tuple(columns)
+        self.key = tuple(key)
+        cols = ', '.join(self.columns + self.key)     # keys ride along at the end
+        order = ', '.join(self.key)
+        seek = f'({order}) > ({", ".join("?" * len(self.key))})'
+        upto = f'{self.key[0]} <= ?'
+        base = f'SELECT {cols} FROM {table}'
+        self.sql_first = f'{base} ORDER BY {order} LIMIT ?'
+        self.sql_after = f'{base} WHERE {seek} ORDER BY {order} LIMIT ?'
+        # Same, stopping after a last value of the leading key
+        self.sql_first_upto = f'{base} WHERE {upto} ORDER BY {order} LIMIT ?'
+        self.sql_after_upto = f'{base} WHERE {seek} AND {upto} ORDER BY {order} LIMIT ?'
+
+    def page(self, key, limit, upto=None):
+        """(sql, args) for the `limit` rows following `key` (None: from the start),
+        up to `upto` in the leading key column if given."""
+        args = () if key is None else tuple(key)
+        if upto is None:
+            return (self.sql_first if key is None else self.sql_after), args + (limit,)
+        return (self.sql_first_upto if key is None else self.sql_after_upto), args + (upto, limit)
+
+    def split(self, rows):
+        """(rows without their key columns, key of the last row or None)."""
+        n = len(self.columns)
+        return [r[:n] for r in rows], (tuple(rows[-1][n:]) if rows else None)
+
+    def after(self, query, key, limit, upto=None):
+        """(rows, last key) of the `limit` rows following `key`."""
+        return self.split(query(*self.page(key, limit, upto)))
+
+    def walk(self, query, key=None, chunk=5000, upto=None):
+        """Yield lists of up to `chunk` rows following `key`, to the end."""
+        while True:
+            rows, key = self.after(query, key, chunk, upto)
+            if not rows:
+                return
+            yield rows
+
+
+# The clinic's orders; each is served by an index in clinic_store.SCHEMA
+PATIENT_COLUMNS = ('patient_id', 'name', 'age', 'phone', 'email', 'gender')
+APPOINTMENT_COLUMNS = ('appointment_id', 'patient_id', 'patient', 'doctor',
+                       'date', 'time', 'status', 'amount')
+
+PATIENTS_BY_ID = Keyset('patients', PATIENT_COLUMNS, ('patient_id',))
+PATIENTS_BY_NAME = Keyset('patients', PATIENT_COLUMNS, ('name', 'patient_id'))
+APPOINTMENTS_BY_ID = Keyset('appointments', APPOINTMENT_COLUMNS, ('appointment_id',))
+# ifnull: a NULL time would make the row comparison NULL and lose rows
+APPOINTMENTS_BY_DATE = Keyset('appointments', APPOINTMENT_COLUMNS,
+                              ('date', "ifnull(time, '')", 'appointment_id'))
+
+
+def first_on(date):
+    """APPOINTMENTS_BY_DATE key just before the first appointment on `date`."""
+    return (date, '', 0)
@@ -0,0 +1,437 @@
+# ============================================================
+#  Records — compact in-memory patients & appointments
+#  Smart Clinic Management System
+#  A dict per record costs several hundred bytes.  Here each
+#  field is a column: arrays of small ints, repeated strings
+#  (gender, status, doctor, dates) stored once and referenced
+#  by code, free text packed as UTF-8 in one bytearray.
+# ============================================================
+
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+NO_AGE = 255               # age column value meaning "unknown"
+NO_AMOUNT = float('nan')   # amount column value meaning "no fee recorded"
+_NONE_SIZE = 0xFFFF        # TextColumn size meaning None
+
+
+# ── Single records ───────────────────────────────────────────
+class _Record:
+    """Slotted record that still reads like the dialogs' dicts."""
+
+    __slots__ = ()
+
+    def __init__(self, *values, **fields):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+        for name in self.__slots__[len(values):]:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()})'
+
+
+class Patient(_Record):
+    __slots__ = ('id', 'name', 'age', 'phone', 'email', 'gender')
+
+
+class Appointment(_Record):
+    __slots__ = ('id', 'patient_id', 'patient', 'doctor', 'date', 'time', 'status', 'amount')
+
+
+# ── Columns ──────────────────────────────────────────────────
+class TextColumn:
+    """Strings packed as UTF-8 into one bytearray (start + size per row)."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.starts = array('I')
+        self.sizes = array('H')
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _pack(self, value):
+        if value is None:
+            return 0, _NONE_SIZE
+        raw = str(value).encode('utf-8')
+        if len(raw) >= _NONE_SIZE:
+            # Cut on a character boundary, not inside a multi-byte one
+            end = _NONE_SIZE - 1
+            while raw[end] & 0xC0 == 0x80:
+                end -= 1
+            raw = raw[:end]
+        start = len(self.data)
+        self.data += raw
+        return start, len(raw)
+
+    def append(self, value):
+        start, size = self._pack(value)
+        self.starts.append(start)
+        self.sizes.append(size)
+
+    def set(self, row, value):
+        # the old bytes stay behind; rows are rarely rewritten
+        self.starts[row], self.sizes[row] = self._pack(value)
+
+    def __getitem__(self, row):
+        size = self.sizes[row]
+        if size == _NONE_SIZE:
+            return None
+        start = self.starts[row]
+        return self.data[start:start + size].decode('utf-8')
+
+    def contains(self, row, needle):
+        """True if the bytes `needle` occur in this row's value (no copy)."""
+        start = self.starts[row]
+        size = self.sizes[row]
+        return size != _NONE_SIZE and self.data.find(needle, start, start + size) != -1
+
+
+class CodeColumn:
+    """Repeated strings stored once; each row holds a small-int code."""
+
+    _WIDER = {'B': 'H', 'H': 'I'}
+
+    def __init__(self, typecode='B'):
+        self.values = []
+        self._code = {}
+        self.codes = array(typecode)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def code(self, value):
+        code = self._code.get(value)
+        if code is None:
+            code = self._code[value] = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+
+    def append(self, value):
+        code = self.code(value)
+        try:
+            self.codes.append(code)
+        except OverflowError:
+            self.codes = array(self._WIDER[self.codes.typecode], self.codes)
+            self.codes.append(code)
+
+    def set(self, row, value):
+        self.codes[row] = self.code(value)   # codes only grow on append
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def take(self, rows):
+        """Values of `rows`, without a method call per row."""
+        values, codes = self.values, self.codes
+        return [values[codes[row]] for row in rows]
+
+    def counts(self, skip=()):
+        """{value: rows}, leaving out the rows in `skip`."""
+        by_code = Counter(self.codes)
+        for row in skip:
+            by_code[self.codes[row]] -= 1
+        return Counter({self.values[c]: n for c, n in by_code.items() if n})
+
+
+class _SortKeys:
+    """Read-only sequence of sort keys over `order`, for bisect."""
+
+    def __init__(self, order, key):
+        self.order, self.key = order, key
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.key(self.order[i])
+
+
+# ── Tables ───────────────────────────────────────────────────
+class _Table:
+    """
+    Rows are appended and never move; `order` lists live rows in
+    list-view order.  Removed rows are remembered in `dead` and
+    skipped everywhere.
+    """
+
+    record = None
+
+    def __init__(self):
+        self.ids = array('I')
+        self.order = array('I')
+        self.dead = set()
+
+    def __len__(self):
+        return len(self.ids) - len(self.dead)
+
+    def append(self, record):
+        row = len(self.ids)
+        self.ids.append(record.get('id') or 0)
+        self._append(record)
+        return row
+
+    def extend(self, records, place=True):
+        """
+        Append many records, then merge them into `order` in one pass.
+        With place=False they are left out of `order`; call resort()
+        once after a series of loads.
+        """
+        first = len(self.ids)
+        for r in records:
+            self.append(r)
+        if place:
+            new = sorted(range(first, len(self.ids)), key=self.sort_key)
+            self.order = self._merge(new)
+        return range(first, len(self.ids))
+
+    def resort(self):
+        live = (row for row in range(len(self.ids)) if row not in self.dead)
+        self.order = array('I', sorted(live, key=self.sort_key))
+
+    def _merge(self, new):
+        # Two sorted runs: a bisect per new row, slices copied between
+        keys = _SortKeys(self.order, self.sort_key)
+        out, lo = array('I'), 0
+        for row in new:
+            pos = bisect_right(keys, self.sort_key(row), lo)
+            out.extend(self.order[lo:pos])
+            out.append(row)
+            lo = pos
+        out.extend(self.order[lo:])
+        return out
+
+    def place(self, row):
+        """Insert an appended row into `order`."""
+        keys = _SortKeys(self.order, self.sort_key)
+        self.order.insert(bisect_right(keys, self.sort_key(row)), row)
+
+    def _unplace(self, row):
+        keys = _SortKeys(self.order, self.sort_key)
+        pos = bisect_left(keys, self.sort_key(row))
+        if pos < len(self.order) and self.order[pos] == row:
+            del self.order[pos]
+        else:
+            self.order.remove(row)
+
+    def row_of(self, record_id):
+        # ids arrive in ascending order almost always; fall back to a scan
+        pos = bisect_left(self.ids, record_id)
+        if pos < len(self.ids) and self.ids[pos] == record_id and pos not in self.dead:
+            return pos
+        for row, rid in enumerate(self.ids):
+            if rid == record_id and row not in self.dead:
+                return row
+        return None
+
+    def remove(self, row):
+        self._unplace(row)
+        self.dead.add(row)
+
+    def update(self, row, record):
+        self._unplace(row)
+        self._set(row, record)
+        self.place(row)
+
+    def page(self, offset, limit):
+        """Records at positions offset.. of the list order."""
+        return [self.get(row) for row in self.order[offset:offset + limit]]
+
+    def take(self, rows, fields):
+        """Tuples of `fields` for `rows`, read column by column (no records built)."""
+        columns = []
+        for name in fields:
+            column = self.ids if name == 'id' else getattr(self, name)
+            take = getattr(column, 'take', None)
+            columns.append(take(rows) if take else [column[row] for row in rows])
+        return list(zip(*columns))
+
+    def get(self, row):
+        return self.record(self.ids[row], *(col[row] for col in self._columns()))
+
+
+class PatientTable(_Table):
+    record = Patient
+
+    def __init__(self):
+        super().__init__()
+        self.name = TextColumn()
+        self.age = array('B')
+        self.phone = TextColumn()
+        self.email = TextColumn()
+        self.gender = CodeColumn('B')
+
+    def _columns(self):
+        return (self.name, _AgeView(self.age), self.phone, self.email, self.gender)
+
+    def _append(self, p):
+        self.name.append(p.get('name'))
+        self.age.append(_age_code(p.get('age')))
+        self.phone.append(p.get('phone'))
+        self.email.append(p.get('email'))
+        self.gender.append(p.get('gender'))
+
+    def _set(self, row, p):
+        self.name.set(row, p.get('name'))
+        self.age[row] = _age_code(p.get('age'))
+        self.phone.set(row, p.get('phone'))
+        self.email.set(row, p.get('email'))
+        self.gender.set(row, p.get('gender'))
+
+    def sort_key(self, row):
+        return self.name[row] or '', self.ids[row]
+
+    def age_counts(self):
+        counts = Counter(self.age)
+        for row in self.dead:
+            counts[self.age[row]] -= 1
+        return Counter({(None if a == NO_AGE else a): n for a, n in counts.items() if n})
+
+
+class AppointmentTable(_Table):
+    record = Appointment
+
+    def __init__(self):
+        super().__init__()
+        self.patient_id = array('I')          # 0 = not linked
+        self.patient = CodeColumn('I')
+        self.doctor = CodeColumn('H')
+        self.date = CodeColumn('H')
+        self.time = CodeColumn('B')
+        self.status = CodeColumn('B')
+        self.amount = array('d')              # NaN = no fee recorded
+
+    def _columns(self):
+        return (_IdView(self.patient_id), self.patient, self.doctor,
+                self.date, self.time, self.status, _AmountView(self.amount))
+
+    def _append(self, a):
+        self.patient_id.append(a.get('patient_id') or 0)
+        self.patient.append(a.get('patient'))
+        self.doctor.append(a.get('doctor'))
+        self.date.append(a.get('date'))
+        self.time.append(a.get('time'))
+        self.status.append(a.get('status'))
+        self.amount.append(_amount_code(a.get('amount')))
+
+    def _set(self, row, a):
+        self.patient_id[row] = a.get('patient_id') or 0
+        for name in ('patient', 'doctor', 'date', 'time', 'status'):
+            getattr(self, name).set(row, a.get(name))
+        self.amount[row] = _amount_code(a.get('amount'))
+
+    def sort_key(self, row):
+        return self.date[row] or '', self.time[row] or '', self.ids[row]
+
+    def rows_between(self, first, last):
+        """Rows dated `first`..`last` (ISO dates, inclusive), in list order."""
+        keys = _SortKeys(self.order, lambda row: self.date[row] or '')
+        return self.order[bisect_left(keys, first):bisect_right(keys, last)]
+
+    def relink(self, moves):
+        """
+        Point appointments at the patients they were merged into:
+        `moves` is {dropped id: kept id}, relinked in one pass.
+        """
+        final = {}
+        for drop_id, keep_id in moves.items():
+            while keep_id in moves:         # A <- B, then B <- C
+                keep_id = moves[keep_id]
+            final[drop_id] = keep_id
+        ids = self.patient_id
+        for row, pid in enumerate(ids):
+            keep_id = final.get(pid)
+            if keep_id is not None:
+                ids[row] = keep_id
+
+
+class _AgeView:
+    def __init__(self, ages):
+        self.ages = ages
+
+    def __getitem__(self, row):
+        age = self.ages[row]
+        return None if age == NO_AGE else age
+
+
+class _IdView:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __getitem__(self, row):
+        return self.ids[row] or None
+
+
+class _AmountView:
+    def __init__(self, amounts):
+        self.amounts = amounts
+
+    def __getitem__(self, row):
+        amount = self.amounts[row]
+        return None if amount != amount else amount
+
+
+def _amount_code(amount):
+    return NO_AMOUNT if amount is None else float(amount)
+
+
+def _age_code(age):
+    return age if isinstance(age, int) and 0 <= age < NO_AGE else NO_AGE
+
+
+# ── Both tables, with one lock ───────────────────────────────
+class ClinicRecords:
+    """
+    The in-memory copy of the store that search, the dashboard and the
+    list views read.  SearchIndex writes to it under `lock`; the list
+    views read pages under the same lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.patients = PatientTable()
+        self.appointments = AppointmentTable()
+        # Bumped once the tables hold a change (see views.ViewManager)
+        self.versions = {'patients': 0, 'appointments': 0}
+
+    def patient_count(self):
+        with self.lock:
+            return len(self.patients)
+
+    def appointment_count(self):
+        with self.lock:
+            return len(self.appointments)
+
+    def patient_page(self, offset, limit):
+        with self.lock:
+            return self.patients.page(offset, limit)
+
+    def appointment_page(self, offset, limit):
+        with self.lock:
+            return self.appointments.page(offset, limit)
+
+    def appointments_between(self, first, last, fields):
+        """Tuples of `fields` for the appointments dated first..last."""
+        with self.lock:
+            table = self.appointments
+            return table.take(table.rows_between(first, last), fields)
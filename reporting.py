@@ -0,0 +1,199 @@
+# ============================================================
+#  Reporting — visits and billed amounts, grouped
+#  Smart Clinic Management System
+#  group1.sql / group2.sql (COUNT(*), SUM(amount) GROUP BY
+#  salesperson) for the clinic: by doctor, day, week, month,
+#  year or status, over the appointment columns in records.py.
+#  Those columns are already small-int codes, so a grouping is
+#  arithmetic on arrays — one numpy.bincount when numpy is
+#  installed, a single Python pass when it is not.
+# ============================================================
+
+from collections import Counter, OrderedDict
+
+from validation import parse_date
+
+try:
+    import numpy as np
+except ImportError:           # the plain-Python pass below still works
+    np = None
+
+DIMENSIONS = ('doctor', 'status', 'day', 'week', 'month', 'year')
+CACHE_SIZE = 64               # reports kept per engine
+DENSE_LIMIT = 1 << 22         # beyond this many key combinations, np.unique instead
+
+
+def period(dimension, day):
+    """'2026-03-09' -> '2026-W11' / '2026-03' / '2026'; None if not a date."""
+    parsed = parse_date(day) if day else None
+    if parsed is None:
+        return None
+    if dimension == 'month':
+        return day[:7]
+    if dimension == 'year':
+        return day[:4]
+    year, week, _ = parsed.isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+class _Snapshot:
+    """Copies of the appointment columns, taken under the records lock."""
+
+    def __init__(self, table):
+        self.rows = len(table.ids)
+        self.doctor = (table.doctor.codes[:], list(table.doctor.values))
+        self.status = (table.status.codes[:], list(table.status.values))
+        self.date = (table.date.codes[:], list(table.date.values))
+        self.amount = table.amount[:]
+        self.dead = list(table.dead)
+
+
+class ReportEngine:
+    """
+    report(by=('doctor', 'month'), date_from=..., date_to=..., status=...)
+    -> [(key tuple, visits, billed)] sorted by key.
+
+    A report is computed from a snapshot of the columns, so saves are
+    held up only for the copy, and kept in an LRU cache until the
+    appointments change (ClinicRecords.versions).
+    """
+
+    def __init__(self, records, cache_size=CACHE_SIZE):
+        self.records = records
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def report(self, by=('doctor',), date_from=None, date_to=None, status=None):
+        by = tuple(by)
+        for dimension in by:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f'unknown dimension: {dimension!r}')
+        records = self.records
+        with records.lock:
+            table = records.appointments
+            key = (by, date_from, date_to, status, records.versions['appointments'],
+                   len(table.ids), len(table.dead))
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                return rows
+            snapshot = _Snapshot(table)
+        rows = _report(snapshot, by, date_from, date_to, status)
+        with records.lock:
+            self._cache[key] = rows
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rows
+
+    def totals(self, date_from=None, date_to=None, status=None):
+        """(visits, billed) over the whole range."""
+        rows = self.report((), date_from, date_to, status)
+        return (rows[0][1], rows[0][2]) if rows else (0, 0.0)
+
+
+# ── Grouping ─────────────────────────────────────────────────
+def _report(snap, by, date_from, date_to, status):
+    # Each dimension becomes (codes, lookup or None, labels): a row's
+    # group in it is lookup[code], or the code itself without a lookup
+    dates = snap.date[1]
+    dims = []
+    for dimension in by:
+        if dimension in ('doctor', 'status'):
+            codes, labels = getattr(snap, dimension)
+            dims.append((codes, None, labels))
+        elif dimension == 'day':
+            dims.append((snap.date[0], None, dates))
+        else:
+            labels, lookup, index = [], [], {}
+            for day in dates:
+                label = period(dimension, day)
+                if label not in index:
+                    index[label] = len(labels)
+                    labels.append(label)
+                lookup.append(index[label])
+            dims.append((snap.date[0], lookup, labels))
+
+    # Filters, as per-code tables: is this date in range, is this the status
+    in_range = None
+    if date_from or date_to:
+        lo, hi = date_from or '', date_to or '\uffff'
+        in_range = [day is not None and lo <= day <= hi for day in dates]
+    want = None
+    if status is not None:
+        values = snap.status[1]
+        if status not in values:
+            return []
+        want = values.index(status)
+
+    group = _group_numpy if np is not None else _group_python
+    counts = group(snap, dims, in_range, want)
+    rows = [(key, visits, round(billed, 2)) for key, (visits, billed) in counts.items()]
+    rows.sort(key=lambda row: tuple((label is None, label or '') for label in row[0]))
+    return rows
+
+
+def _group_numpy(snap, dims, in_range, want):
+    # keep=None: every row counts, so no column needs filtering
+    keep = None
+    if snap.dead or in_range is not None or want is not None:
+        keep = np.ones(snap.rows, dtype=bool)
+        keep[np.array(snap.dead, dtype=np.int64)] = False
+        if in_range is not None:
+            date_codes = np.frombuffer(snap.date[0], dtype=snap.date[0].typecode)
+            keep &= np.array(in_range, dtype=bool)[date_codes]
+        if want is not None:
+            keep &= np.frombuffer(snap.status[0], dtype=snap.status[0].typecode) == want
+    select = (lambda column: column) if keep is None else (lambda column: column[keep])
+
+    key = 0
+    sizes = []
+    for codes, lookup, labels in dims:
+        column = select(np.frombuffer(codes, dtype=codes.typecode))
+        if lookup is not None:
+            column = np.array(lookup, dtype=np.int64)[column]
+        key = key * len(labels) + column.astype(np.int64)
+        sizes.append(len(labels))
+    amounts = select(np.frombuffer(snap.amount, dtype=np.float64))
+    amounts = np.where(np.isnan(amounts), 0.0, amounts)    # NaN: no fee recorded
+    if not dims:
+        key = np.zeros(len(amounts), dtype=np.int64)
+
+    size = int(np.prod(sizes, dtype=np.int64)) if sizes else 1
+    if size <= DENSE_LIMIT:
+        visits = np.bincount(key, minlength=size)
+        billed = np.bincount(key, weights=amounts, minlength=size)
+        present = np.flatnonzero(visits)
+        keys, visits, billed = present, visits[present], billed[present]
+    else:
+        keys, inverse = np.unique(key, return_inverse=True)
+        visits = np.bincount(inverse)
+        billed = np.bincount(inverse, weights=amounts)
+    return {_labels(int(k), dims): (int(v), float(b))
+            for k, v, b in zip(keys, visits, billed)}
+
+
+def _group_python(snap, dims, in_range, want):
+    dead = set(snap.dead)
+    status_codes = snap.status[0]
+    date_codes = snap.date[0]
+    columns = [codes if lookup is None else [lookup[c] for c in codes]
+               for codes, lookup, _ in dims]
+    keys = zip(*columns) if columns else iter(lambda: (), None)
+    visits, billed = Counter(), Counter()
+    for row, (key, amount) in enumerate(zip(keys, snap.amount)):
+        if (in_range is not None and not in_range[date_codes[row]]
+                or want is not None and status_codes[row] != want or row in dead):
+            continue
+        visits[key] += 1
+        if amount == amount:                 # NaN: no fee recorded
+            billed[key] += amount
+    return {tuple(dims[i][2][code] for i, code in enumerate(key)): (n, billed[key])
+            for key, n in visits.items()}
+
+
+def _labels(key, dims):
+    out = []
+    for _, _, labels in reversed(dims):
+        key, code = divmod(key, len(labels))
+        out.append(labels[code])
+    return tuple(reversed(out))
@@ -0,0 +1,125 @@
+# ============================================================
+#  Rollup — appointment counts per day / week / month
+#  Smart Clinic Management System
+#  A trend chart asks "how many per week, by status, this year".
+#  Scanning the appointments for that grows with the clinic; here
+#  every saved appointment bumps one bucket per level, so a range
+#  query reads one dict entry per bucket in the range.
+# ============================================================
+
+from collections import Counter
+from datetime import timedelta
+from functools import lru_cache
+from operator import itemgetter
+
+from validation import parse_date
+
+LEVELS = ('day', 'week', 'month')
+_TALLY_KEY = itemgetter('date', 'status', 'doctor')    # store rows have all three
+
+
+@lru_cache(maxsize=8192)
+def bucket(level, day):
+    """The `level` bucket holding ISO date `day`: the day itself, the
+    Monday of its week, or 'YYYY-MM'.  None if `day` is not a date."""
+    parsed = parse_date(day) if day else None
+    if parsed is None:
+        return None
+    if level == 'day':
+        return day
+    if level == 'week':
+        return (parsed - timedelta(days=parsed.weekday())).isoformat()
+    return day[:7]
+
+
+def buckets(level, first, last):
+    """Every `level` bucket from the one holding `first` to the one holding `last`."""
+    start, end = _first_day(level, first), _first_day(level, last)
+    out = []
+    if level == 'month':
+        index, stop = start.year * 12 + start.month - 1, end.year * 12 + end.month - 1
+        for i in range(index, stop + 1):
+            out.append(f'{i // 12:04d}-{i % 12 + 1:02d}')
+        return out
+    step = timedelta(days=7 if level == 'week' else 1)
+    while start <= end:
+        out.append(start.isoformat())
+        start += step
+    return out
+
+
+def _first_day(level, day):
+    key = bucket(level, day)
+    if key is None:
+        raise ValueError(f'not a YYYY-MM-DD date: {day!r}')
+    return parse_date(key + '-01' if level == 'month' else key)
+
+
+class RollupCube:
+    """
+    Counts per (level, bucket) × status × doctor.
+
+    Each bucket is a Counter keyed by (status, doctor), where None
+    stands for "any": an appointment adds to (status, doctor),
+    (status, None), (None, doctor) and (None, None), so a query with
+    or without either filter is one lookup per bucket.  Updated on
+    the Tk thread, like dashboard.DashboardStats.
+    """
+
+    def __init__(self):
+        self.cells = {level: {} for level in LEVELS}    # level -> {bucket: Counter}
+
+    # ── Updates ──────────────────────────────────────────────
+    def add(self, appointment):
+        self._bump(appointment.get('date'), appointment.get('status'),
+                   appointment.get('doctor'), 1)
+
+    def _bump(self, day, status, doctor, n):
+        for level in LEVELS:
+            key = bucket(level, day)
+            if key is None:
+                return
+            cell = self.cells[level].get(key)
+            if cell is None:
+                cell = self.cells[level][key] = Counter()
+            for k in ((status, doctor), (status, None), (None, doctor), (None, None)):
+                cell[k] += n
+
+    # ── Queries ──────────────────────────────────────────────
+    def series(self, level, first, last, status=None, doctor=None):
+        """[(bucket, count)] over every bucket in the range, zeros included."""
+        cells = self.cells[level]
+        key = (status, doctor)
+        out = []
+        for b in buckets(level, first, last):
+            cell = cells.get(b)
+            out.append((b, cell.get(key, 0) if cell else 0))
+        return out
+
+    def total(self, level, first, last, status=None, doctor=None):
+        return sum(n for _, n in self.series(level, first, last, status, doctor))
+
+    # ── Rebuild ──────────────────────────────────────────────
+    def rebuild(self, appointments):
+        """
+        Replace the counts with those of `appointments` (any iterable of
+        appointment dicts, e.g. ClinicStore.iter_appointments()), read once.
+        Rows are only tallied per (date, status, doctor) on the way; the
+        buckets are filled from those far fewer tallies afterwards.
+        """
+        self._fill(Counter(map(_TALLY_KEY, appointments)))
+        return self
+
+    def feed(self, appointments):
+        """Pass `appointments` through, counting each one, so another
+        reader of the same stream (ScheduleIndex.load) shares the pass."""
+        tallies = Counter()
+        for a in appointments:
+            tallies[_TALLY_KEY(a)] += 1
+            yield a
+        self._fill(tallies)
+
+    def _fill(self, tallies):
+        self.cells = {level: {} for level in LEVELS}
+        for (day, status, doctor), n in tallies.items():
+            self._bump(day, status, doctor, n)
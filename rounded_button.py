@@ -0,0 +1,59 @@
+# ============================================================
+#  Rounded Button — one canvas button shared by every screen
+#  Smart Clinic Management System
+#  The shapes are created once; hover only recolors them.
+# ============================================================
+
+import tkinter as tk
+
+FONT = ('Segoe UI', 10, 'bold')
+
+
+def darken(hex_color, amount=20):
+    r = max(0, int(hex_color[1:3], 16) - amount)
+    g = max(0, int(hex_color[3:5], 16) - amount)
+    b = max(0, int(hex_color[5:7], 16) - amount)
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+class RoundedButton(tk.Canvas):
+    """
+    A rounded rectangle with a label, drawn on a Canvas.
+
+    The 4 corner arcs and 2 rectangles share the tag 'shape', so a hover
+    is a single itemconfig call instead of delete('all') + 7 creates.
+    """
+
+    def __init__(self, parent, text, color, command=None, width=160, height=36,
+                 radius=10, bg='#f0f4f8', hover_amount=20, font=FONT):
+        super().__init__(parent, width=width, height=height,
+                         bg=bg, highlightthickness=0, cursor='hand2')
+        self.color = color
+        self.hover_color = darken(color, hover_amount)
+        self.hover_amount = hover_amount
+        self.command = command
+        self._draw(text, width, height, radius, font)
+        self.bind('<Button-1>', lambda e: self.command() if self.command else None)
+        self.bind('<Enter>', lambda e: self._paint(self.hover_color))
+        self.bind('<Leave>', lambda e: self._paint(self.color))
+
+    def _draw(self, text, w, h, r, font):
+        c = self.color
+        self.create_arc(0, 0, r*2, r*2, start=90, extent=90, fill=c, outline=c, tags='shape')
+        self.create_arc(w-r*2, 0, w, r*2, start=0, extent=90, fill=c, outline=c, tags='shape')
+        self.create_arc(0, h-r*2, r*2, h, start=180, extent=90, fill=c, outline=c, tags='shape')
+        self.create_arc(w-r*2, h-r*2, w, h, start=270, extent=90, fill=c, outline=c, tags='shape')
+        self.create_rectangle(r, 0, w-r, h, fill=c, outline=c, tags='shape')
+        self.create_rectangle(0, r, w, h-r, fill=c, outline=c, tags='shape')
+        self.label = self.create_text(w//2, h//2, text=text, fill='white', font=font)
+
+    def _paint(self, color):
+        self.itemconfig('shape', fill=color, outline=color)
+
+    def set_text(self, text):
+        self.itemconfig(self.label, text=text)
+
+    def set_color(self, color):
+        self.color = color
+        self.hover_color = darken(color, self.hover_amount)
+        self._paint(color)
@@ -0,0 +1,162 @@
+# ============================================================
+#  Scheduling — double-booking check & free-slot finder
+#  Smart Clinic Management System
+#  For every doctor and day we keep the booked intervals as
+#  sorted lists, so a conflict check is two bisects.
+# ============================================================
+
+from bisect import bisect_left
+from datetime import date as Date, timedelta
+
+from validation import parse_time
+
+SLOT_MINUTES = 30            # the dialog has no duration field
+DAY_START = '09:00'
+DAY_END = '17:00'
+FREE_STATUSES = ('Cancelled',)   # these do not occupy the doctor
+
+
+def to_minutes(hhmm):
+    """'09:30' -> 570.  Raises ValueError for anything else."""
+    minutes = parse_time(hhmm)
+    if minutes is None:
+        raise ValueError(f'bad time: {hhmm!r}')
+    return minutes
+
+
+def from_minutes(minutes):
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def doctor_key(name):
+    return ' '.join(name.split()).casefold()
+
+
+class _Day:
+    """Disjoint booked intervals for one doctor on one date."""
+    __slots__ = ('starts', 'ends', 'items')
+
+    def __init__(self):
+        self.starts, self.ends, self.items = [], [], []
+
+    def find(self, start, end):
+        """Index of a booking overlapping [start, end), or -1."""
+        i = bisect_left(self.starts, start)
+        if i < len(self.starts) and self.starts[i] < end:
+            return i
+        if i > 0 and self.ends[i - 1] > start:
+            return i - 1
+        return -1
+
+    def overlapping(self, start, end):
+        i = self.find(start, end)
+        return self.items[i] if i >= 0 else None
+
+    def insert(self, start, end, item):
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.items.insert(i, item)
+
+    def remove(self, item):
+        for i, other in enumerate(self.items):
+            if other is item:
+                del self.starts[i], self.ends[i], self.items[i]
+                return True
+        return False
+
+
+class ScheduleIndex:
+    """
+    Per-doctor interval index over appointments.
+
+    conflict() and book() cost O(log n) in the number of bookings that
+    doctor has on that day; older history lives in other buckets and is
+    never touched.  free_slots() walks forward day by day.
+    """
+
+    def __init__(self, slot_minutes=SLOT_MINUTES, day_start=DAY_START, day_end=DAY_END):
+        self.slot = slot_minutes
+        self.day_start = to_minutes(day_start)
+        self.day_end = to_minutes(day_end)
+        self.doctors = {}        # doctor key -> {date: _Day}
+
+    def load(self, appointments):
+        """Index existing appointments; returns how many were skipped."""
+        skipped = 0
+        for a in appointments:
+            try:
+                if a.get('time') and not self.book(a):
+                    skipped += 1        # overlaps an earlier booking
+            except ValueError:
+                skipped += 1            # unreadable time
+        return skipped
+
+    def _span(self, appointment):
+        start = to_minutes(appointment['time'])
+        return start, start + self.slot
+
+    def _day(self, doctor, date, create=False):
+        days = self.doctors.get(doctor_key(doctor))
+        if days is None:
+            if not create:
+                return None
+            days = self.doctors[doctor_key(doctor)] = {}
+        day = days.get(date)
+        if day is None and create:
+            day = days[date] = _Day()
+        return day
+
+    def conflict(self, appointment):
+        """The booked appointment this one would overlap, or None."""
+        if appointment.get('status') in FREE_STATUSES:
+            return None
+        day = self._day(appointment['doctor'], appointment['date'])
+        if day is None:
+            return None
+        return day.overlapping(*self._span(appointment))
+
+    def book(self, appointment):
+        """Add an appointment; False (and nothing stored) if it overlaps."""
+        if appointment.get('status') in FREE_STATUSES:
+            return True
+        start, end = self._span(appointment)
+        day = self._day(appointment['doctor'], appointment['date'], create=True)
+        if day.overlapping(start, end) is not None:
+            return False
+        day.insert(start, end, appointment)
+        return True
+
+    def cancel(self, appointment):
+        day = self._day(appointment['doctor'], appointment['date'])
+        return day is not None and day.remove(appointment)
+
+    def _align(self, minutes):
+        """Round up onto the slot grid that starts at opening time."""
+        offset = max(minutes, self.day_start) - self.day_start
+        return self.day_start + -(-offset // self.slot) * self.slot
+
+    def free_slots(self, doctor, count=3, date=None, time=None, max_days=60):
+        """
+        Next `count` free (date, 'HH:MM') slots for a doctor, starting at
+        `date` `time` (default: today, opening time), within working hours.
+        """
+        day = Date.fromisoformat(date) if date else Date.today()
+        t = self._align(to_minutes(time) if time else self.day_start)
+        days = self.doctors.get(doctor_key(doctor), {})
+        found = []
+        for _ in range(max_days):
+            iso = day.isoformat()
+            booked = days.get(iso)
+            while t + self.slot <= self.day_end and len(found) < count:
+                i = booked.find(t, t + self.slot) if booked else -1
+                if i < 0:
+                    found.append((iso, from_minutes(t)))
+                    t += self.slot
+                else:
+                    t = self._align(booked.ends[i])   # skip past the booking
+            if len(found) >= count:
+                break
+            day += timedelta(days=1)
+            t = self.day_start
+        return found
@@ -0,0 +1,428 @@
+# ============================================================
+#  Search Index — in-memory prefix index for the TopBar search
+#  Smart Clinic Management System
+# ============================================================
+
+import re
+from array import array
+from bisect import bisect_left, insort
+
+from records import ClinicRecords, TextColumn
+
+try:
+    import numpy as np
+except ImportError:           # posting lists are intersected as sets instead
+    np = None
+
+# Fields that feed the index for each kind of record
+PATIENT_FIELDS = ('name', 'phone', 'email')
+APPOINTMENT_FIELDS = ('patient', 'doctor', 'date')
+
+ADD_SLICE = 1000       # records indexed per hold of the records' lock in add_patients
+SCAN_REJECTS = 64      # lead candidates failing the other terms before postings are intersected
+MAX_REJECTS = 2000     # ... before a walk gives up, returning what it found
+INTERSECT_CHUNK = 8192  # rows of the last term's postings filtered at a time
+
+_NON_DIGIT = re.compile(r'\D')
+_EMAIL_SEP = re.compile(r'[._+\-]')
+_LETTERS_DIGITS = re.compile(r'([^\W\d_]+)(\d+)')
+_ADDRESS_CHAR = re.compile(r'[@._+\-]')
+_ADDRESS_SPACES = str.maketrans('@._+-', '     ')
+
+
+def _words(text):
+    """
+    Whitespace-separated words, with letters-then-digits ones split:
+    'kyaw123' -> 'kyaw', '123'.  Left whole, every address like
+    kyaw123@… adds a token of its own under 'kyaw', and a prefix
+    spanning thousands of tokens cannot be intersected (see
+    _PrefixIndex.lookup).
+    """
+    out = []
+    for w in text.split():
+        m = _LETTERS_DIGITS.fullmatch(w) if w[-1].isdigit() and not w[0].isdigit() else None
+        if m is None:
+            out.append(w)
+        else:
+            out.extend(m.groups())
+    return out
+
+
+def tokenize(record, fields):
+    """Lower-case words of the given fields, plus phone digits and email parts."""
+    tokens = set()
+    for f in fields:
+        value = record.get(f)
+        if not value:
+            continue
+        value = str(value).lower()
+        tokens.update(_words(value))
+        if f == 'phone':
+            digits = _NON_DIGIT.sub('', value)
+            if digits:
+                tokens.add(digits)
+        elif f == 'email':
+            local, _, domain = value.partition('@')
+            tokens.update(_words(' '.join(_EMAIL_SEP.split(local))))
+            if domain:
+                tokens.add(domain)
+    return tokens
+
+
+def query_terms(query):
+    return _words(query.lower())
+
+
+def _parts(token):
+    """
+    The posting keys of a token.  One with address punctuation in it
+    (an address, a domain, a date) is posted under its words instead:
+    'kyaw.su12@gmail.com' -> kyaw, su, 12, gmail, com.  Split the same
+    way, a query term's words each prefix a key of every row it
+    matches, and the term itself is checked against the row's tokens.
+    """
+    if token.isalnum() or not _ADDRESS_CHAR.search(token):
+        return [token]
+    return _words(token.translate(_ADDRESS_SPACES))
+
+
+def _analyse(record, fields):
+    """
+    What indexing a record needs, worked out without touching the index:
+    (its doc_tokens string, its posting keys, the keys it only has inside
+    a longer token).
+    """
+    tokens = tokenize(record, fields)
+    email = str(record.get('email') or '').lower() if 'email' in fields else None
+    keys, split = set(tokens), set()
+    for t in tokens:
+        if t.isalnum() or not _ADDRESS_CHAR.search(t):
+            continue
+        keys.discard(t)
+        if t != email:      # an address's local words and domain are tokens already
+            split.update(_parts(t))
+    # Tuples: the collector stops tracking them, a batch of sets it would walk
+    return ''.join('\0' + t for t in tokens), tuple(keys | split), tuple(split - tokens)
+
+
+def _needles(terms):
+    return [b'\0' + t.encode('utf-8') for t in terms]
+
+
+# ── One sorted-token index per record kind ──────────────────
+class _PrefixIndex:
+    """
+    Token index over the rows of a records.py table.  Postings hold row
+    numbers; the records themselves live in the table's columns.
+    """
+
+    def __init__(self, fields, table):
+        self.fields = fields
+        self.table = table
+        self.tokens = []                # sorted, unique posting keys
+        self.postings = {}              # token -> row, or array of rows once it has several
+        self.split_keys = []            # sorted; keys some row only has inside a longer token
+        self.doc_tokens = TextColumn()  # row -> '\0tok\0tok…' for fast prefix checks
+
+    def _index(self, row, analysed, new_tokens=None):
+        doc, keys, split = analysed
+        self.doc_tokens.append(doc)
+        self._post(row, keys, split, new_tokens)
+
+    def _post(self, row, keys, split, new_tokens=None):
+        # Most keys (a phone number, the digits of an address) belong
+        # to one row: a plain int until a second row needs an array
+        for k in split:
+            if not self._split_under(k, exact=True):
+                insort(self.split_keys, k)
+        for t in keys:
+            rows = self.postings.get(t)
+            if rows is None:
+                self.postings[t] = row
+                if new_tokens is None:
+                    insort(self.tokens, t)
+                else:
+                    new_tokens.append(t)
+            elif type(rows) is int:
+                self.postings[t] = array('I', (rows, row))
+            else:
+                rows.append(row)
+
+    def add(self, record):
+        """Store one record in the table and index it; returns its row."""
+        row = self.table.append(record)
+        self.table.place(row)
+        self._index(row, _analyse(record, self.fields))
+        return row
+
+    def add_many(self, records, place=True, analysed=None):
+        """
+        Bulk load.  `analysed`, if given, holds _analyse() of each record,
+        worked out beforehand by a caller not holding the lock.
+        """
+        # New tokens are appended sorted, then one merge-sort of two
+        # sorted runs (linear) instead of an insort per token
+        records = list(records)
+        if analysed is None:
+            analysed = (_analyse(r, self.fields) for r in records)
+        rows = self.table.extend(records, place)
+        new_tokens = []
+        for row, a in zip(rows, analysed):
+            self._index(row, a, new_tokens)
+        new_tokens.sort()
+        self.tokens.extend(new_tokens)
+        self.tokens.sort()
+
+    def update(self, row, record):
+        # Old postings stay; they only ever point at tokens the record
+        # had, and matches() checks the current ones
+        self.table.update(row, record)
+        doc, keys, split = _analyse(record, self.fields)
+        self.doc_tokens.set(row, doc)
+        self._post(row, keys, split)
+
+    def remove(self, row):
+        # Postings keep the stale row; lookup() skips dead rows
+        self.table.remove(row)
+
+    def matches(self, row, needles):
+        # b'\0' + term found in the joined tokens <=> term prefixes a token
+        return all(self.doc_tokens.contains(row, n) for n in needles)
+
+    def _split_under(self, term, exact=False):
+        i = bisect_left(self.split_keys, term)
+        if i == len(self.split_keys):
+            return False
+        return self.split_keys[i] == term if exact else self.split_keys[i].startswith(term)
+
+    def _range_cost(self, key, cap=64):
+        """Number of postings under a prefix, or None if it spans > cap tokens."""
+        tokens = self.tokens
+        lo = bisect_left(tokens, key)
+        hi = bisect_left(tokens, key + '\uffff', lo, min(lo + cap + 1, len(tokens)))
+        if hi - lo > cap:
+            return None
+        postings = (self.postings[tokens[i]] for i in range(lo, hi))
+        return sum(1 if type(p) is int else len(p) for p in postings)
+
+    def _postings(self, key):
+        """The postings (a row or an array of rows) of every token `key` is a prefix of."""
+        tokens = self.tokens
+        lo = bisect_left(tokens, key)
+        hi = bisect_left(tokens, key + '\uffff', lo)
+        for i in range(lo, hi):
+            yield self.postings[tokens[i]]
+
+    def _rows(self, key):
+        for p in self._postings(key):
+            if type(p) is int:
+                yield p
+            else:
+                yield from p
+
+    def _arrays(self, key):
+        """As _postings, with the single rows gathered into one array."""
+        single = array('I')
+        for p in self._postings(key):
+            if type(p) is int:
+                single.append(p)
+            else:
+                yield p
+        if single:
+            yield single
+
+    def lookup(self, terms, limit):
+        """
+        Rows matching every term, at most `limit` of them.
+        Returns (rows, complete) — complete is False if we stopped early.
+
+        The postings of the most selective term are walked and the
+        other terms checked on each candidate.  A common combination
+        fills `limit` quickly that way; a rare one (each word common,
+        few rows with all of them) would check every row of the lead,
+        so after SCAN_REJECTS misses the postings of every term with a
+        countable range are intersected instead.  With at most one such
+        term the walk goes on, up to MAX_REJECTS misses.
+        """
+        terms = list(dict.fromkeys(terms))      # 'aung aung' asks for aung once
+        keys = list(dict.fromkeys(k for t in terms for k in _parts(t)))
+        if not keys:
+            return [], True
+        lead, known = keys[0], []
+        if len(keys) > 1:
+            costs = [(self._range_cost(k), -len(k), i) for i, k in enumerate(keys)]
+            known = sorted(c for c in costs if c[0] is not None)
+            lead = keys[known[0][2] if known else min(costs, key=lambda c: c[1])[2]]
+        # The walk checks every term but the lead, and the lead too if it
+        # has punctuation or prefixes a split key ('jane' -> mary-jane)
+        hits, complete = self._collect(
+            self._rows(lead),
+            _needles(t for t in terms if t != lead or self._split_under(t)),
+            limit, SCAN_REJECTS if len(known) > 1 else MAX_REJECTS)
+        if complete or len(hits) >= limit or len(known) < 2:
+            return hits, complete
+        rows = self._intersect([keys[i] for _, _, i in known])
+        return self._collect(rows, _needles(terms), limit, MAX_REJECTS)
+
+    def _collect(self, candidates, needles, limit, max_rejects):
+        hits, seen, dead, rejected = [], set(), self.table.dead, 0
+        for row in candidates:
+            if row in seen or row in dead:
+                continue
+            seen.add(row)
+            if needles and not self.matches(row, needles):
+                rejected += 1
+                if rejected >= max_rejects:
+                    return hits, False
+                continue
+            hits.append(row)
+            if len(hits) >= limit:
+                return hits, False
+        return hits, True
+
+    def _intersect(self, keys):
+        """Rows found in the postings of every key (fewest first); may repeat."""
+        if np is None:
+            rows = set(self._rows(keys[0]))
+            for key in keys[1:]:
+                rows = rows.intersection(self._rows(key))
+            yield from sorted(rows)
+            return
+        keep = None
+        for key in keys[:-1]:
+            rows = [np.frombuffer(a, dtype=a.typecode) for a in self._arrays(key)]
+            if not rows:
+                return
+            rows = np.concatenate(rows, dtype=np.intp)
+            if keep is not None:
+                rows = rows.compress(keep[rows])
+            keep = np.zeros(len(self.table.ids), dtype=bool)
+            keep[rows] = True
+        # The last term's rows are filtered a chunk at a time: the caller
+        # usually stops after `limit` of them
+        for a in self._arrays(keys[-1]):
+            for i in range(0, len(a), INTERSECT_CHUNK):
+                rows = np.frombuffer(a, dtype=a.typecode, count=min(INTERSECT_CHUNK, len(a) - i),
+                                     offset=i * a.itemsize).astype(np.intp)
+                yield from rows.compress(keep[rows]).tolist()
+
+
+# ── Public index ─────────────────────────────────────────────
+class SearchIndex:
+    """
+    Prefix search over patients (name, phone, email) and appointments
+    (patient, doctor, date).
+
+    Successive keystrokes usually extend the previous query, so when the
+    last result set was complete the new one is found by filtering it
+    instead of going back to the index.
+
+    The records themselves are kept in a ClinicRecords (records.py),
+    which the list views and the dashboard read as well.  Searches and
+    saves run on worker threads, so everything takes the records' lock.
+    """
+
+    def __init__(self, records=None, limit=200):
+        self.limit = limit
+        self.records = records or ClinicRecords()
+        self._lock = self.records.lock
+        self.patients = _PrefixIndex(PATIENT_FIELDS, self.records.patients)
+        self.appointments = _PrefixIndex(APPOINTMENT_FIELDS, self.records.appointments)
+        self._last_terms = None
+        self._last = None       # {'patients': (rows, complete), ...}
+
+    def load(self, store, should_stop=None):
+        with self._lock:
+            # Chunks keep at most one chunk of dicts alive at a time
+            for index, rows in ((self.patients, store.iter_patients()),
+                                (self.appointments, store.iter_appointments())):
+                for chunk in _chunks(rows):
+                    index.add_many(chunk, place=False)
+                    if should_stop and should_stop():
+                        return
+                index.table.resort()
+            self._changed('patients', 'appointments')
+
+    def add_patient(self, patient):
+        with self._lock:
+            self.patients.add(patient)
+            self._changed('patients')
+
+    def add_patients(self, patients):
+        # Tokenizing touches nothing shared, so it is done before the
+        # lock is taken; the records then go in ADD_SLICE at a time, the
+        # lock released in between for searches and the list views
+        patients = list(patients)
+        analysed = [_analyse(p, PATIENT_FIELDS) for p in patients]
+        for i in range(0, len(patients), ADD_SLICE):
+            with self._lock:
+                self.patients.add_many(patients[i:i + ADD_SLICE],
+                                       analysed=analysed[i:i + ADD_SLICE])
+                self._changed('patients')
+
+    def merge_patients(self, merges):
+        """
+        After store.merge_patients, for (kept, dropped_id) in `merges`:
+        drop each merged-away record and re-index the one it went into.
+        """
+        with self._lock:
+            table = self.records.patients
+            for kept, dropped_id in merges:
+                dropped, row = table.row_of(dropped_id), table.row_of(kept['id'])
+                if dropped is not None:
+                    self.patients.remove(dropped)
+                if row is not None:
+                    self.patients.update(row, kept)
+            self.records.appointments.relink({d: kept['id'] for kept, d in merges})
+            self._changed('patients', 'appointments')
+
+    def add_appointment(self, appointment):
+        with self._lock:
+            self.appointments.add(appointment)
+            self._changed('appointments')
+
+    def _changed(self, *tables):
+        for t in tables:
+            self.records.versions[t] += 1
+        self._last = None
+
+    def search(self, query):
+        """Return a list of ('patient' | 'appointment', record) pairs."""
+        with self._lock:
+            return self._search(query)
+
+    def _search(self, query):
+        terms = query_terms(query)
+        if not terms:
+            self._last_terms, self._last = None, None
+            return []
+
+        narrows = self._last is not None and all(
+            any(new.startswith(old) for new in terms) for old in self._last_terms)
+
+        result = {}
+        for kind, index in (('patients', self.patients),
+                            ('appointments', self.appointments)):
+            prev = self._last[kind] if narrows else None
+            if prev is not None and prev[1]:
+                needles = _needles(terms)
+                rows = [row for row in prev[0] if index.matches(row, needles)]
+                result[kind] = (rows, True)
+            else:
+                result[kind] = index.lookup(terms, self.limit)
+
+        self._last_terms, self._last = terms, result
+        return ([('patient', self.patients.table.get(row)) for row in result['patients'][0]] +
+                [('appointment', self.appointments.table.get(row))
+                 for row in result['appointments'][0]])
+
+
+def _chunks(records, size=50000):
+    chunk = []
+    for r in records:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,5 +1,23 @@
+# First, so the startup profile also covers the imports below
+from profiling import StartupProfiler, report_if_enabled
+
+import os
+import sqlite3
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk
+from bisect import bisect_right
+from datetime import date
+
+from clinic_store import DB_PATH
+from rounded_button import RoundedButton
+from records import ClinicRecords
+from tasks import TaskScheduler, HIGH, LOW, current_task
+from views import ViewManager, DialogManager
+
+# The search index, list view, dashboard and dialog modules are
+# imported where they are first used, so the window can paint before
+# they load (see App.__init__).
 
 # ── Colors & Fonts ──────────────────────────────────────────
 COLORS = {
@@ -25,6 +43,11 @@ FONTS = {
     'search':   ('Segoe UI', 10),
 }
 
+SEARCH_PLACEHOLDER = 'Search patients, appointments…'
+SEARCH_DEBOUNCE_MS = 120      # wait this long after the last keystroke
+WATCH_MS = 1000               # how often to look for rows the API server added
+MERGE_CHUNK = 500             # duplicate pairs merged per store call
+
 NAV_ITEMS = [
     ('dashboard',    'Dashboard',    '⊞'),
     ('patients',     'Patients',     ''),
@@ -34,160 +57,142 @@ NAV_ITEMS = [
     ('settings',     'Settings',     '⚙'),
 ]
 
+NAV_LABELS = {key: label for key, label, _ in NAV_ITEMS if key != '---'}
 
-# ── Sidebar ─────────────────────────────────────────────────
-class Sidebar(tk.Frame):
-    def __init__(self, parent, on_nav):
+
+# ── Canvas Sidebar ───────────────────────────────────────────
+class CanvasSidebar(tk.Frame):
+    """
+    Navigation sidebar (on_nav, active, update_active), drawn whole on
+    one Canvas rather than as a frame and labels per item.  A single set
+    of bindings finds the item under the mouse by its y position, and
+    only items whose state (normal / hover / active) changed are
+    recolored.
+    """
+
+    ITEM_H = 40
+    STYLES = {
+        'normal': (COLORS['sidebar'],        '#a8b8d0',      None),
+        'hover':  (COLORS['sidebar_hover'],  COLORS['white'], None),
+        'active': (COLORS['sidebar_active'], COLORS['white'], COLORS['accent']),
+    }
+
+    def __init__(self, parent, on_nav, items=NAV_ITEMS):
         super().__init__(parent, bg=COLORS['sidebar'], width=210)
         self.pack_propagate(False)
         self.on_nav = on_nav
         self.active = 'dashboard'
-        self.nav_buttons = {}
-        self._build()
-
-    def _build(self):
-        # Logo area
-        logo_frame = tk.Frame(self, bg=COLORS['sidebar'])
-        logo_frame.pack(fill=tk.X, padx=20, pady=(22, 16))
-
-        tk.Label(logo_frame, text='Smart Clinic',
-                 font=FONTS['logo'], fg=COLORS['white'],
-                 bg=COLORS['sidebar']).pack(anchor='w')
-        tk.Label(logo_frame, text='Management System',
-                 font=FONTS['logo_sub'], fg=COLORS['muted'],
-                 bg=COLORS['sidebar']).pack(anchor='w')
-
-        # Separator
-        tk.Frame(self, bg='#2a3355', height=1).pack(fill=tk.X)
-
-        # Section label: Main
-        self._section_label('MAIN')
+        self.hover = None
+        self.items = {}         # key -> {'ids': (...), 'state': str}
+        self._tops = []         # item top y, sorted (for hit-testing)
+        self._keys = []         # key for each entry in _tops
+        self._build(items)
 
-        # Nav items
-        for key, label, icon in NAV_ITEMS:
-            if key == '---':
-                self._section_label('ADMIN', top_pad=10)
-                continue
-            btn = self._nav_button(key, icon, label)
-            self.nav_buttons[key] = btn
-
-        # Footer
+    def _build(self, items):
         tk.Frame(self, bg='#2a3355', height=1).pack(side=tk.BOTTOM, fill=tk.X)
         tk.Label(self, text='v1.0  ·  Smart Clinic',
                  font=('Segoe UI', 8), fg=COLORS['muted'],
                  bg=COLORS['sidebar']).pack(side=tk.BOTTOM, pady=12)
 
-    def _section_label(self, text, top_pad=4):
-        tk.Label(self, text=text,
-                 font=FONTS['nav_label'], fg=COLORS['muted'],
-                 bg=COLORS['sidebar']).pack(anchor='w', padx=20,
-                                            pady=(top_pad, 4))
-
-    def _nav_button(self, key, icon, label):
-        frame = tk.Frame(self, bg=COLORS['sidebar'], cursor='hand2')
-        frame.pack(fill=tk.X)
+        c = self.canvas = tk.Canvas(self, bg=COLORS['sidebar'], width=210,
+                                    highlightthickness=0, cursor='hand2')
+        c.pack(fill=tk.BOTH, expand=True)
 
-        inner = tk.Frame(frame, bg=COLORS['sidebar'])
-        inner.pack(fill=tk.X, padx=6)
+        # Logo + separator
+        c.create_text(20, 22, text='Smart Clinic', anchor='nw',
+                      font=FONTS['logo'], fill=COLORS['white'])
+        c.create_text(20, 44, text='Management System', anchor='nw',
+                      font=FONTS['logo_sub'], fill=COLORS['muted'])
+        c.create_line(0, 80, 210, 80, fill='#2a3355')
 
-        # Active indicator bar (left edge)
-        bar = tk.Frame(inner, width=3, bg=COLORS['sidebar'])
-        bar.pack(side=tk.LEFT, fill=tk.Y)
-
-        content = tk.Frame(inner, bg=COLORS['sidebar'])
-        content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        icon_lbl = tk.Label(content, text=icon, font=('Segoe UI', 11),
-                            fg='#a8b8d0', bg=COLORS['sidebar'], width=2)
-        icon_lbl.pack(side=tk.LEFT, padx=(8, 4), pady=9)
-
-        text_lbl = tk.Label(content, text=label, font=FONTS['nav'],
-                            fg='#a8b8d0', bg=COLORS['sidebar'], anchor='w')
-        text_lbl.pack(side=tk.LEFT, fill=tk.X, expand=True, pady=9)
-
-        widgets = [frame, inner, content, icon_lbl, text_lbl, bar]
-
-        for w in widgets:
-            w.bind('<Button-1>', lambda e, k=key: self._on_click(k))
-            w.bind('<Enter>', lambda e, f=frame, i=inner, c=content,
-                   il=icon_lbl, tl=text_lbl, k=key: self._on_enter(f, i, c, il, tl, k))
-            w.bind('<Leave>', lambda e, f=frame, i=inner, c=content,
-                   il=icon_lbl, tl=text_lbl, k=key: self._on_leave(f, i, c, il, tl, k))
-
-        return {'frame': frame, 'inner': inner, 'content': content,
-                'icon': icon_lbl, 'text': text_lbl, 'bar': bar}
+        y = self._section_label('MAIN', 84)
+        for key, label, icon in items:
+            if key == '---':
+                y = self._section_label('ADMIN', y + 10)
+                continue
+            self._nav_item(key, icon, label, y)
+            y += self.ITEM_H
+        c.config(scrollregion=(0, 0, 210, y + 8))
+
+        c.bind('<Motion>',   self._on_motion)
+        c.bind('<Leave>',    lambda e: self._set_hover(None))
+        c.bind('<Button-1>', self._on_press)
+        c.bind('<MouseWheel>', lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        c.bind('<Button-4>',   lambda e: self._scroll(-1))
+        c.bind('<Button-5>',   lambda e: self._scroll(1))
+
+        for key in self.items:
+            self._paint(key)
+
+    def _section_label(self, text, y):
+        self.canvas.create_text(20, y, text=text, anchor='nw',
+                                font=FONTS['nav_label'], fill=COLORS['muted'])
+        return y + 18
+
+    def _nav_item(self, key, icon, label, y):
+        c, h = self.canvas, self.ITEM_H
+        bg = c.create_rectangle(6, y, 204, y + h, width=0)
+        bar = c.create_rectangle(6, y, 9, y + h, width=0)
+        icon_id = c.create_text(27, y + h // 2, text=icon, font=('Segoe UI', 11))
+        text_id = c.create_text(45, y + h // 2, text=label, anchor='w',
+                                font=FONTS['nav'])
+        self.items[key] = {'ids': (bg, bar, icon_id, text_id), 'state': None}
+        self._tops.append(y)
+        self._keys.append(key)
+
+    # ── State & painting ─────────────────────────────────────
+    def _state(self, key):
+        if key == self.active:
+            return 'active'
+        return 'hover' if key == self.hover else 'normal'
+
+    def _paint(self, key):
+        item = self.items[key]
+        state = self._state(key)
+        if state == item['state']:
+            return
+        item['state'] = state
+        bg, fg, bar_color = self.STYLES[state]
+        bg_id, bar_id, icon_id, text_id = item['ids']
+        self.canvas.itemconfig(bg_id, fill=bg)
+        self.canvas.itemconfig(bar_id, fill=bar_color or bg)
+        self.canvas.itemconfig(icon_id, fill=fg)
+        self.canvas.itemconfig(text_id, fill=fg)
+
+    def _hit(self, e):
+        y = self.canvas.canvasy(e.y)
+        i = bisect_right(self._tops, y) - 1
+        if i >= 0 and y < self._tops[i] + self.ITEM_H and 6 <= e.x <= 204:
+            return self._keys[i]
+        return None
+
+    def _set_hover(self, key):
+        if key != self.hover:
+            old, self.hover = self.hover, key
+            for k in (old, key):
+                if k is not None:
+                    self._paint(k)
+
+    def _on_motion(self, e):
+        self._set_hover(self._hit(e))
+
+    def _on_press(self, e):
+        key = self._hit(e)
+        if key is not None:
+            self._on_click(key)
 
     def _on_click(self, key):
-        self.active = key
-        self._refresh_styles()
+        self.update_active(key)
         self.on_nav(key)
 
-    def _on_enter(self, frame, inner, content, icon_lbl, text_lbl, key):
-        if key != self.active:
-            for w in [frame, inner, content, icon_lbl, text_lbl]:
-                w.config(bg=COLORS['sidebar_hover'])
-            icon_lbl.config(fg=COLORS['white'])
-            text_lbl.config(fg=COLORS['white'])
-
-    def _on_leave(self, frame, inner, content, icon_lbl, text_lbl, key):
-        if key != self.active:
-            for w in [frame, inner, content, icon_lbl, text_lbl]:
-                w.config(bg=COLORS['sidebar'])
-            icon_lbl.config(fg='#a8b8d0')
-            text_lbl.config(fg='#a8b8d0')
-
-    def _refresh_styles(self):
-        for key, widgets in self.nav_buttons.items():
-            is_active = (key == self.active)
-            bg = COLORS['sidebar_active'] if is_active else COLORS['sidebar']
-            fg_text = COLORS['white'] if is_active else '#a8b8d0'
-            bar_bg = COLORS['accent'] if is_active else COLORS['sidebar_active'] if is_active else bg
-
-            for w_key in ['frame', 'inner', 'content', 'icon', 'text']:
-                widgets[w_key].config(bg=bg)
-            widgets['text'].config(fg=fg_text)
-            widgets['icon'].config(fg=fg_text)
-            widgets['bar'].config(bg=COLORS['accent'] if is_active else bg)
+    def _scroll(self, units):
+        self.canvas.yview_scroll(units, 'units')
 
     def update_active(self, key):
-        self.active = key
-        self._refresh_styles()
-
-
-# ── Rounded Button (via Canvas) ──────────────────────────────
-class RoundedButton(tk.Canvas):
-    def __init__(self, parent, text, color, command=None, width=160, height=36, radius=10):
-        super().__init__(parent, width=width, height=height,
-                         bg=COLORS['bg'], highlightthickness=0, cursor='hand2')
-        self.color = color
-        self.hover_color = self._darken(color)
-        self.text = text
-        self.command = command
-        self.radius = radius
-        self.w = width
-        self.h = height
-        self._draw(self.color)
-        self.bind('<Button-1>', lambda e: command() if command else None)
-        self.bind('<Enter>', lambda e: self._draw(self.hover_color))
-        self.bind('<Leave>', lambda e: self._draw(self.color))
-
-    def _draw(self, color):
-        self.delete('all')
-        r, w, h = self.radius, self.w, self.h
-        self.create_arc(0, 0, r*2, r*2, start=90, extent=90, fill=color, outline=color)
-        self.create_arc(w-r*2, 0, w, r*2, start=0, extent=90, fill=color, outline=color)
-        self.create_arc(0, h-r*2, r*2, h, start=180, extent=90, fill=color, outline=color)
-        self.create_arc(w-r*2, h-r*2, w, h, start=270, extent=90, fill=color, outline=color)
-        self.create_rectangle(r, 0, w-r, h, fill=color, outline=color)
-        self.create_rectangle(0, r, w, h-r, fill=color, outline=color)
-        self.create_text(w//2, h//2, text=self.text,
-                         fill=COLORS['white'], font=FONTS['btn'])
-
-    def _darken(self, hex_color):
-        r = max(0, int(hex_color[1:3], 16) - 20)
-        g = max(0, int(hex_color[3:5], 16) - 20)
-        b = max(0, int(hex_color[5:7], 16) - 20)
-        return f'#{r:02x}{g:02x}{b:02x}'
+        old, self.active = self.active, key
+        for k in (old, key):
+            if k in self.items:
+                self._paint(k)
 
 
 # ── TopBar ───────────────────────────────────────────────────
@@ -195,6 +200,9 @@ class TopBar(tk.Frame):
     def __init__(self, parent, on_search, on_add_patient, on_add_appointment):
         super().__init__(parent, bg=COLORS['bg'])
         self.pack(fill=tk.X, pady=(0, 12))
+        self.on_search = on_search
+        self._search_after = None
+        self._last_query = None
         self._build(on_search, on_add_patient, on_add_appointment)
 
     def _build(self, on_search, on_add_patient, on_add_appointment):
@@ -212,14 +220,17 @@ class TopBar(tk.Frame):
                                      font=FONTS['search'], bg=COLORS['white'],
                                      fg=COLORS['text'], relief=tk.FLAT,
                                      insertbackground=COLORS['accent'])
-        self.search_entry.insert(0, 'Search patients, appointments…')
+        self.search_entry.insert(0, SEARCH_PLACEHOLDER)
         self.search_entry.config(fg=COLORS['muted'])
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 8))
 
         # Placeholder behavior
         self.search_entry.bind('<FocusIn>',  self._search_focus_in)
         self.search_entry.bind('<FocusOut>', self._search_focus_out)
-        self.search_entry.bind('<Return>', lambda e: on_search())
+        self.search_entry.bind('<Return>', lambda e: self._fire_search())
+
+        # Search as you type: every key restarts a short timer
+        self.search_entry.bind('<KeyRelease>', self._schedule_search)
 
         # Focus highlight on search frame
         self.search_entry.bind('<FocusIn>',
@@ -245,40 +256,170 @@ class TopBar(tk.Frame):
                       COLORS['green'], on_add_appointment,
                       width=178, height=36).pack(side=tk.LEFT)
 
+    def _schedule_search(self, e):
+        if e.keysym == 'Return':
+            return
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self._fire_search)
+
+    def _fire_search(self):
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+        query = self.get_search_query()
+        if query != self._last_query:
+            self._last_query = query
+            self.on_search()
+
     def _search_focus_in(self, e):
-        if self.search_entry.get() == 'Search patients, appointments…':
+        if self.search_entry.get() == SEARCH_PLACEHOLDER:
             self.search_entry.delete(0, tk.END)
             self.search_entry.config(fg=COLORS['text'])
 
     def _search_focus_out(self, e):
         if not self.search_entry.get():
-            self.search_entry.insert(0, 'Search patients, appointments…')
+            self.search_entry.insert(0, SEARCH_PLACEHOLDER)
             self.search_entry.config(fg=COLORS['muted'])
 
     def get_search_query(self):
         val = self.search_var.get()
-        return '' if val == 'Search patients, appointments…' else val
+        return '' if val == SEARCH_PLACEHOLDER else val
 
     def clear_search(self):
         self.search_entry.delete(0, tk.END)
         self._search_focus_out(None)
 
 
+# ── Content views ────────────────────────────────────────────
+def placeholder_view(parent, name):
+    frame = tk.Frame(parent, bg=COLORS['card'])
+    tk.Label(frame, text=name,
+             font=('Segoe UI', 20, 'bold'),
+             fg=COLORS['muted'], bg=COLORS['card']).pack(expand=True)
+    return frame
+
+
+class SearchResults(tk.Frame):
+    """Search matches, shown in a fixed set of labels that are re-texted."""
+
+    def __init__(self, parent, shown=30):
+        super().__init__(parent, bg=COLORS['card'])
+        self.title = tk.Label(self, font=('Segoe UI', 12, 'bold'),
+                              fg=COLORS['text'], bg=COLORS['card'])
+        self.title.pack(anchor='w', padx=20, pady=(16, 8))
+        self.lines = [tk.Label(self, font=FONTS['search'], fg=COLORS['text'],
+                               bg=COLORS['card'], anchor='w')
+                      for _ in range(shown)]
+        for lbl in self.lines:
+            lbl.pack(fill=tk.X, padx=20, pady=2)
+
+    def set_results(self, query, results):
+        self.title.config(text=f'{len(results)} results for “{query}”')
+        for i, lbl in enumerate(self.lines):
+            if i >= len(results):
+                lbl.config(text='')
+                continue
+            kind, r = results[i]
+            if kind == 'patient':
+                text = f"👤  {r['name']}   ·   {r['phone'] or '—'}   ·   {r['email'] or '—'}"
+            else:
+                text = f"📅  {r['patient']}   ·   {r['doctor']}   ·   {r['date']} {r['time']}"
+            lbl.config(text=text)
+
+
+class SettingsView(tk.Frame):
+    """Data tools (import / export) with one shared progress bar."""
+
+    def __init__(self, parent, actions):
+        super().__init__(parent, bg=COLORS['card'])
+        tk.Label(self, text='Settings', font=('Segoe UI', 16, 'bold'),
+                 fg=COLORS['text'], bg=COLORS['card']).pack(anchor='w', padx=24, pady=(20, 12))
+        tk.Label(self, text='DATA', font=FONTS['nav_label'], fg=COLORS['muted'],
+                 bg=COLORS['card']).pack(anchor='w', padx=24)
+
+        # Date range used by the appointment export
+        span = tk.Frame(self, bg=COLORS['card'])
+        span.pack(anchor='w', padx=24, pady=(8, 0))
+        self.range_vars = []
+        for text, value in (('From', '2000-01-01'), ('To', date.today().isoformat())):
+            tk.Label(span, text=text, font=FONTS['search'], fg=COLORS['text'],
+                     bg=COLORS['card']).pack(side=tk.LEFT, padx=(0, 6))
+            var = tk.StringVar(value=value)
+            tk.Entry(span, textvariable=var, width=12, font=FONTS['search'],
+                     relief=tk.FLAT, highlightthickness=1,
+                     highlightbackground=COLORS['border']).pack(side=tk.LEFT, padx=(0, 14))
+            self.range_vars.append(var)
+
+        row = tk.Frame(self, bg=COLORS['card'])
+        row.pack(anchor='w', padx=24, pady=(10, 12))
+        for text, color, command in actions:
+            RoundedButton(row, text, color, command, width=190, height=36,
+                          bg=COLORS['card']).pack(side=tk.LEFT, padx=(0, 8))
+
+        from tkinter import ttk
+        self.progress = ttk.Progressbar(self, maximum=1.0, length=420)
+        self.progress.pack(anchor='w', padx=24)
+        self.status = tk.Label(self, text='', font=FONTS['search'], fg=COLORS['muted'],
+                               bg=COLORS['card'], justify=tk.LEFT)
+        self.status.pack(anchor='w', padx=24, pady=(6, 0))
+
+    def get_range(self):
+        return tuple(v.get().strip() for v in self.range_vars)
+
+    def set_progress(self, fraction, text):
+        self.progress['value'] = fraction
+        self.status.config(text=text)
+
+
 # ── Main App ─────────────────────────────────────────────────
 class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title('Smart Clinic Management System')
-        self.geometry('1200x680')
-        self.config(bg=COLORS['bg'])
-        self._build()
+    """
+    Starts in stages so the window appears at once:
+      1. paint the shell (sidebar, top bar, empty content)
+      2. after the first frame, open the store, load the search index,
+         schedule and dashboard counters on a worker thread
+      3. swap the real views in (_data_ready)
+    Actions that need the data before then are queued (_when_ready).
+    """
+
+    def __init__(self, db_path=DB_PATH, profiler=None):
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.add('imports', self.profiler.start, time.perf_counter())
+        with self.profiler.phase('window'):
+            super().__init__()
+            self.title('Smart Clinic Management System')
+            self.geometry('1200x680')
+            self.config(bg=COLORS['bg'])
+        # Handler timing; nothing is imported or patched unless asked for
+        self.instrumentation = None
+        if os.environ.get('SMARTCLINIC_INSTRUMENT'):
+            from instrumentation import install_from_env
+            self.instrumentation = install_from_env(self)
+        self.db_path = db_path
+        self.ready = False
+        self._pending = []
+        self.store = self.search_index = self.schedule = self.stats = None
+        self._opened = None
+        self.rollup = None
+        # Other writers to the database (api_server.py): see _watch_database
+        self._watch = self._watch_job = self._data_version = None
+        self._seen = (0, 0)             # highest patient / appointment id loaded
+        self._pull_lock = threading.Lock()
+        self.autocomplete = None        # built after startup (_data_ready)
+        self.records = ClinicRecords()
+        self.tasks = TaskScheduler(self)
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        with self.profiler.phase('shell'):
+            self._build()
+        self.after_idle(self._first_frame)
 
     def _build(self):
         container = tk.Frame(self, bg=COLORS['bg'])
         container.pack(fill=tk.BOTH, expand=True)
 
         # Sidebar
-        self.sidebar = Sidebar(container, self.on_nav)
+        self.sidebar = CanvasSidebar(container, self.on_nav)
         self.sidebar.pack(side=tk.LEFT, fill=tk.Y)
 
         # Right side
@@ -297,31 +438,377 @@ class App(tk.Tk):
                                 highlightthickness=1)
         self.content.pack(fill=tk.BOTH, expand=True)
 
-        self._show_placeholder('Dashboard')
-
-    def _show_placeholder(self, name):
-        for w in self.content.winfo_children():
-            w.destroy()
-        tk.Label(self.content, text=name,
-                 font=('Segoe UI', 20, 'bold'),
-                 fg=COLORS['muted'], bg=COLORS['card']).pack(expand=True)
+        # Views are built on first visit and cached (see views.py).
+        # Data views show "Loading…" until _data_ready registers them.
+        self.views = ViewManager(self.content, self.records)
+        self.dialogs = DialogManager(self)
+        for key, label in NAV_LABELS.items():
+            self.views.register(key, lambda parent, n=label: placeholder_view(parent, n))
+        for key in ('dashboard', 'patients', 'appointments'):
+            self.views.register(key, lambda parent: placeholder_view(parent, 'Loading…'))
+        self.views.register('search', SearchResults)
+        self.views.register('settings', lambda parent: SettingsView(parent, [
+            ('⤓  Import Patients', COLORS['accent'], self.on_import_patients),
+            ('⤒  Export Patients', COLORS['accent'], self.on_export_patients),
+            ('⤒  Export Appointments', COLORS['green'], self.on_export_appointments),
+            ('⧉  Find Duplicates', COLORS['accent'], self.on_find_duplicates),
+        ]))
+
+        self.views.show('dashboard')
+
+    # ── Staged startup ───────────────────────────────────────
+    def _first_frame(self):
+        self.update_idletasks()
+        self.profiler.mark('first frame')
+        self.tasks.submit(self._load, priority=HIGH, key='startup',
+                          on_done=self._data_ready,
+                          on_error=lambda exc: self._load_failed(exc))
+
+    def _load(self):
+        """Worker thread: open and read everything the views need."""
+        phase = self.profiler.phase
+        with phase('import data modules'):
+            from clinic_store import ClinicStore
+            from search_index import SearchIndex
+            from scheduling import ScheduleIndex
+            from dashboard import DashboardStats
+            from rollup import RollupCube
+        with phase('open store'):
+            store = ClinicStore(self.db_path, journal=True)   # replays a crash
+        # on_close closes it even if the window shuts before _data_ready
+        self._opened = store
+        should_stop = lambda: current_task().cancelled
+        loaded = None
+        try:
+            with phase('search index'):
+                search_index = SearchIndex(self.records)
+                search_index.load(store, should_stop)
+            if not should_stop():
+                with phase('schedule & trends'):
+                    # One pass over the appointments fills both
+                    schedule = ScheduleIndex()
+                    rollup = RollupCube()
+                    schedule.load(rollup.feed(store.iter_appointments()))
+                with phase('dashboard counters'):
+                    stats = DashboardStats.from_records(self.records)
+                loaded = store, search_index, schedule, stats, rollup
+        finally:
+            if loaded is None or should_stop():
+                store.close()       # failed, or the window was closed mid-load
+                loaded = None
+        return loaded
+
+    def _data_ready(self, loaded):
+        if loaded is None:
+            return
+        with self.profiler.phase('views'):
+            from list_view import VirtualTable, PATIENT_COLUMNS, APPOINTMENT_COLUMNS
+            from dashboard import DashboardView
+            from calendar_view import CalendarView
+            from day3_dialogs import open_patient_dialog, open_appointment_dialog
+            self.store, self.search_index, self.schedule, self.stats, self.rollup = loaded
+            # load() read in id order, so the last rows hold the highest ids
+            p, a = self.records.patients.ids, self.records.appointments.ids
+            self._seen = (p[-1] if p else 0), (a[-1] if a else 0)
+            self.views.register('patients', lambda parent: VirtualTable(
+                parent, PATIENT_COLUMNS, self.records.patient_count,
+                self.records.patient_page), depends=('patients',))
+            self.views.register('appointments', lambda parent: CalendarView(
+                parent, self.records, make_list=lambda body: VirtualTable(
+                    body, APPOINTMENT_COLUMNS, self.records.appointment_count,
+                    self.records.appointment_page)), depends=('appointments',))
+            self.views.register('dashboard', lambda parent: DashboardView(
+                parent, self.stats, self.rollup), depends=('patients', 'appointments'))
+            self.dialogs.register('patient', open_patient_dialog)
+            self.dialogs.register('appointment', open_appointment_dialog)
+            self.ready = True
+            pending, self._pending = self._pending, []
+            for fn, args in pending:
+                fn(*args)
+        self.profiler.mark('ready')
+        # Build the dialogs, hidden, while nobody is typing, so the
+        # first click on Add Patient is as quick as the later ones
+        self.after_idle(lambda: self.dialogs.prepare('patient', on_save=self.save_patient))
+        self.after_idle(lambda: self.dialogs.prepare(
+            'appointment', on_save=self.save_appointment, scheduler=self.schedule))
+        # Dialog suggestions can wait until everything else has loaded
+        from autocomplete import Autocomplete
+        self.tasks.submit(Autocomplete(self.records).build, priority=LOW,
+                          key='autocomplete', on_done=self._autocomplete_ready)
+        report_if_enabled(self.profiler)
+        self._watch = sqlite3.connect(self.db_path)
+        self._watch_database()
+
+    # ── Rows added by other writers ──────────────────────────
+    def _watch_database(self):
+        # PRAGMA data_version moves when another connection commits
+        # (the API server, or our own store); reading it does no I/O
+        version = self._watch.execute('PRAGMA data_version').fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self.tasks.submit(self._pull_changes, priority=HIGH, on_done=self._pulled)
+        self._watch_job = self.after(WATCH_MS, self._watch_database)
+
+    def _pull_changes(self):
+        # Worker thread; one pull at a time so none reads the same rows twice
+        with self._pull_lock:
+            patients, appointments, self._seen = self.store.rows_from_others(*self._seen)
+            if patients:
+                self.search_index.add_patients(patients)
+            for a in appointments:
+                self.search_index.add_appointment(a)
+            if patients or appointments:
+                self._sync_autocomplete()
+        return patients, appointments
+
+    def _pulled(self, rows):
+        patients, appointments = rows
+        for p in patients:
+            self.stats.add_patient(p)
+        self.schedule.load(appointments)
+        for a in appointments:
+            self.stats.add_appointment(a)
+            self.rollup.add(a)
+        if patients or appointments:
+            self.views.refresh_if_stale()
+
+    def _autocomplete_ready(self, autocomplete):
+        self.autocomplete = autocomplete
+        self.tasks.submit(autocomplete.sync, priority=LOW)   # saves made meanwhile
+
+    def _load_failed(self, exc):
+        self.views.register('dashboard', lambda parent: placeholder_view(
+            parent, f'Could not open {self.db_path}: {exc}'))
+
+    def _when_ready(self, fn, *args):
+        """Run fn now, or once startup has loaded the data."""
+        if self.ready:
+            return fn(*args)
+        self._pending.append((fn, args))
 
     def on_nav(self, key):
-        labels = {
-            'dashboard': 'Dashboard', 'patients': 'Patients',
-            'appointments': 'Appointments', 'staff': 'Staff', 'settings': 'Settings'
-        }
-        self._show_placeholder(labels.get(key, key))
+        self.views.show(key)
 
     def on_search(self):
+        if not self.ready:
+            # the query is read again when the index is ready
+            self._pending = [p for p in self._pending if p[0] != self.on_search]
+            self._pending.append((self.on_search, ()))
+            return
         q = self.topbar.get_search_query()
-        print(f'Search: {q}')
+        if not q:
+            self.tasks.cancel('search')
+            self.on_nav(self.sidebar.active)
+            return
+        # Runs off the Tk thread; a newer keystroke cancels this one
+        self.tasks.submit(self.search_index.search, q, key='search',
+                          on_done=lambda results: self._show_results(q, results))
+
+    def _show_results(self, query, results):
+        self.views.show('search').set_results(query, results)
 
     def on_add_patient(self):
-        print('Open Add Patient dialog')
+        return self._when_ready(lambda: self.dialogs.open(
+            'patient', on_save=self.save_patient))
 
     def on_add_appointment(self):
-        print('Open New Appointment dialog')
+        return self._when_ready(lambda: self.dialogs.open(
+            'appointment', on_save=self.save_appointment, scheduler=self.schedule,
+            autocomplete=self.autocomplete))
+
+    # The dialogs' on_save: saved() / saved(error) reports back once the
+    # worker is done, so "saved" is only shown for a stored record
+    def save_patient(self, patient, saved):
+        self.tasks.submit(self._store_patient, patient, priority=HIGH,
+                          on_done=lambda p: (self._patient_saved(p), saved()),
+                          on_error=saved)
+
+    def save_appointment(self, appointment, saved):
+        # Book on the Tk thread, right after the dialog's conflict check,
+        # so the next dialog sees the slot taken; undone if the write fails
+        if appointment['time']:
+            self.schedule.book(appointment)
+        self.tasks.submit(self._store_appointment, appointment, priority=HIGH,
+                          on_done=lambda a: (self._appointment_saved(a), saved()),
+                          on_error=lambda exc: (self.schedule.cancel(appointment), saved(exc)))
+
+    # Worker-thread halves of the saves
+    def _store_patient(self, patient):
+        patient['id'] = self.store.add_patient(patient)
+        self.search_index.add_patient(patient)
+        self._sync_autocomplete()
+        return patient
+
+    def _store_appointment(self, appointment):
+        appointment['id'] = self.store.add_appointment(appointment)
+        self.search_index.add_appointment(appointment)
+        self._sync_autocomplete()
+        return appointment
+
+    # Back on the Tk thread: count the save only once it is stored
+    def _patient_saved(self, patient):
+        self.stats.add_patient(patient)
+        self.views.refresh_if_stale()
+
+    def _appointment_saved(self, appointment):
+        self.stats.add_appointment(appointment)
+        self.rollup.add(appointment)
+        self.views.refresh_if_stale()
+
+    def _sync_autocomplete(self):
+        # Until it is built there is nothing to update; build() reads
+        # whatever rows exist by the time it runs
+        if self.autocomplete is not None:
+            self.autocomplete.sync()
+
+    def on_import_patients(self):
+        if not self.ready:
+            return self._when_ready(self.on_import_patients)
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            parent=self, title='Import patients',
+            filetypes=[('CSV or JSON', '*.csv *.json *.jsonl'), ('All files', '*.*')])
+        if not path:
+            return
+        from bulk_import import import_patients
+        self.views.show('settings')
+        self.sidebar.update_active('settings')
+        self._data_progress(0.0, f'Importing {os.path.basename(path)}…')
+        self.tasks.submit(
+            import_patients, self.store, path, priority=LOW, key='import',
+            on_batch=self._imported_batch,
+            progress=lambda done, total: self.tasks.post(
+                self._data_progress, done / total, f'Importing… {done * 100 // total}%'),
+            should_stop=lambda: current_task().cancelled,
+            on_done=self._import_done,
+            on_error=lambda exc: self._data_progress(0.0, f'Import failed: {exc}'))
+
+    def _imported_batch(self, patients):
+        # worker thread: index the batch, then count it on the Tk thread
+        self.search_index.add_patients(patients)
+        self._sync_autocomplete()
+        self.tasks.post(self._count_imported, patients)
+
+    def _count_imported(self, patients):
+        for p in patients:
+            self.stats.add_patient(p)
+        self.views.refresh_if_stale()
+
+    def _import_done(self, result):
+        text = f'Imported {result.imported:,} patients, rejected {result.rejected:,}.'
+        if result.rejects_path:
+            text += f'\nRejected rows: {result.rejects_path}'
+        self._data_progress(1.0, text)
+
+    def on_export_patients(self):
+        if not self.ready:
+            return self._when_ready(self.on_export_patients)
+        path = self._ask_export_path('patients')
+        if path:
+            from export import export_patients
+            self._start_export(path, export_patients, self.store, path)
+
+    def on_export_appointments(self):
+        if not self.ready:
+            return self._when_ready(self.on_export_appointments)
+        from validation import parse_date
+        date_from, date_to = self.views.get('settings').get_range()
+        if parse_date(date_from) is None or parse_date(date_to) is None:
+            self._data_progress(0.0, 'Export range must be YYYY-MM-DD to YYYY-MM-DD.')
+            return
+        path = self._ask_export_path(f'appointments_{date_from}_{date_to}')
+        if path:
+            from export import export_appointments
+            self._start_export(path, export_appointments, self.store, path,
+                               date_from, date_to)
+
+    def _ask_export_path(self, name):
+        from tkinter import filedialog
+        return filedialog.asksaveasfilename(
+            parent=self, title='Export', initialfile=name, defaultextension='.csv',
+            filetypes=[('CSV', '*.csv'), ('Columnar (compact)', '*.ccol')])
+
+    def _start_export(self, path, fn, *args):
+        self._data_progress(0.0, f'Exporting to {os.path.basename(path)}…')
+        self.tasks.submit(
+            fn, *args, priority=LOW, key='export',
+            progress=lambda done, total: self.tasks.post(
+                self._data_progress, done / max(total, 1), f'Exporting… {done:,} of {total:,} rows'),
+            should_stop=lambda: current_task().cancelled,
+            on_done=lambda rows: self._data_progress(
+                0.0, 'Export cancelled') if rows is None else self._data_progress(
+                1.0, f'Exported {rows:,} rows to {path}'),
+            on_error=lambda exc: self._data_progress(0.0, f'Export failed: {exc}'))
+
+    def on_find_duplicates(self):
+        if not self.ready:
+            return self._when_ready(self.on_find_duplicates)
+        from dedupe import find_duplicates
+        self._data_progress(0.0, 'Looking for duplicate patients…')
+        total = max(self.store.count_patients(), 1)
+        self.tasks.submit(
+            find_duplicates, self.store.iter_patients(), priority=LOW, key='dedupe',
+            should_stop=lambda: current_task().cancelled,
+            progress=lambda done: self.tasks.post(
+                self._data_progress, done / total, f'Scanned {done:,} of {total:,} patients'),
+            on_done=self._review_duplicates,
+            on_error=lambda exc: self._data_progress(0.0, f'Duplicate scan failed: {exc}'))
+
+    def _review_duplicates(self, report):
+        from dedupe import MergeReviewDialog
+        self._data_progress(1.0, f'Scanned {report.scanned:,} patients: '
+                                 f'{len(report.exact):,} exact, '
+                                 f'{len(report.same_email):,} with the same email and '
+                                 f'{len(report.near):,} possible duplicates.')
+        if report.exact or report.same_email or report.near:
+            MergeReviewDialog(self, report, self.store, self.tasks, self._merge_duplicates)
+
+    def _merge_duplicates(self, pairs, progress):
+        """Worker thread: merge (keep id, duplicate id) pairs a chunk at a time."""
+        count = 0
+        for i in range(0, len(pairs), MERGE_CHUNK):
+            if current_task().cancelled:
+                break
+            merged = self.store.merge_patients(pairs[i:i + MERGE_CHUNK])
+            moves = [(kept, dropped['id']) for _, kept, dropped in merged]
+            self.search_index.merge_patients(moves)
+            if self.autocomplete is not None:
+                self.autocomplete.merge_patients(moves)
+            self.tasks.post(self._count_merged, merged)
+            count += len(merged)
+            progress(min(i + MERGE_CHUNK, len(pairs)), len(pairs))
+        return count
+
+    def _count_merged(self, merged):
+        for before, kept, dropped in merged:
+            self.stats.remove_patient(before)
+            self.stats.remove_patient(dropped)
+            self.stats.add_patient(kept)
+        self.views.refresh_if_stale()
+
+    def _data_progress(self, fraction, text):
+        view = self.views.get('settings')
+        if view is not None:
+            view.set_progress(fraction, text)
+
+    def on_close(self):
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+        if self._watch is not None:
+            self._watch.close()
+        # Stop the long jobs (an import may be mid-batch, a scan mid-table)
+        # all at once; shutdown() then waits for whatever is still running,
+        # saves and pulls included, so nothing uses the store once it closes
+        for key in ('startup', 'import', 'export', 'merge', 'dedupe', 'autocomplete', 'search'):
+            self.tasks.cancel(key)
+        self.tasks.shutdown()
+        store = self.store or self._opened
+        if store is not None:
+            store.close()
+        if self.instrumentation is not None:
+            from instrumentation import finish_from_env
+            finish_from_env(self.instrumentation)
+        self.destroy()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+# ============================================================
+#  Tasks — background worker pool bridged to the Tk mainloop
+#  Smart Clinic Management System
+#  Tkinter widgets may only be touched from the main thread, so
+#  workers never call back directly: results go into a queue that
+#  the mainloop drains with after().
+# ============================================================
+
+import itertools
+import queue
+import threading
+import traceback
+
+HIGH, NORMAL, LOW = 0, 1, 2
+
+_local = threading.local()
+
+
+def current_task():
+    """The Task running on this worker thread (None on the main thread)."""
+    return getattr(_local, 'task', None)
+
+
+class Task:
+    """Handle returned by TaskScheduler.submit()."""
+
+    def __init__(self, fn, args, kwargs, priority, key, on_done, on_error):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        """Skip the task if it has not started; drop its result if it has."""
+        self.cancelled = True
+
+
+class TaskScheduler:
+    """
+    Runs functions on worker threads and delivers results on the Tk thread.
+
+    submit(fn, *args, on_done=..., priority=..., key=...) never blocks.
+    Tasks sharing a `key` replace each other: submitting a new one cancels
+    the previous, which is how an outdated search gets dropped.
+    """
+
+    def __init__(self, root, workers=4, poll_ms=16):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._queue = queue.PriorityQueue()
+        self._results = queue.SimpleQueue()
+        self._seq = itertools.count()
+        self._by_key = {}
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, daemon=True,
+                                          name=f'clinic-worker-{i}')
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+        self._after = root.after(poll_ms, self._poll)
+
+    # ── Main-thread API ──────────────────────────────────────
+    def submit(self, fn, *args, on_done=None, on_error=None,
+               priority=NORMAL, key=None, **kwargs):
+        task = Task(fn, args, kwargs, priority, key, on_done, on_error)
+        if key is not None:
+            old = self._by_key.get(key)
+            if old is not None:
+                old.cancel()
+            self._by_key[key] = task
+        self._queue.put((priority, next(self._seq), task))
+        return task
+
+    def cancel(self, key):
+        task = self._by_key.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self):
+        """
+        Finish queued work (saves must not be lost), then stop workers.
+        Returns once every task has returned, so the caller can close
+        what they use; cancel long ones first.
+        """
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put((LOW + 1, next(self._seq), None))
+        for t in self._threads:
+            t.join()
+        try:
+            self.root.after_cancel(self._after)
+        except Exception:
+            pass
+
+    # ── Any-thread API ───────────────────────────────────────
+    def post(self, fn, *args):
+        """Run fn(*args) on the Tk thread at the next poll (thread-safe)."""
+        self._results.put((fn, args))
+
+    # ── Internals ────────────────────────────────────────────
+    def _work(self):
+        while True:
+            _, _, task = self._queue.get()
+            if task is None:
+                return
+            if task.cancelled:
+                continue
+            _local.task = task
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except Exception as exc:
+                self._results.put((self._deliver_error, (task, exc, traceback.format_exc())))
+            else:
+                self._results.put((self._deliver, (task, result)))
+            finally:
+                _local.task = None
+
+    def _deliver(self, task, result):
+        self._forget(task)
+        if not task.cancelled and task.on_done:
+            task.on_done(result)
+
+    def _deliver_error(self, task, exc, tb):
+        self._forget(task)
+        if task.cancelled:
+            return
+        if task.on_error:
+            task.on_error(exc)
+        else:
+            print(tb, end='')
+
+    def _forget(self, task):
+        if task.key is not None and self._by_key.get(task.key) is task:
+            del self._by_key[task.key]
+
+    def _poll(self):
+        # Drain everything that is ready, then check again shortly
+        while True:
+            try:
+                fn, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception:
+                traceback.print_exc()
+        if not self._closed:
+            self._after = self.root.after(self.poll_ms, self._poll)
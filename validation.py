@@ -0,0 +1,181 @@
+# ============================================================
+#  Validation — the form rules, shared by dialogs and imports
+#  Smart Clinic Management System
+#  Every check returns (record, None) or (None, (field, message))
+#  so a dialog can put the message in its error_label and focus
+#  the entry for `field`.
+# ============================================================
+
+from datetime import date as Date
+from functools import lru_cache
+
+GENDERS = ('Male', 'Female', 'Other')
+NO_GENDER = 'Select'          # what the dialog's dropdown shows until picked
+STATUSES = ('Scheduled', 'Completed', 'Cancelled')
+MAX_AGE = 150
+MAX_AMOUNT = 10 ** 9       # fees at or above this are typos
+MAX_ID = 2 ** 32 - 1       # records.py keeps ids in array('I')
+
+_GENDER_LOOKUP = {g.lower(): g for g in GENDERS}
+_GENDER_LOOKUP.update({'': NO_GENDER, NO_GENDER.lower(): NO_GENDER,
+                       'm': 'Male', 'f': 'Female', 'o': 'Other'})
+_STATUS_LOOKUP = {s.lower(): s for s in STATUSES}
+_STATUS_LOOKUP[''] = 'Scheduled'
+
+_DIGITS = frozenset('0123456789')
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+# ── Fixed-format parsers ─────────────────────────────────────
+# strptime re-reads the format string and goes through locale-aware
+# machinery on every call.  These only accept the one layout the forms
+# use, and cache the answer, since dates and times repeat a lot.
+
+@lru_cache(maxsize=8192)
+def parse_date(text):
+    """'2026-03-09' -> date(2026, 3, 9); None if not a real YYYY-MM-DD date."""
+    if len(text) != 10 or text[4] != '-' or text[7] != '-':
+        return None
+    y, m, d = text[:4], text[5:7], text[8:]
+    if not _DIGITS.issuperset(y + m + d):
+        return None
+    y, m, d = int(y), int(m), int(d)
+    if not 1 <= m <= 12 or d < 1:
+        return None
+    leap = m == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+    if d > _DAYS_IN_MONTH[m] + leap or y < 1:
+        return None
+    return Date(y, m, d)
+
+
+@lru_cache(maxsize=2048)
+def parse_time(text):
+    """'09:30' (or '9:30') -> 570 minutes after midnight; None if invalid."""
+    h, sep, m = text.partition(':')
+    if not sep or not 1 <= len(h) <= 2 or len(m) != 2 or not _DIGITS.issuperset(h + m):
+        return None
+    h, m = int(h), int(m)
+    if h > 23 or m > 59:
+        return None
+    return h * 60 + m
+
+
+def parse_age(text):
+    """Whole years 0..MAX_AGE.  Accepts padding ('  42 ', '042', '42.0')."""
+    text = str(text).strip()
+    if text.endswith('.0'):
+        text = text[:-2]
+    if not text or not _DIGITS.issuperset(text):
+        return None
+    age = int(text)
+    return age if age <= MAX_AGE else None
+
+
+def parse_amount(text):
+    """A fee: '25', '12.50', '1,200' -> float (2 decimals); None if invalid."""
+    try:
+        amount = float(str(text).strip().replace(',', ''))
+    except ValueError:
+        return None
+    return round(amount, 2) if 0 <= amount < MAX_AMOUNT else None   # also rules out nan/inf
+
+
+def parse_id(value):
+    """A record id: 42 or '42' -> 42; None unless a whole number 1..MAX_ID."""
+    if isinstance(value, bool):
+        return None
+    if not isinstance(value, int):
+        text = str(value).strip()
+        if not text or not _DIGITS.issuperset(text):
+            return None
+        value = int(text)
+    return value if 1 <= value <= MAX_ID else None
+
+
+# ── Single records (dialogs, API) ────────────────────────────
+def validate_patient(fields):
+    """
+    Apply the Add Patient rules to raw text fields.
+
+    Returns (patient, None) on success, or (None, (field, message)) for
+    the first problem found.
+    """
+    name = (fields.get('name') or '').strip()
+    gender = (fields.get('gender') or '').strip()
+
+    if not name:
+        return None, ('name', 'Full Name is required.')
+    age = fields.get('age')
+    age = parse_age('' if age is None else age)
+    if age is None:
+        return None, ('age', 'Age must be a number.')
+    gender = _GENDER_LOOKUP.get(gender.lower())
+    if gender is None:
+        return None, ('gender', 'Gender must be Male, Female or Other.')
+
+    return {
+        'name':   name,
+        'age':    age,
+        'phone':  (fields.get('phone') or '').strip(),
+        'email':  (fields.get('email') or '').strip(),
+        'gender': gender,
+    }, None
+
+
+def validate_appointment(fields):
+    """The New Appointment rules; same return shape as validate_patient."""
+    patient = (fields.get('patient') or '').strip()
+    doctor = ' '.join((fields.get('doctor') or '').split())    # as scheduling.doctor_key sees it
+    day = (fields.get('date') or '').strip()
+    time = (fields.get('time') or '').strip()
+
+    if not patient:
+        return None, ('patient', 'Patient Name is required.')
+    if not doctor:
+        return None, ('doctor', 'Doctor is required.')
+    if parse_date(day) is None:
+        return None, ('date', 'Date must be in YYYY-MM-DD format.')
+    if time and parse_time(time) is None:
+        return None, ('time', 'Time must be in HH:MM format.')
+    status = _STATUS_LOOKUP.get((fields.get('status') or '').strip().lower())
+    if status is None:
+        return None, ('status', 'Status must be Scheduled, Completed or Cancelled.')
+    fee = str(fields.get('amount') or '').strip()
+    amount = parse_amount(fee) if fee else None
+    if fee and amount is None:
+        return None, ('amount', 'Fee must be an amount like 25 or 12.50.')
+    patient_id = fields.get('patient_id')
+    if patient_id is not None:
+        patient_id = parse_id(patient_id)
+        if patient_id is None:
+            return None, ('patient_id', 'Patient ID must be a whole number from 1.')
+    if len(time) == 4:
+        time = '0' + time          # '9:30' -> '09:30' so times sort as text
+
+    appointment = {
+        'patient': patient,
+        'doctor':  doctor,
+        'date':    day,
+        'time':    time,
+        'status':  status,
+        'amount':  amount,
+    }
+    if patient_id is not None:
+        appointment['patient_id'] = patient_id
+    return appointment, None
+
+
+# ── Batches ──────────────────────────────────────────────────
+def validate_many(rows, validate):
+    """
+    Run `validate` over an iterable of field dicts.
+    Returns (records, errors) where errors holds (row index, field, message).
+    """
+    records, errors = [], []
+    for i, row in enumerate(rows):
+        record, error = validate(row)
+        if error:
+            errors.append((i,) + error)
+        else:
+            records.append(record)
+    return records, errors
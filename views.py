@@ -0,0 +1,118 @@
+# ============================================================
+#  Views — build each content view (and dialog) once and keep it around
+#  Smart Clinic Management System
+# ============================================================
+
+import tkinter as tk
+from collections import OrderedDict
+
+
+class ViewManager:
+    """
+    Shows one view at a time inside `parent`.
+
+    Views are built on their first visit and kept in an LRU cache of
+    `capacity` entries; switching just swaps which one is packed.
+    A view registered with `depends=('patients',)` is refreshed on reshow
+    only if that table changed since its last refresh.  `store` is
+    anything with a `versions` dict (ClinicStore, ClinicRecords).
+    """
+
+    def __init__(self, parent, store, capacity=4):
+        self.parent = parent
+        self.store = store
+        self.capacity = capacity
+        self.factories = {}
+        self.depends = {}
+        self.views = OrderedDict()    # key -> built widget
+        self.seen = {}                # key -> versions at last refresh
+        self.current = None
+
+    def register(self, key, factory, depends=()):
+        """
+        factory(parent) -> widget; the widget may define refresh().
+        Registering a key again replaces its view (rebuilt if visible).
+        """
+        self.factories[key] = factory
+        self.depends[key] = tuple(depends)
+        old = self.views.pop(key, None)
+        if old is not None:
+            old.destroy()
+            self.seen.pop(key, None)
+            if self.current == key:
+                self.current = None
+                self.show(key)
+
+    def show(self, key):
+        view = self.views.get(key)
+        if view is None:
+            view = self.factories[key](self.parent)
+            self.views[key] = view
+            self.seen[key] = self._versions(key)
+            self._evict()
+        else:
+            self.views.move_to_end(key)
+            self.refresh_if_stale(key)
+
+        if self.current != key:
+            old = self.views.get(self.current)
+            if old is not None:
+                old.pack_forget()
+            view.pack(fill=tk.BOTH, expand=True)
+            self.current = key
+        return view
+
+    def get(self, key):
+        return self.views.get(key)
+
+    def refresh_if_stale(self, key=None):
+        """Refresh a view (default: the visible one) if its data changed."""
+        key = self.current if key is None else key
+        view = self.views.get(key)
+        if view is None:
+            return
+        versions = self._versions(key)
+        if versions != self.seen.get(key):
+            self.seen[key] = versions
+            if hasattr(view, 'refresh'):
+                view.refresh()
+
+    def _versions(self, key):
+        return tuple(self.store.versions[t] for t in self.depends[key])
+
+    def _evict(self):
+        while len(self.views) > self.capacity:
+            key = next(k for k in self.views if k != self.current)
+            self.views.pop(key).destroy()
+            self.seen.pop(key, None)
+
+
+class DialogManager:
+    """
+    Builds each dialog once and shows the same one again afterwards.
+
+    factory(parent, keep=True, **options) builds a dialog that hides
+    itself when closed and has reopen(**options), which clears its form
+    and shows it again.  open() returns the dialog either way.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.factories = {}
+        self.dialogs = {}
+
+    def register(self, key, factory):
+        self.factories[key] = factory
+
+    def open(self, key, **options):
+        dialog = self.dialogs.get(key)
+        if dialog is not None and dialog.winfo_exists():
+            dialog.reopen(**options)
+        else:
+            dialog = self.dialogs[key] = self.factories[key](self.parent, keep=True, **options)
+        return dialog
+
+    def prepare(self, key, **options):
+        """Build a dialog ahead of time, hidden, so even its first open is quick."""
+        if key not in self.dialogs:
+            self.open(key, **options).close()